@@ -0,0 +1,87 @@
+"""
+Benchmark du temps d'import des modules du paquet, mesuré dans des interpréteurs neufs (python -X importtime).
+
+Exemple :
+    python -m benchmarks.bench_demarrage --sortie demarrage.json
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+# Modules qui doivent s'importer sans dépendance lourde (workers éphémères), et dépendances interdites
+MODULES_LEGERS = {
+    'src.mon_module.models.personne': ('numpy', 'pandas'),
+    'src.mon_module.models.epargne': ('numpy', 'pandas'),
+    'src.mon_module.models.resultat': ('numpy', 'pandas'),
+    'src.mon_module.core': ('pandas',),
+}
+DEPENDANCES_LOURDES = ('numpy', 'pandas', 'pyarrow', 'openpyxl')
+REPETITIONS_PAR_DEFAUT = 5
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def mesurer_import(module: str, repetitions: int = REPETITIONS_PAR_DEFAUT) -> dict:
+    """
+    Importe un module dans des interpréteurs neufs et relève son temps d'import cumulé.
+
+    Args:
+        module (str): Le nom complet du module (ex: 'src.mon_module.core').
+        repetitions (int, optional): Nombre d'interpréteurs lancés ; la médiane est retenue.
+
+    Returns:
+        dict: Le module, la médiane et le minimum du temps d'import en millisecondes,
+        et les dépendances lourdes chargées par l'import.
+    """
+    code = f"import sys, {module}; print(','.join(m for m in {DEPENDANCES_LOURDES!r} if m in sys.modules))"
+    durees, chargees = [], ''
+    for _ in range(repetitions):
+        processus = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=RACINE,
+                                   capture_output=True, text=True, check=True)
+        # Dernière ligne de -X importtime : le module demandé, avec le temps cumulé de ses dépendances (µs)
+        ligne = [l for l in processus.stderr.splitlines() if l.rstrip().endswith(f"| {module}")][-1]
+        durees.append(int(ligne.split('|')[1]) / 1000)
+        chargees = processus.stdout.strip()
+    return {
+        'module': module,
+        'millisecondes': round(statistics.median(durees), 2),
+        'minimum_millisecondes': round(min(durees), 2),
+        'dependances_lourdes': chargees.split(',') if chargees else [],
+    }
+
+
+def verifier(mesures: list[dict]) -> list[str]:
+    """Liste les modules légers (voir MODULES_LEGERS) qui chargent une dépendance interdite."""
+    problemes = []
+    for mesure in mesures:
+        interdites = set(MODULES_LEGERS.get(mesure['module'], ())) & set(mesure['dependances_lourdes'])
+        if interdites:
+            problemes.append(f"{mesure['module']} charge {', '.join(sorted(interdites))} à l'import.")
+    return problemes
+
+
+def main(arguments: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark du temps d'import des modules du paquet.")
+    parser.add_argument('--modules', nargs='+', default=list(MODULES_LEGERS), help="Modules à importer.")
+    parser.add_argument('--repetitions', type=int, default=REPETITIONS_PAR_DEFAUT, help="Interpréteurs lancés par module.")
+    parser.add_argument('--sortie', default=None, help="Fichier JSON des mesures.")
+    args = parser.parse_args(arguments)
+
+    mesures = [mesurer_import(module, args.repetitions) for module in args.modules]
+    for mesure in mesures:
+        print(f"{mesure['module']:<36} {mesure['millisecondes']:>8.1f} ms  {', '.join(mesure['dependances_lourdes']) or '-'}")
+    if args.sortie:
+        with open(args.sortie, 'w', encoding='utf-8') as fichier:
+            json.dump({'python': sys.version.split()[0], 'mesures': mesures}, fichier, indent=2, ensure_ascii=False)
+        print(f"Mesures écrites dans '{args.sortie}'.")
+
+    problemes = verifier(mesures)
+    for probleme in problemes:
+        print(f"RÉGRESSION : {probleme}")
+    return 1 if problemes else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Benchmark des étapes de la chaîne import → nettoyage → simulation → export, sur des données synthétiques.
+
+Exemple :
+    python -m benchmarks.bench_etapes --tailles 1000 100000 --sortie bench.json --reference bench_precedent.json
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import datetime
+from contextlib import redirect_stdout
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generateurs import ecrire_personnes_csv, generer_epargnes
+from src.mon_module.data_cleaning import nettoyer_dataframe
+from src.mon_module.data_manager import importer_donnees_dataframe, creer_personnes, import_epargnes, save_resultats_simulation
+from src.mon_module.core import suggestion_epargne, simuler_resultats_batch
+
+TAILLES_PAR_DEFAUT = [1_000, 10_000, 100_000]
+MAX_PERSONNES_SEQUENTIEL = 10_000 # suggestion_epargne est mesurée sur un préfixe, puis ramenée au débit
+
+
+def _chronometrer(fonction, *args, **kwargs):
+    """Exécute une fonction et retourne (résultat, durée en secondes)."""
+    debut = time.perf_counter()
+    resultat = fonction(*args, **kwargs)
+    return resultat, time.perf_counter() - debut
+
+
+def _mesure(taille: int, etape: str, secondes: float, lignes: int) -> dict:
+    return {
+        'taille': taille,
+        'etape': etape,
+        'secondes': round(secondes, 6),
+        'lignes': lignes,
+        'lignes_par_seconde': round(lignes / secondes, 1) if secondes > 0 else None,
+    }
+
+
+def mesurer_etapes(taille: int, nb_produits: int, dossier: str, graine: int = 0,
+                   max_personnes_sequentiel: int = MAX_PERSONNES_SEQUENTIEL) -> list[dict]:
+    """
+    Génère un jeu de données de la taille demandée puis chronomètre chaque étape séparément.
+
+    Args:
+        taille (int): Nombre de personnes.
+        nb_produits (int): Nombre de produits d'épargne du catalogue.
+        dossier (str): Dossier de travail pour les fichiers générés.
+        graine (int, optional): Graine des générateurs.
+        max_personnes_sequentiel (int, optional): Nombre maximum de personnes passées à suggestion_epargne.
+
+    Returns:
+        list[dict]: Une mesure par étape (taille, étape, secondes, lignes, lignes_par_seconde).
+    """
+    fichier_personnes = os.path.join(dossier, f"personnes_{taille}.csv")
+    fichier_epargnes = os.path.join(dossier, f"epargnes_{nb_produits}.csv")
+    fichier_resultats = os.path.join(dossier, f"resultats_{taille}.csv")
+    ecrire_personnes_csv(fichier_personnes, taille, graine=graine)
+    generer_epargnes(nb_produits, graine=graine).to_csv(fichier_epargnes, index=False)
+    epargnes = import_epargnes(fichier_epargnes)
+
+    mesures = []
+    df, duree = _chronometrer(importer_donnees_dataframe, fichier_personnes)
+    mesures.append(_mesure(taille, 'importer_donnees_dataframe', duree, len(df)))
+
+    df_nettoye, duree = _chronometrer(nettoyer_dataframe, df)
+    mesures.append(_mesure(taille, 'nettoyer_dataframe', duree, len(df_nettoye)))
+    del df
+
+    personnes, duree = _chronometrer(creer_personnes, df_nettoye)
+    mesures.append(_mesure(taille, 'construction_objets', duree, len(personnes)))
+    del df_nettoye
+
+    echantillon = personnes[:max_personnes_sequentiel]
+    with redirect_stdout(open(os.devnull, 'w')): # Le décorateur de suggestion_epargne affiche chaque appel
+        _, duree = _chronometrer(lambda: [suggestion_epargne(p, epargnes) for p in echantillon])
+    mesures.append(_mesure(taille, 'suggestion_epargne', duree, len(echantillon)))
+
+    resultats, duree = _chronometrer(simuler_resultats_batch, personnes, epargnes)
+    mesures.append(_mesure(taille, 'simuler_resultats_batch', duree, len(personnes)))
+
+    _, duree = _chronometrer(save_resultats_simulation, resultats, fichier_resultats)
+    mesures.append(_mesure(taille, 'save_resultats_simulation', duree, len(resultats)))
+    return mesures
+
+
+def comparer(mesures: list[dict], reference: list[dict], seuil: float) -> list[str]:
+    """
+    Compare des mesures à une exécution de référence et liste les régressions de débit.
+
+    Args:
+        mesures (list[dict]): Les mesures de l'exécution courante.
+        reference (list[dict]): Les mesures d'une exécution précédente.
+        seuil (float): Facteur de ralentissement toléré (ex: 1.2 pour 20 %).
+
+    Returns:
+        list[str]: Une description par étape dont le débit s'est dégradé au-delà du seuil.
+    """
+    debits_reference = {(m['taille'], m['etape']): m['lignes_par_seconde'] for m in reference}
+    regressions = []
+    for mesure in mesures:
+        debit_reference = debits_reference.get((mesure['taille'], mesure['etape']))
+        if debit_reference and mesure['lignes_par_seconde'] and debit_reference / mesure['lignes_par_seconde'] > seuil:
+            regressions.append(f"{mesure['etape']} ({mesure['taille']} lignes) : {mesure['lignes_par_seconde']:.0f} lignes/s "
+                               f"contre {debit_reference:.0f} lignes/s en référence.")
+    return regressions
+
+
+def main(arguments: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark des étapes d'import, de nettoyage, de simulation et d'export.")
+    parser.add_argument('--tailles', type=int, nargs='+', default=TAILLES_PAR_DEFAUT, help="Nombres de personnes (1e3 à 1e7).")
+    parser.add_argument('--produits', type=int, default=100, help="Nombre de produits d'épargne du catalogue.")
+    parser.add_argument('--graine', type=int, default=0, help="Graine des générateurs.")
+    parser.add_argument('--max-sequentiel', type=int, default=MAX_PERSONNES_SEQUENTIEL,
+                        help="Nombre maximum de personnes passées à suggestion_epargne.")
+    parser.add_argument('--dossier', default=None, help="Dossier de travail (temporaire par défaut).")
+    parser.add_argument('--sortie', default='bench_resultats.json', help="Fichier JSON des mesures.")
+    parser.add_argument('--reference', default=None, help="Fichier JSON d'une exécution précédente à comparer.")
+    parser.add_argument('--seuil', type=float, default=1.2, help="Ralentissement toléré par rapport à la référence.")
+    args = parser.parse_args(arguments)
+
+    logging.disable(logging.INFO) # Les journaux de la simulation fausseraient les mesures
+    try:
+        with tempfile.TemporaryDirectory() as dossier_temporaire:
+            dossier = args.dossier or dossier_temporaire
+            mesures = []
+            for taille in args.tailles:
+                mesures.extend(mesurer_etapes(taille, args.produits, dossier, args.graine, args.max_sequentiel))
+                for mesure in mesures[-6:]:
+                    print(f"{mesure['taille']:>10} {mesure['etape']:<28} {mesure['secondes']:>10.3f} s {mesure['lignes_par_seconde'] or 0:>14.0f} lignes/s")
+    finally:
+        logging.disable(logging.NOTSET)
+
+    rapport = {
+        'metadonnees': {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'processeurs': os.cpu_count(),
+            'produits': args.produits,
+            'graine': args.graine,
+        },
+        'mesures': mesures,
+    }
+    with open(args.sortie, 'w', encoding='utf-8') as fichier:
+        json.dump(rapport, fichier, indent=2, ensure_ascii=False)
+    print(f"Mesures écrites dans '{args.sortie}'.")
+
+    if args.reference:
+        with open(args.reference, encoding='utf-8') as fichier:
+            regressions = comparer(mesures, json.load(fichier)['mesures'], args.seuil)
+        for regression in regressions:
+            print(f"RÉGRESSION : {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+COLONNES_PERSONNES = ['nom', 'age', 'revenu_annuel', 'loyer', 'depenses_mensuelles', 'objectif',
+                      'duree_epargne', 'versement_mensuel_utilisateur']
+COLONNES_EPARGNES = ['nom', 'taux_interet', 'fiscalite', 'duree_min', 'versement_max']
+
+
+def _salir(valeurs: np.ndarray, generateur: np.random.Generator, taux_sale: float, pourcentage: bool = False) -> np.ndarray:
+    """
+    Convertit une colonne numérique en texte et y introduit des valeurs « sales » réalistes :
+    virgules décimales, 'None', cases vides et (pour les taux) pourcentages.
+    """
+    texte = pd.Series(valeurs).astype(str)
+    tirage = generateur.random(len(valeurs))
+    seuils = np.cumsum([taux_sale / 4] * 4)
+
+    virgule = tirage < seuils[0]
+    texte[virgule] = texte[virgule].str.replace('.', ',', regex=False)
+    texte[(tirage >= seuils[0]) & (tirage < seuils[1])] = 'None'
+    texte[(tirage >= seuils[1]) & (tirage < seuils[2])] = ''
+    if pourcentage:
+        pourcent = (tirage >= seuils[2]) & (tirage < seuils[3])
+        texte[pourcent] = pd.Series(valeurs[pourcent] * 100).round(6).astype(str).add('%').to_numpy()
+    return texte.to_numpy(dtype=object)
+
+
+def generer_personnes(nombre: int, graine: int = 0, taux_sale: float = 0.05) -> pd.DataFrame:
+    """
+    Génère un jeu de personnes réaliste (format brut de personnes.csv) de façon reproductible.
+
+    Args:
+        nombre (int): Nombre de personnes.
+        graine (int, optional): Graine du générateur aléatoire.
+        taux_sale (float, optional): Fraction des valeurs « sales » dans les colonnes texte.
+
+    Returns:
+        pd.DataFrame: Les données brutes, avant nettoyage.
+    """
+    generateur = np.random.default_rng(graine)
+    revenu_annuel = np.round(generateur.lognormal(np.log(35000), 0.45, nombre), -2)
+    versement = np.round(generateur.uniform(50, 1500, nombre), 2)
+    versement_texte = _salir(versement, generateur, taux_sale)
+    versement_texte[generateur.random(nombre) < 0.1] = '' # Une partie des clients ne fixe pas de versement
+    return pd.DataFrame({
+        'nom': np.char.add('Client', np.arange(nombre).astype(str)),
+        'age': generateur.integers(18, 85, nombre),
+        'revenu_annuel': _salir(revenu_annuel, generateur, taux_sale),
+        'loyer': np.round(generateur.uniform(300, 2000, nombre), -1),
+        'depenses_mensuelles': np.round(generateur.uniform(200, 1500, nombre), -1),
+        'objectif': np.round(generateur.uniform(1000, 100000, nombre), -2),
+        'duree_epargne': generateur.integers(0, 241, nombre),
+        'versement_mensuel_utilisateur': versement_texte,
+    }, columns=COLONNES_PERSONNES)
+
+
+def generer_epargnes(nombre: int, graine: int = 0, taux_sale: float = 0.05) -> pd.DataFrame:
+    """
+    Génère un catalogue de produits d'épargne réaliste (format brut de epargnes.csv) de façon reproductible.
+
+    Args:
+        nombre (int): Nombre de produits.
+        graine (int, optional): Graine du générateur aléatoire.
+        taux_sale (float, optional): Fraction des valeurs « sales » dans les colonnes texte.
+
+    Returns:
+        pd.DataFrame: Les données brutes, avant nettoyage.
+    """
+    generateur = np.random.default_rng(graine)
+    taux = np.round(generateur.uniform(0.005, 0.10, nombre), 4)
+    fiscalite = generateur.choice([0.0, 0.172, 0.30], nombre)
+    versement_max = generateur.choice([7700.0, 12000.0, 22950.0, 61200.0, 150000.0, np.nan], nombre)
+    return pd.DataFrame({
+        'nom': np.char.add('Produit', np.arange(nombre).astype(str)),
+        'taux_interet': _salir(taux, generateur, taux_sale, pourcentage=True),
+        'fiscalite': fiscalite,
+        'duree_min': generateur.choice([0, 12, 48, 60, 96], nombre),
+        'versement_max': np.where(np.isnan(versement_max), 'None', versement_max.astype(str)),
+    }, columns=COLONNES_EPARGNES)
+
+
+def ecrire_personnes_csv(chemin: str, nombre: int, graine: int = 0, taille_bloc: int = 1_000_000, taux_sale: float = 0.05):
+    """
+    Écrit un fichier CSV de personnes par blocs, pour générer de très gros volumes (1e7 lignes) à mémoire bornée.
+    """
+    for numero_bloc, debut in enumerate(range(0, nombre, taille_bloc)):
+        df = generer_personnes(min(taille_bloc, nombre - debut), graine=graine + numero_bloc, taux_sale=taux_sale)
+        df['nom'] = np.char.add('Client', np.arange(debut, debut + len(df)).astype(str))
+        df.to_csv(chemin, index=False, mode='w' if debut == 0 else 'a', header=debut == 0)
@@ -0,0 +1,5 @@
+import sys
+
+from src.mon_module.cli import main
+
+sys.exit(main())
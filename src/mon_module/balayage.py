@@ -0,0 +1,251 @@
+import logging
+import numpy as np
+import pandas as pd
+
+from src.mon_module.models.personne import Personne
+from src.mon_module.models.epargne import Epargne
+from src.mon_module.models.catalogue import CatalogueEpargne
+from src.mon_module.utils import calcul_interets_composes, calcul_capitaux_mensuels
+from src.mon_module.core import tableaux_personnes, tableaux_epargnes, verifier_mode, MODE_PAR_DEFAUT
+from src.mon_module.cache import CacheScenarios
+
+# Axes d'un balayage, dans l'ordre des dimensions des tableaux de résultats
+AXES_BALAYAGE = ('produit', 'taux_interet', 'duree_mois', 'versement_mensuel', 'fiscalite')
+VARIABLES_BALAYAGE = ('capital_brut', 'capital_net', 'capital_net_reel', 'atteint_objectif', 'eligible')
+TAILLE_CACHE_BALAYAGES = 256
+
+# Cache par défaut des balayages : une question répétée (même personne, mêmes produits, mêmes plages) n'est calculée qu'une fois
+cache_balayages = CacheScenarios(TAILLE_CACHE_BALAYAGES)
+
+
+class Balayage:
+    """
+    Résultat d'un balayage de paramètres : des tableaux à N dimensions étiquetés par leurs axes.
+
+    Les tableaux capital_brut, capital_net, capital_net_reel (np.nan pour les scénarios invalides, et pour
+    tout capital_net_reel en mode 'annuel', comme dans suggestion_epargne), atteint_objectif et eligible ont la forme (produits × taux × durées × versements × fiscalités).
+    Un axe laissé libre n'a qu'une valeur : celle de la personne (durée, versement) ou np.nan pour
+    le taux et la fiscalité, qui restent alors propres à chaque produit. Les tableaux sont en lecture
+    seule, car un même Balayage peut être partagé par le cache.
+    """
+    def __init__(self, personne_nom: str, mode: str, axes: dict[str, np.ndarray], parametres: dict[str, np.ndarray],
+                 resultats: dict[str, np.ndarray]):
+        self.personne_nom = personne_nom
+        self.mode = mode
+        self.axes = axes
+        self.parametres = parametres # Valeurs effectives de chaque paramètre, diffusables à la forme des résultats
+        for valeurs in list(axes.values()) + list(parametres.values()) + list(resultats.values()):
+            valeurs.flags.writeable = False
+        self.capital_brut = resultats['capital_brut']
+        self.capital_net = resultats['capital_net']
+        self.capital_net_reel = resultats['capital_net_reel']
+        self.atteint_objectif = resultats['atteint_objectif']
+        self.eligible = resultats['eligible']
+
+    @property
+    def forme(self) -> tuple:
+        return self.capital_net.shape
+
+    def __len__(self):
+        return self.capital_net.size
+
+    def __repr__(self):
+        dimensions = " × ".join(f"{nom}={len(valeurs)}" for nom, valeurs in self.axes.items())
+        return f"Balayage({self.personne_nom!r}, {self.mode}, {dimensions})"
+
+    def selectionner(self, variable: str = 'capital_net', **etiquettes) -> np.ndarray:
+        """
+        Extrait une variable aux valeurs d'axes données (les axes sélectionnés disparaissent du tableau retourné).
+
+        Exemple :
+            balayage.selectionner('capital_net', produit='Livret A', taux_interet=0.03)
+
+        Args:
+            variable (str, optional): Une des VARIABLES_BALAYAGE. Défaut à 'capital_net'.
+            **etiquettes: Valeur retenue pour chaque axe sélectionné (voir AXES_BALAYAGE).
+
+        Returns:
+            np.ndarray: Le sous-tableau correspondant.
+
+        Raises:
+            ValueError: Si la variable ou un axe est inconnu, ou si une valeur ne figure pas sur son axe.
+        """
+        if variable not in VARIABLES_BALAYAGE:
+            raise ValueError(f"Variable inconnue : '{variable}'. Variables disponibles : {', '.join(VARIABLES_BALAYAGE)}.")
+        inconnus = set(etiquettes) - set(self.axes)
+        if inconnus:
+            raise ValueError(f"Axe(s) inconnu(s) : {', '.join(sorted(inconnus))}. Axes disponibles : {', '.join(AXES_BALAYAGE)}.")
+        index = []
+        for nom, valeurs in self.axes.items():
+            if nom not in etiquettes:
+                index.append(slice(None))
+                continue
+            positions = np.flatnonzero(valeurs == etiquettes[nom] if nom == 'produit' else np.isclose(valeurs, etiquettes[nom]))
+            if len(positions) == 0:
+                raise ValueError(f"La valeur {etiquettes[nom]!r} ne figure pas sur l'axe '{nom}'.")
+            index.append(positions[0])
+        return getattr(self, variable)[tuple(index)]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Convertit le balayage en un DataFrame « long » : une ligne par combinaison de paramètres,
+        dans l'ordre des axes (le dernier axe varie le plus vite), avec les valeurs effectives des paramètres.
+        La colonne 'Capital Net Reel' n'est présente qu'en mode 'mensuel'.
+        """
+        forme = self.forme
+        plat = lambda valeurs: np.broadcast_to(valeurs, forme).ravel()
+        df = pd.DataFrame({
+            'Personne': self.personne_nom,
+            'Produit': plat(self.axes['produit'][:, None, None, None, None]),
+            'Taux Interet': plat(self.parametres['taux_interet']),
+            'Duree Mois': plat(self.parametres['duree_mois']),
+            'Versement Mensuel': plat(self.parametres['versement_mensuel']),
+            'Fiscalite': plat(self.parametres['fiscalite']),
+            'Versement Mensuel Effectif': plat(self.parametres['versement_mensuel_effectif']),
+            'Capital Brut': self.capital_brut.ravel(),
+            'Capital Net': self.capital_net.ravel(),
+            'Capital Net Reel': self.capital_net_reel.ravel(),
+            'Objectif Atteint': self.atteint_objectif.ravel(),
+            'Eligible': self.eligible.ravel(),
+        })
+        return df if self.mode == 'mensuel' else df.drop(columns='Capital Net Reel')
+
+
+def _axe(valeurs, nom: str) -> np.ndarray:
+    """
+    Convertit les valeurs d'un axe (liste, range, tableau ou scalaire) en tableau float à une dimension.
+
+    Raises:
+        ValueError: Si l'axe est vide, a plusieurs dimensions ou contient une valeur manquante ou négative.
+    """
+    axe = np.atleast_1d(np.array(list(valeurs) if isinstance(valeurs, range) else valeurs, dtype=float)) # Copie : l'axe est figé
+    if axe.ndim != 1 or len(axe) == 0:
+        raise ValueError(f"Les valeurs de l'axe '{nom}' doivent former une liste non vide.")
+    if np.isnan(axe).any() or (axe < 0).any():
+        raise ValueError(f"Les valeurs de l'axe '{nom}' doivent être positives ou nulles : {axe.tolist()}")
+    return axe
+
+
+def _cle_balayage(mode: str, colonnes_personne: dict[str, np.ndarray], colonnes_epargnes: dict[str, np.ndarray], axes: tuple) -> tuple:
+    """Clé de cache d'un balayage ; les flottants sont comparés par leurs octets, np.nan compris."""
+    personne = tuple(colonnes_personne[nom].tobytes() for nom in ('capacite', 'objectif', 'duree_epargne'))
+    produits = tuple(colonnes_epargnes[nom].tobytes() for nom in ('taux', 'frais', 'inflation', 'fiscalite', 'duree_min', 'versement_max'))
+    return (mode, colonnes_personne['nom'][0], personne, tuple(colonnes_epargnes['nom']), produits,
+            tuple(None if axe is None else axe.tobytes() for axe in axes))
+
+
+def balayer_parametres(personne: Personne, epargnes: list[Epargne] | CatalogueEpargne, taux_interet=None, duree_mois=None,
+                       versement_mensuel=None, fiscalite=None, mode: str = MODE_PAR_DEFAUT,
+                       cache: CacheScenarios = cache_balayages) -> Balayage:
+    """
+    Répond à une question « et si ? » : simule une personne sur toutes les combinaisons des valeurs données
+    de taux, de durée, de versement mensuel et de fiscalité, pour un ou plusieurs produits, en une seule
+    passe NumPy diffusée sur (produits × taux × durées × versements × fiscalités).
+
+    Chaque combinaison est calculée comme un scénario de suggestion_epargne : éligibilité selon duree_min,
+    plafonnement au versement_max, fiscalité sur les gains positifs et, en mode 'mensuel', actualisation de l'inflation du produit.
+    Un paramètre non fourni garde la valeur du produit (taux, fiscalité) ou de la personne (durée d'épargne,
+    capacité d'épargne mensuelle comme versement).
+
+    Exemple :
+        balayer_parametres(personne, [livret_a], taux_interet=np.linspace(0.025, 0.05, 11), duree_mois=range(36, 181, 12))
+
+    Args:
+        personne (Personne): La personne simulée (objectif, durée d'épargne et capacité d'épargne).
+        epargnes (list[Epargne] | CatalogueEpargne): Les produits à faire varier.
+        taux_interet (iterable, optional): Les taux annuels à tester (ex: 0.03 pour 3%).
+        duree_mois (iterable, optional): Les durées d'épargne à tester, en mois.
+        versement_mensuel (iterable, optional): Les versements mensuels à tester.
+        fiscalite (iterable, optional): Les taux d'imposition des gains à tester.
+        mode (str, optional): Mode de calcul, 'annuel' ou 'mensuel' (voir suggestion_epargne).
+        cache (CacheScenarios, optional): Cache des balayages déjà calculés. Par défaut, cache_balayages ; None le désactive.
+
+    Returns:
+        Balayage: Les capitaux, l'atteinte de l'objectif et l'éligibilité de chaque combinaison.
+
+    Raises:
+        ValueError: Si le mode n'est pas supporté, si aucun produit n'est fourni ou si un axe est invalide.
+    """
+    verifier_mode(mode)
+    if len(epargnes) == 0:
+        raise ValueError("Le balayage demande au moins un produit d'épargne.")
+    axes_fournis = tuple(None if valeurs is None else _axe(valeurs, nom) for nom, valeurs in
+                         zip(AXES_BALAYAGE[1:], (taux_interet, duree_mois, versement_mensuel, fiscalite)))
+    colonnes_personne, colonnes_epargnes = tableaux_personnes([personne]), tableaux_epargnes(epargnes)
+
+    cle = None
+    if cache is not None:
+        cle = _cle_balayage(mode, colonnes_personne, colonnes_epargnes, axes_fournis)
+        balayage = cache.obtenir(cle)
+        if balayage is not None:
+            return balayage
+
+    balayage = _calculer_balayage(colonnes_personne, colonnes_epargnes, *axes_fournis, mode)
+    logging.info(f"Balayage de {len(balayage)} combinaisons pour {personne.nom} ({balayage.forme}).")
+    if cache is not None:
+        cache.ajouter(cle, balayage)
+    return balayage
+
+
+def _calculer_balayage(colonnes_personne: dict[str, np.ndarray], colonnes_epargnes: dict[str, np.ndarray], taux_interet: np.ndarray,
+                       duree_mois: np.ndarray, versement_mensuel: np.ndarray, fiscalite: np.ndarray, mode: str) -> Balayage:
+    """Calcule un balayage par diffusion : chaque paramètre est placé sur son axe de (E, T, D, V, F)."""
+    produit = lambda colonne: colonnes_epargnes[colonne][:, None, None, None, None] # (E, 1, 1, 1, 1)
+    libre = np.array([np.nan])
+
+    # Axes fournis, ou valeurs du produit (taux, fiscalité) et de la personne (durée, versement)
+    taux = produit('taux') if taux_interet is None else taux_interet[None, :, None, None, None]
+    fisc = produit('fiscalite') if fiscalite is None else fiscalite[None, None, None, None, :]
+    axe_duree = colonnes_personne['duree_epargne'].astype(float) if duree_mois is None else duree_mois
+    axe_versement = colonnes_personne['capacite'].copy() if versement_mensuel is None else versement_mensuel
+    duree = axe_duree[None, None, :, None, None]
+    versements = axe_versement[None, None, None, :, None]
+
+    # Gérer le plafond de versement
+    versement_max = produit('versement_max')
+    versement_annuel_total = versements * 12
+    plafonne = ~np.isnan(versement_max) & (versement_annuel_total > versement_max)
+    versement_annuel_effectif = np.where(plafonne, versement_max, versement_annuel_total)
+    versement_mensuel_effectif = np.where(plafonne, versement_max / 12, versements)
+
+    eligible = ~(duree < produit('duree_min')) # Une durée minimale manquante rend le produit accessible
+    forme = np.broadcast_shapes(taux.shape, fisc.shape, eligible.shape, versement_annuel_effectif.shape)
+    valide = np.broadcast_to(eligible & ~(taux < 0) & (versement_annuel_effectif > 0), forme)
+
+    # Les cellules invalides sont neutralisées pour ne pas déclencher les contrôles de calcul
+    taux_calcul = np.where(taux < 0, 0.0, taux)
+    duree_annees = np.maximum(1, np.round(duree / 12)).astype(np.int64)
+    with np.errstate(invalid='ignore'):
+        if mode == 'mensuel':
+            capital_brut, capital_net, capital_net_reel = calcul_capitaux_mensuels(
+                versement_mensuel=np.where(versement_mensuel_effectif > 0, versement_mensuel_effectif, 0.0),
+                taux_annuel=taux_calcul,
+                frais_annuels=produit('frais'),
+                inflation_annuelle=produit('inflation'),
+                fiscalite=fisc,
+                duree_mois=np.maximum(1, duree).astype(np.int64)
+            )
+        else:
+            versement_calcul = np.where(versement_annuel_effectif > 0, versement_annuel_effectif, 0.0)
+            capital_brut = calcul_interets_composes(versement_calcul, taux_calcul, duree_annees)
+            gains_bruts = capital_brut - versement_calcul * duree_annees
+            capital_net = np.where(gains_bruts > 0, capital_brut - gains_bruts * fisc, capital_brut)
+            capital_net_reel = np.nan # Capital réel calculé en mode 'mensuel' uniquement
+
+        resultats = {nom: np.where(valide, np.broadcast_to(valeurs, forme), np.nan)
+                     for nom, valeurs in (('capital_brut', capital_brut), ('capital_net', capital_net), ('capital_net_reel', capital_net_reel))}
+        resultats['atteint_objectif'] = valide & (resultats['capital_net'] >= colonnes_personne['objectif'][0])
+    resultats['eligible'] = valide.copy()
+
+    axes = {
+        'produit': colonnes_epargnes['nom'].copy(),
+        'taux_interet': libre if taux_interet is None else taux_interet,
+        'duree_mois': axe_duree,
+        'versement_mensuel': axe_versement,
+        'fiscalite': libre.copy() if fiscalite is None else fiscalite,
+    }
+    parametres = {
+        'taux_interet': np.array(taux, dtype=float), 'duree_mois': duree, 'versement_mensuel': versements,
+        'fiscalite': np.array(fisc, dtype=float), 'versement_mensuel_effectif': versement_mensuel_effectif,
+    }
+    return Balayage(colonnes_personne['nom'][0], mode, axes, parametres, resultats)
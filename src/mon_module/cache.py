@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+TAILLE_MAX_PAR_DEFAUT = 100_000
+
+
+class CacheScenarios:
+    """
+    Cache LRU borné des calculs de scénarios (par exemple capital brut et net d'un versement donné).
+
+    Quand le cache est plein, l'entrée utilisée le moins récemment est évincée. Les compteurs de
+    succès, d'échecs et d'évictions permettent d'ajuster taille_max à la population de clients.
+    """
+    def __init__(self, taille_max: int = TAILLE_MAX_PAR_DEFAUT):
+        if taille_max <= 0:
+            raise ValueError(f"La taille maximale du cache doit être strictement positive : {taille_max}")
+        self.taille_max = taille_max
+        self._entrees = OrderedDict()
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entrees)
+
+    def __contains__(self, cle):
+        return cle in self._entrees
+
+    def obtenir(self, cle, defaut=None):
+        """Retourne la valeur associée à la clé (et la marque comme récente), ou defaut si elle est absente."""
+        try:
+            valeur = self._entrees[cle]
+        except KeyError:
+            self.echecs += 1
+            return defaut
+        self._entrees.move_to_end(cle)
+        self.succes += 1
+        return valeur
+
+    def ajouter(self, cle, valeur):
+        """Ajoute ou remplace une entrée, en évinçant la plus ancienne si le cache est plein."""
+        self._entrees[cle] = valeur
+        self._entrees.move_to_end(cle)
+        if len(self._entrees) > self.taille_max:
+            self._entrees.popitem(last=False)
+            self.evictions += 1
+
+    def obtenir_ou_calculer(self, cle, calcul):
+        """Retourne la valeur en cache, ou la calcule avec calcul() et la met en cache."""
+        valeur = self.obtenir(cle)
+        if valeur is None:
+            valeur = calcul()
+            self.ajouter(cle, valeur)
+        return valeur
+
+    def vider(self):
+        """Vide le cache et remet les compteurs à zéro."""
+        self._entrees.clear()
+        self.succes = self.echecs = self.evictions = 0
+
+    def statistiques(self) -> dict:
+        """Retourne la taille, les compteurs et le taux de succès du cache."""
+        total = self.succes + self.echecs
+        return {
+            'taille': len(self._entrees),
+            'taille_max': self.taille_max,
+            'succes': self.succes,
+            'echecs': self.echecs,
+            'evictions': self.evictions,
+            'taux_succes': self.succes / total if total else 0.0,
+        }
@@ -0,0 +1,243 @@
+import hashlib
+import logging
+import sqlite3
+
+import numpy as np
+
+from src.mon_module.models.personne import Personne
+from src.mon_module.models.epargne import Epargne
+from src.mon_module.models.catalogue import CatalogueEpargne
+from src.mon_module.models.resultat import ResultatsBatch
+from src.mon_module.core import (tableaux_personnes, tableaux_epargnes, simuler_grille, selectionner_top_k, verifier_mode,
+                                 verifier_critere, EFFORTS_POURCENTAGE, MODE_PAR_DEFAUT, CRITERE_PAR_DEFAUT)
+
+# À incrémenter à chaque changement des calculs du moteur : les résultats en cache sont alors invalidés
+VERSION_MOTEUR = 2
+
+# Attributs qui déterminent les résultats d'une personne et d'un produit (colonnes de tableaux_personnes / tableaux_epargnes)
+ATTRIBUTS_EMPREINTE_PERSONNE = ('nom', 'capacite', 'versement_utilisateur', 'objectif', 'duree_epargne')
+ATTRIBUTS_EMPREINTE_PRODUIT = ('nom', 'taux', 'frais', 'inflation', 'fiscalite', 'duree_min', 'versement_max')
+
+# Scénarios d'un couple (personne, produit), stockés côte à côte dans un BLOB : une seule ligne SQLite par couple,
+# et une seule conversion NumPy (np.frombuffer) pour relire tous les couples. Les autres colonnes de résultats
+# se déduisent de la personne et du produit courants (même empreinte, donc mêmes attributs).
+STRUCTURE_SCENARIO = np.dtype([
+    ('versement_mensuel', '<f8'), ('capital_brut', '<f8'), ('capital_net', '<f8'), ('capital_net_reel', '<f8'),
+    ('atteint_objectif', '?'), ('plafonne', '?'),
+])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (cle TEXT PRIMARY KEY, valeur TEXT);
+CREATE TABLE IF NOT EXISTS paires (
+    empreinte_personne INTEGER, empreinte_produit INTEGER, scenarios BLOB,
+    PRIMARY KEY (empreinte_personne, empreinte_produit)
+) WITHOUT ROWID;
+"""
+
+
+def calculer_empreintes(colonnes: dict[str, np.ndarray], attributs: tuple) -> list[int]:
+    """
+    Calcule l'empreinte (hash BLAKE2 de 64 bits) de chaque ligne à partir des attributs qui influent sur la simulation.
+
+    Les empreintes sont des entiers signés, stockés comme clés INTEGER par SQLite (bien plus compactes
+    et rapides à indexer que des chaînes hexadécimales).
+
+    Args:
+        colonnes (dict[str, np.ndarray]): Colonnes issues de tableaux_personnes ou tableaux_epargnes.
+        attributs (tuple): Les colonnes prises en compte, dans un ordre fixe.
+
+    Returns:
+        list[int]: Une empreinte par ligne.
+    """
+    valeurs = zip(*(colonnes[nom].tolist() for nom in attributs))
+    return [int.from_bytes(hashlib.blake2b(repr(ligne).encode(), digest_size=8).digest(), 'big', signed=True) for ligne in valeurs]
+
+
+class CacheResultatsPersistant:
+    """
+    Cache persistant (fichier SQLite) des résultats de simulation par couple (personne, produit).
+
+    Chaque personne et chaque produit est identifié par l'empreinte de ses attributs nettoyés : une nouvelle
+    exécution ne simule que les couples dont la personne ou le produit a changé, et relit les autres du cache.
+    Le cache est invalidé en entier si la version du moteur ou le mode de calcul change.
+    """
+    def __init__(self, chemin: str, mode: str = MODE_PAR_DEFAUT):
+        verifier_mode(mode)
+        self.chemin = chemin
+        self.mode = mode
+        self.signature = f"{VERSION_MOTEUR}|{mode}|{EFFORTS_POURCENTAGE}"
+        self.connexion = sqlite3.connect(chemin)
+        self.connexion.executescript(_SCHEMA)
+        self._verifier_signature()
+        self.paires_reutilisees = self.paires_simulees = 0
+        self.scenarios_reutilises = self.scenarios_simules = 0
+
+    def _verifier_signature(self):
+        """Vide le cache s'il a été rempli par une autre version du moteur ou un autre mode de calcul."""
+        ligne = self.connexion.execute("SELECT valeur FROM meta WHERE cle = 'signature'").fetchone()
+        if ligne is not None and ligne[0] != self.signature:
+            logging.info(f"Cache de résultats '{self.chemin}' invalidé (moteur '{ligne[0]}' -> '{self.signature}').")
+            self.vider()
+        with self.connexion:
+            self.connexion.execute("INSERT OR REPLACE INTO meta VALUES ('signature', ?)", (self.signature,))
+
+    def vider(self):
+        """Supprime tous les résultats en cache."""
+        with self.connexion:
+            self.connexion.execute("DELETE FROM paires")
+
+    def fermer(self):
+        """Ferme la connexion à la base SQLite."""
+        self.connexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def _charger_courants(self, empreintes_personnes: list[int], empreintes_produits: list[int]):
+        """Charge les empreintes de l'exécution courante dans des tables temporaires, pour les jointures."""
+        self.connexion.execute("CREATE TEMP TABLE IF NOT EXISTS courant_personnes (empreinte INTEGER, indice INTEGER)")
+        self.connexion.execute("CREATE TEMP TABLE IF NOT EXISTS courant_produits (empreinte INTEGER, indice INTEGER)")
+        self.connexion.execute("DELETE FROM courant_personnes")
+        self.connexion.execute("DELETE FROM courant_produits")
+        self.connexion.executemany("INSERT INTO courant_personnes VALUES (?, ?)", zip(empreintes_personnes, range(len(empreintes_personnes))))
+        self.connexion.executemany("INSERT INTO courant_produits VALUES (?, ?)", zip(empreintes_produits, range(len(empreintes_produits))))
+
+    def _lire_paires(self, nb_personnes: int, nb_produits: int) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        """
+        Relit du cache les couples de l'exécution courante.
+
+        Returns:
+            tuple: La matrice (personnes × produits) des couples déjà simulés, et les colonnes de leurs scénarios.
+        """
+        lignes = self.connexion.execute("""
+            SELECT cp.indice, cpr.indice, p.scenarios FROM paires p
+            JOIN courant_personnes cp ON cp.empreinte = p.empreinte_personne
+            JOIN courant_produits cpr ON cpr.empreinte = p.empreinte_produit""").fetchall()
+        indices_personnes, indices_produits, blobs = zip(*lignes) if lignes else ((), (), ())
+        connues = np.zeros((nb_personnes, nb_produits), dtype=bool)
+        connues[np.array(indices_personnes, dtype=np.int64), np.array(indices_produits, dtype=np.int64)] = True
+
+        scenarios = np.frombuffer(b''.join(blobs), dtype=STRUCTURE_SCENARIO)
+        nombres = np.array([len(blob) for blob in blobs], dtype=np.int64) // STRUCTURE_SCENARIO.itemsize
+        relues = {nom: scenarios[nom] for nom in STRUCTURE_SCENARIO.names}
+        relues['indice_personne'] = np.repeat(np.array(indices_personnes, dtype=np.int64), nombres)
+        relues['indice_produit'] = np.repeat(np.array(indices_produits, dtype=np.int64), nombres)
+        return connues, relues
+
+    def _simuler_manquants(self, personnes: dict, epargnes: dict, manquantes: np.ndarray) -> list[dict]:
+        """
+        Simule les couples absents du cache : les personnes sans aucun résultat contre tout le catalogue,
+        les autres contre les seuls produits qui leur manquent.
+        """
+        blocs = []
+        toutes = manquantes.all(axis=1)
+        partielles = manquantes.any(axis=1) & ~toutes
+        groupes = [(np.flatnonzero(toutes), np.arange(manquantes.shape[1]))]
+        if partielles.any():
+            groupes.append((np.flatnonzero(partielles), np.flatnonzero(manquantes[partielles].any(axis=0))))
+
+        for indices_personnes, indices_produits in groupes:
+            if len(indices_personnes) == 0 or len(indices_produits) == 0:
+                continue
+            colonnes = simuler_grille({nom: valeurs[indices_personnes] for nom, valeurs in personnes.items()},
+                                      {nom: valeurs[indices_produits] for nom, valeurs in epargnes.items()}, self.mode)
+            colonnes['indice_personne'] = indices_personnes[colonnes['indice_personne']]
+            colonnes['indice_produit'] = indices_produits[colonnes['indice_produit']]
+            garder = manquantes[colonnes['indice_personne'], colonnes['indice_produit']]
+            blocs.append({nom: valeurs[garder] for nom, valeurs in colonnes.items()})
+        return blocs
+
+    def _enregistrer(self, colonnes: dict[str, np.ndarray], paires: np.ndarray, empreintes_personnes: list[int], empreintes_produits: list[int]):
+        """
+        Enregistre en une transaction les couples simulés, y compris ceux sans aucun scénario valide (BLOB vide).
+
+        Args:
+            colonnes (dict[str, np.ndarray]): Les scénarios simulés, triés par personne puis par produit.
+            paires (np.ndarray): Les couples (indice personne, indice produit) simulés.
+        """
+        scenarios = np.empty(len(colonnes['indice_personne']), dtype=STRUCTURE_SCENARIO)
+        for nom in STRUCTURE_SCENARIO.names:
+            scenarios[nom] = colonnes[nom]
+        cles_scenarios = colonnes['indice_personne'] * len(empreintes_produits) + colonnes['indice_produit']
+        cles_paires = paires[:, 0] * len(empreintes_produits) + paires[:, 1]
+        debuts = np.searchsorted(cles_scenarios, cles_paires, side='left').tolist()
+        fins = np.searchsorted(cles_scenarios, cles_paires, side='right').tolist()
+
+        with self.connexion:
+            self.connexion.executemany("INSERT OR REPLACE INTO paires VALUES (?, ?, ?)", (
+                (empreintes_personnes[i], empreintes_produits[j], scenarios[debut:fin].tobytes())
+                for (i, j), debut, fin in zip(paires.tolist(), debuts, fins)))
+
+    def simuler(self, personnes: list[Personne], epargnes: list[Epargne] | CatalogueEpargne,
+                top_k: int = None, critere: str = CRITERE_PAR_DEFAUT) -> ResultatsBatch:
+        """
+        Simule les personnes en ne recalculant que les couples (personne, produit) absents du cache.
+
+        Args:
+            personnes (list[Personne]): Les personnes à simuler.
+            epargnes (list[Epargne] | CatalogueEpargne): Les produits d'épargne disponibles.
+            top_k (int, optional): Ne conserve que les top_k meilleurs scénarios de chaque personne.
+            critere (str, optional): Critère de classement du mode top_k (voir CRITERES_CLASSEMENT).
+
+        Returns:
+            ResultatsBatch: L'ensemble complet des résultats (relus et nouvellement simulés), dans l'ordre
+            de suggestion_epargne.
+        """
+        verifier_critere(critere, self.mode)
+        colonnes_personnes, colonnes_epargnes = tableaux_personnes(personnes), tableaux_epargnes(epargnes)
+        empreintes_personnes = calculer_empreintes(colonnes_personnes, ATTRIBUTS_EMPREINTE_PERSONNE)
+        empreintes_produits = calculer_empreintes(colonnes_epargnes, ATTRIBUTS_EMPREINTE_PRODUIT)
+
+        self._charger_courants(empreintes_personnes, empreintes_produits)
+        connues, relues = self._lire_paires(len(personnes), len(colonnes_epargnes['nom']))
+        manquantes = ~connues
+        nouvelles = self._simuler_manquants(colonnes_personnes, colonnes_epargnes, manquantes)
+        for bloc in nouvelles:
+            bloc['plafonne'] = bloc['message'] != ""
+
+        # Fusion : les scénarios d'un même couple sont contigus et déjà ordonnés, un tri stable par couple suffit
+        blocs = [relues] + nouvelles
+        colonnes = {nom: np.concatenate([bloc[nom] for bloc in blocs])
+                    for nom in ('indice_personne', 'indice_produit') + STRUCTURE_SCENARIO.names}
+        tri = np.lexsort((colonnes['indice_produit'], colonnes['indice_personne']))
+        colonnes = {nom: valeurs[tri] for nom, valeurs in colonnes.items()}
+
+        # Colonnes déduites de la personne et du produit courants
+        indice_personne, indice_produit = colonnes['indice_personne'], colonnes['indice_produit']
+        colonnes['personne_nom'] = colonnes_personnes['nom'][indice_personne]
+        colonnes['duree_mois'] = colonnes_personnes['duree_epargne'][indice_personne]
+        colonnes['produit_nom'] = colonnes_epargnes['nom'][indice_produit]
+        colonnes['taux_interet'] = colonnes_epargnes['taux'][indice_produit]
+        colonnes['fiscalite'] = colonnes_epargnes['fiscalite'][indice_produit]
+        colonnes['message'] = np.where(colonnes.pop('plafonne'), colonnes_epargnes['message_plafond'][indice_produit], "")
+
+        if nouvelles:
+            simulees = {nom: np.concatenate([bloc[nom] for bloc in nouvelles]) for nom in nouvelles[0]}
+            tri = np.lexsort((simulees['indice_produit'], simulees['indice_personne']))
+            self._enregistrer({nom: valeurs[tri] for nom, valeurs in simulees.items()}, np.argwhere(manquantes),
+                              empreintes_personnes, empreintes_produits)
+
+        self.paires_simulees += int(manquantes.sum())
+        self.paires_reutilisees += int(manquantes.size - manquantes.sum())
+        self.scenarios_reutilises += len(relues['indice_personne'])
+        self.scenarios_simules += len(colonnes['indice_personne']) - len(relues['indice_personne'])
+        logging.info(f"Simulation incrémentale : {manquantes.sum()} couples simulés, "
+                     f"{manquantes.size - manquantes.sum()} couples relus du cache '{self.chemin}'.")
+
+        if top_k is not None:
+            colonnes = selectionner_top_k(colonnes, top_k, critere)
+        return ResultatsBatch(colonnes, avec_capital_reel=self.mode == 'mensuel')
+
+    def statistiques(self) -> dict:
+        """Retourne les compteurs de réutilisation cumulés depuis l'ouverture du cache."""
+        total_paires = self.paires_reutilisees + self.paires_simulees
+        return {
+            'paires_reutilisees': self.paires_reutilisees,
+            'paires_simulees': self.paires_simulees,
+            'scenarios_reutilises': self.scenarios_reutilises,
+            'scenarios_simules': self.scenarios_simules,
+            'taux_reutilisation': self.paires_reutilisees / total_paires if total_paires else 0.0,
+        }
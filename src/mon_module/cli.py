@@ -0,0 +1,303 @@
+"""
+Interface en ligne de commande du simulateur d'épargne.
+
+Exemples :
+    python -m src.mon_module import --personnes extraits/ --sortie-personnes personnes.parquet
+    python -m src.mon_module simulate --personnes personnes.csv --epargnes epargnes.csv --sortie resultats.csv --top-k 3
+    python -m src.mon_module simulate --personnes personnes.csv --epargnes epargnes.csv --cache resultats.cache.sqlite
+    python -m src.mon_module export --resultats resultats.db --sortie resultats.parquet
+    python -m src.mon_module simulate --personnes personnes.csv --epargnes epargnes.csv --mesures mesures.prom
+
+Les modules d'entrées/sorties (pandas) ne sont importés qu'à l'exécution d'une sous-commande :
+l'aide s'affiche sans les charger.
+"""
+import sys
+import time
+import logging
+import argparse
+
+NIVEAUX_LOG = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+NIVEAU_LOG_PAR_DEFAUT = 'WARNING' # Les journaux INFO par bloc se mêleraient à la ligne de progression
+INTERVALLE_PROGRESSION = 0.5 # Secondes minimum entre deux rafraîchissements de la ligne de progression
+
+
+class _Chronometre:
+    """Cumule dans un dictionnaire la durée d'une étape (gestionnaire de contexte)."""
+    def __init__(self, chronometres: dict, etape: str):
+        self.chronometres = chronometres
+        self.etape = etape
+
+    def __enter__(self):
+        self.debut = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.chronometres[self.etape] = self.chronometres.get(self.etape, 0.0) + time.perf_counter() - self.debut
+
+
+class _Progression:
+    """
+    Ligne de progression rafraîchie sur la sortie d'erreur : lignes traitées, résultats écrits et débit.
+
+    Appelée après chaque bloc avec le nombre total de résultats écrits. Le nombre de lignes traitées
+    est lu par la fonction compter_lignes (ex: le compteur de personnes simulées de l'instrumentation).
+    """
+    def __init__(self, compter_lignes, libelle: str, active: bool = True, flux=None):
+        self.compter_lignes = compter_lignes
+        self.libelle = libelle
+        self.active = active
+        self.flux = flux or sys.stderr
+        self.debut = self._dernier_affichage = time.perf_counter()
+        self._affichee = False
+
+    def __call__(self, total_resultats: int, forcer: bool = False):
+        maintenant = time.perf_counter()
+        if not self.active or (not forcer and maintenant - self._dernier_affichage < INTERVALLE_PROGRESSION):
+            return
+        lignes = self.compter_lignes(total_resultats)
+        debit = lignes / (maintenant - self.debut) if maintenant > self.debut else 0.0
+        self.flux.write(f"\r{lignes} {self.libelle}, {total_resultats} résultats écrits ({debit:,.0f} lignes/s)")
+        self.flux.flush()
+        self._dernier_affichage = maintenant
+        self._affichee = True
+
+    def terminer(self, total_resultats: int):
+        """Affiche l'état final puis passe à la ligne."""
+        self(total_resultats, forcer=True)
+        if self._affichee:
+            self.flux.write("\n")
+
+
+def _afficher_resume(chronometres: dict, lignes: int, libelle: str, silencieux: bool):
+    """Affiche la durée de chaque étape, la durée totale et le débit global."""
+    if silencieux:
+        return
+    total = sum(chronometres.values())
+    print("Étape                 Durée")
+    for etape, duree in chronometres.items():
+        print(f"  {etape:<18} {duree:>8.3f} s")
+    print(f"  {'total':<18} {total:>8.3f} s  ({lignes} {libelle}, {lignes / total if total > 0 else 0:,.0f} lignes/s)")
+
+
+def _commande_import(args) -> int:
+    """Importe et nettoie des personnes et/ou des produits, puis les exporte éventuellement dans un autre format."""
+    from src.mon_module.ingestion import import_personnes_fichiers, NB_THREADS_PAR_DEFAUT
+    from src.mon_module.data_manager import (import_epargnes, save_personnes, save_epargnes, import_personnes_sqlite,
+                                             import_epargnes_sqlite, save_personnes_sqlite, save_epargnes_sqlite, FORMATS_SQLITE)
+
+    chronometres, erreurs, lignes = {}, {}, 0
+    if args.personnes:
+        with _Chronometre(chronometres, 'import personnes'):
+            if args.personnes.endswith(FORMATS_SQLITE):
+                personnes = import_personnes_sqlite(args.personnes)
+            else:
+                personnes = import_personnes_fichiers(args.personnes, nb_threads=args.workers or NB_THREADS_PAR_DEFAUT,
+                                                      rapport_erreurs=erreurs)
+        lignes += len(personnes)
+        if not args.silencieux:
+            print(f"{len(personnes)} personnes importées depuis '{args.personnes}'.")
+        if args.sortie_personnes:
+            with _Chronometre(chronometres, 'export personnes'):
+                if args.sortie_personnes.endswith(FORMATS_SQLITE):
+                    save_personnes_sqlite(personnes, args.sortie_personnes)
+                else:
+                    save_personnes(personnes, args.sortie_personnes, compression=args.compression)
+
+    if args.epargnes:
+        with _Chronometre(chronometres, 'import epargnes'):
+            lire = import_epargnes_sqlite if args.epargnes.endswith(FORMATS_SQLITE) else import_epargnes
+            epargnes = lire(args.epargnes)
+        lignes += len(epargnes)
+        if not args.silencieux:
+            print(f"{len(epargnes)} produits d'épargne importés depuis '{args.epargnes}'.")
+        if args.sortie_epargnes:
+            with _Chronometre(chronometres, 'export epargnes'):
+                if args.sortie_epargnes.endswith(FORMATS_SQLITE):
+                    save_epargnes_sqlite(epargnes, args.sortie_epargnes)
+                else:
+                    save_epargnes(epargnes, args.sortie_epargnes, compression=args.compression)
+
+    for chemin, message in erreurs.items():
+        print(f"ERREUR : '{chemin}' ignoré : {message}", file=sys.stderr)
+    _afficher_resume(chronometres, lignes, "lignes importées", args.silencieux)
+    return 1 if erreurs else 0
+
+
+def _commande_simulate(args) -> int:
+    """
+    Simule un fichier de personnes par blocs (ou en parallèle) et écrit les résultats au fil de l'eau.
+    Avec --cache, seuls les couples (personne, produit) nouveaux ou modifiés depuis la dernière exécution sont simulés.
+    """
+    from src.mon_module.data_manager import import_catalogue
+    from src.mon_module.pipeline import simuler_fichier_par_blocs, TAILLE_BLOC_PAR_DEFAUT
+    from src.mon_module.parallele import simuler_en_parallele
+    from src.mon_module.cache_persistant import CacheResultatsPersistant
+    from src.mon_module.instrumentation import instrumentation
+
+    taille_bloc = args.taille_bloc or TAILLE_BLOC_PAR_DEFAUT
+    chronometres = {}
+    with _Chronometre(chronometres, 'catalogue'):
+        catalogue = import_catalogue(args.epargnes)
+
+    cache = CacheResultatsPersistant(args.cache, mode=args.mode) if args.cache else None
+    if cache is None:
+        compter_personnes = lambda _: instrumentation.compteurs['personnes_simulees']
+    else:
+        # Chaque personne compte une fois par produit, qu'elle soit relue du cache ou simulée
+        compter_personnes = lambda _: (cache.paires_reutilisees + cache.paires_simulees) // max(1, len(catalogue))
+    progression = _Progression(compter_personnes, "personnes simulées", active=not args.silencieux)
+    options = {'mode': args.mode, 'top_k': args.top_k, 'critere': args.critere,
+               'chronometres': chronometres, 'progression': progression}
+    try:
+        if args.workers > 1:
+            nombre_resultats = simuler_en_parallele(args.personnes, catalogue, args.sortie, nb_workers=args.workers,
+                                                    taille_shard=taille_bloc, **options)
+        else:
+            nombre_resultats = simuler_fichier_par_blocs(args.personnes, catalogue, args.sortie, taille_bloc=taille_bloc,
+                                                         cache=cache, **options)
+    finally:
+        if cache is not None:
+            cache.fermer()
+    progression.terminer(nombre_resultats)
+
+    if not args.silencieux:
+        print(f"{nombre_resultats} résultats de simulation écrits dans '{args.sortie}'.")
+        if cache is not None:
+            statistiques = cache.statistiques()
+            print(f"Cache '{args.cache}' : {statistiques['paires_simulees']} couples (personne, produit) simulés, "
+                  f"{statistiques['paires_reutilisees']} relus ({statistiques['taux_reutilisation']:.0%}).")
+    _afficher_resume(chronometres, compter_personnes(None), "personnes", args.silencieux)
+    return 0
+
+
+def _iterer_resultats(source: str, taille_bloc: int):
+    """Relit un fichier de résultats (CSV éventuellement compressé, Parquet, Feather, XLSX, SQLite ou binaire) par blocs de ResultatsBatch."""
+    from src.mon_module.models.resultat import ResultatsBatch
+    from src.mon_module.data_manager import importer_donnees_par_blocs, iterer_resultats_sqlite, FORMATS_SQLITE
+    from src.mon_module.stockage_binaire import ouvrir_resultats_binaire, EXTENSION_BINAIRE
+
+    if source.endswith(FORMATS_SQLITE):
+        yield from iterer_resultats_sqlite(source, taille_bloc=taille_bloc)
+    elif source.endswith(EXTENSION_BINAIRE):
+        yield from ouvrir_resultats_binaire(source).iterer_blocs(taille_bloc)
+    else:
+        for df in importer_donnees_par_blocs(source, taille_bloc):
+            yield ResultatsBatch.depuis_dataframe(df)
+
+
+def _commande_export(args) -> int:
+    """Convertit un fichier de résultats vers un autre format, par blocs quand le format de sortie le permet."""
+    import os
+    from src.mon_module.models.resultat import ResultatsBatch
+    from src.mon_module.data_manager import save_resultats_simulation, FORMATS_SQLITE, EXTENSIONS_CSV
+    from src.mon_module.pipeline import ecrire_resultats_par_blocs, TAILLE_BLOC_PAR_DEFAUT
+    from src.mon_module.stockage_binaire import EXTENSION_BINAIRE
+
+    if os.path.abspath(args.resultats) == os.path.abspath(args.sortie):
+        raise ValueError("Le fichier de sortie doit être différent du fichier de résultats lu.")
+
+    chronometres = {}
+    lus = [0]
+    def _blocs_chronometres():
+        blocs = _iterer_resultats(args.resultats, args.taille_bloc or TAILLE_BLOC_PAR_DEFAUT)
+        while True:
+            with _Chronometre(chronometres, 'lecture'):
+                bloc = next(blocs, None)
+            if bloc is None:
+                return
+            lus[0] += len(bloc)
+            yield bloc
+
+    progression = _Progression(lambda _: lus[0], "résultats lus", active=not args.silencieux)
+    if args.sortie.lower().endswith(EXTENSIONS_CSV + (EXTENSION_BINAIRE,) + FORMATS_SQLITE):
+        nombre_resultats = ecrire_resultats_par_blocs(_blocs_chronometres(), args.sortie, chronometres, progression)
+    else:
+        # Formats sans ajout (XLSX, Parquet, Feather) : les blocs sont réunis puis écrits en une fois
+        resultats = ResultatsBatch.concatener(list(_blocs_chronometres()))
+        with _Chronometre(chronometres, 'ecriture'):
+            save_resultats_simulation(resultats, args.sortie, compression=args.compression)
+        nombre_resultats = len(resultats)
+    progression.terminer(nombre_resultats)
+
+    if not args.silencieux:
+        print(f"{nombre_resultats} résultats exportés de '{args.resultats}' vers '{args.sortie}'.")
+    _afficher_resume(chronometres, nombre_resultats, "résultats", args.silencieux)
+    return 0
+
+
+def creer_parser() -> argparse.ArgumentParser:
+    """Construit l'analyseur des arguments de la ligne de commande et de ses sous-commandes."""
+    from src.mon_module.core import MODES_CALCUL, MODE_PAR_DEFAUT, CRITERES_CLASSEMENT, CRITERE_PAR_DEFAUT
+
+    # Options communes, acceptées après chaque sous-commande
+    commun = argparse.ArgumentParser(add_help=False)
+    commun.add_argument('--niveau-log', choices=NIVEAUX_LOG, default=NIVEAU_LOG_PAR_DEFAUT, help="Niveau de journalisation.")
+    commun.add_argument('-q', '--silencieux', action='store_true', help="N'affiche ni la progression ni le résumé.")
+    commun.add_argument('--mesures', default=None, help="Active le profilage et exporte les mesures de latence dans ce fichier "
+                                                        "(.json, sinon format Prometheus).")
+
+    parser = argparse.ArgumentParser(prog="python -m src.mon_module", description="Simulateur d'épargne.")
+    sous_commandes = parser.add_subparsers(dest='commande', required=True)
+
+    importer = sous_commandes.add_parser('import', parents=[commun], help="Importe, nettoie et convertit des personnes et des produits.")
+    importer.add_argument('--personnes', help="Fichier, dossier ou motif glob de personnes (ou base SQLite).")
+    importer.add_argument('--epargnes', help="Fichier de produits d'épargne (ou base SQLite).")
+    importer.add_argument('--sortie-personnes', help="Fichier d'export des personnes nettoyées (CSV, TXT, XLSX, Parquet, Feather, SQLite).")
+    importer.add_argument('--sortie-epargnes', help="Fichier d'export des produits nettoyés (CSV, TXT, XLSX, Parquet, Feather, SQLite).")
+    importer.add_argument('--workers', type=int, default=None, help="Nombre de threads de lecture des fichiers (8 par défaut).")
+    importer.add_argument('--compression', default=None, help="Compression des exports Parquet et Feather (ex: zstd).")
+    importer.set_defaults(executer=_commande_import)
+
+    simuler = sous_commandes.add_parser('simulate', parents=[commun], help="Simule un fichier de personnes et écrit les résultats par blocs.")
+    simuler.add_argument('--personnes', required=True, help="Fichier de personnes (CSV, TXT, XLSX, Parquet, Feather).")
+    simuler.add_argument('--epargnes', required=True, help="Fichier de produits d'épargne.")
+    simuler.add_argument('--sortie', default='resultats_simulations.csv', help="Fichier de résultats (CSV, .csv.gz, .csv.zst, SQLite ou .bin).")
+    simuler.add_argument('--mode', choices=MODES_CALCUL, default=MODE_PAR_DEFAUT, help="Mode de calcul.")
+    simuler.add_argument('--top-k', type=int, default=None, help="Nombre de meilleurs scénarios conservés par personne.")
+    simuler.add_argument('--critere', choices=CRITERES_CLASSEMENT, default=CRITERE_PAR_DEFAUT, help="Critère de classement du mode --top-k (capital_net_reel : mode mensuel uniquement).")
+    simuler.add_argument('--taille-bloc', type=int, default=None, help="Nombre de personnes lues et simulées par bloc (ou par shard).")
+    simuler.add_argument('--workers', type=int, default=1, help="Nombre de processus ; au-delà de 1, sortie CSV uniquement.")
+    simuler.add_argument('--cache', default=None, help="Cache SQLite des résultats par couple (personne, produit) : "
+                                                       "seuls les couples nouveaux ou modifiés sont simulés (sans --workers).")
+    simuler.set_defaults(executer=_commande_simulate)
+
+    exporter = sous_commandes.add_parser('export', parents=[commun], help="Convertit un fichier de résultats vers un autre format.")
+    exporter.add_argument('--resultats', required=True, help="Fichier de résultats lu (CSV, .csv.gz, .csv.zst, XLSX, Parquet, Feather, SQLite ou .bin).")
+    exporter.add_argument('--sortie', required=True, help="Fichier produit (CSV, .csv.gz, .csv.zst, XLSX, Parquet, Feather, SQLite ou .bin).")
+    exporter.add_argument('--taille-bloc', type=int, default=None, help="Nombre de résultats lus par bloc.")
+    exporter.add_argument('--compression', default=None, help="Compression des exports Parquet et Feather (ex: zstd).")
+    exporter.set_defaults(executer=_commande_export)
+    return parser
+
+
+def main(arguments: list[str] = None) -> int:
+    """
+    Point d'entrée de la ligne de commande.
+
+    Args:
+        arguments (list[str], optional): Les arguments (par défaut, ceux du processus).
+
+    Returns:
+        int: Le code de sortie (0 en cas de succès, 1 si des fichiers ont été ignorés, 2 en cas d'erreur).
+    """
+    parser = creer_parser()
+    args = parser.parse_args(arguments)
+    if args.commande == 'import' and not (args.personnes or args.epargnes):
+        parser.error("la commande import attend --personnes et/ou --epargnes.")
+    if args.commande == 'simulate' and args.workers > 1 and not args.sortie.endswith('.csv'):
+        parser.error("la simulation parallèle (--workers > 1) n'écrit que des fichiers CSV.")
+    if args.commande == 'simulate' and args.workers > 1 and args.cache:
+        parser.error("le cache de résultats (--cache) n'est pas disponible avec la simulation parallèle (--workers > 1).")
+
+    logging.basicConfig(level=getattr(logging, args.niveau_log), format='%(asctime)s - %(levelname)s - %(message)s', force=True)
+    if args.mesures:
+        from src.mon_module.profilage import profileur
+        profileur.actif = True
+    try:
+        return args.executer(args)
+    except (FileNotFoundError, ValueError) as e:
+        logging.error(f"Échec de la commande {args.commande} : {e}")
+        print(f"ERREUR : {e}", file=sys.stderr)
+        return 2
+    finally:
+        if args.mesures:
+            profileur.exporter(args.mesures)
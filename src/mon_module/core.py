@@ -1,30 +1,125 @@
+import heapq
 import logging
 import numpy as np
 
 from src.mon_module.models.personne import Personne
+from src.mon_module.models.personnes_array import PersonnesArray
 from src.mon_module.models.epargne import Epargne
-from src.mon_module.models.resultat import ResultatEpargne # NOUVELLE IMPORTATION
+from src.mon_module.models.resultat import ResultatEpargne, ResultatsBatch
+from src.mon_module.models.catalogue import CatalogueEpargne
 from src.mon_module.utils import calcul_interets_composes # Votre fonction de calcul
+from src.mon_module.utils import calcul_capitaux_mensuels
 from src.mon_module.utils import log_suggestion_process
+from src.mon_module.profilage import profiler
+from src.mon_module.instrumentation import instrumentation
+from src.mon_module.cache import CacheScenarios
 
+# Modes de calcul : 'annuel' (historique, versements annuels sur la durée arrondie en années, sans frais)
+# ou 'mensuel' (versements mensuels sur la durée exacte en mois, frais de gestion déduits du taux)
+MODES_CALCUL = ('annuel', 'mensuel')
+MODE_PAR_DEFAUT = 'annuel'
+
+# Critères de classement du mode top_k (le meilleur scénario en premier) :
+# - 'capital_net' / 'capital_net_reel' : capital le plus élevé ('capital_net_reel' en mode 'mensuel' uniquement)
+# - 'objectif_puis_versement' : objectif atteint d'abord, puis versement mensuel le plus faible, puis capital net le plus élevé
+CRITERES_CLASSEMENT = ('capital_net', 'capital_net_reel', 'objectif_puis_versement')
+CRITERE_PAR_DEFAUT = 'capital_net'
+
+
+def verifier_mode(mode: str):
+    """
+    Vérifie qu'un mode de calcul est supporté.
+
+    Raises:
+        ValueError: Si le mode n'est pas dans MODES_CALCUL.
+    """
+    if mode not in MODES_CALCUL:
+        raise ValueError(f"Mode de calcul non supporté : '{mode}'. Modes supportés : {', '.join(MODES_CALCUL)}.")
+
+
+def verifier_critere(critere: str, mode: str = None):
+    """
+    Vérifie qu'un critère de classement est supporté, dans le mode de calcul donné s'il est fourni.
+
+    Raises:
+        ValueError: Si le critère n'est pas dans CRITERES_CLASSEMENT, ou si 'capital_net_reel'
+                    est demandé en mode 'annuel' (le capital réel n'y est pas calculé).
+    """
+    if critere not in CRITERES_CLASSEMENT:
+        raise ValueError(f"Critère de classement non supporté : '{critere}'. Critères supportés : {', '.join(CRITERES_CLASSEMENT)}.")
+    if critere == 'capital_net_reel' and mode == 'annuel':
+        raise ValueError("Le critère 'capital_net_reel' n'est disponible qu'en mode 'mensuel'.")
+
+
+def _cle_classement(resultat: ResultatEpargne, critere: str) -> tuple:
+    """Clé de tri d'un ResultatEpargne selon un critère : la plus grande clé désigne le meilleur scénario."""
+    if critere == 'objectif_puis_versement':
+        return (resultat.atteint_objectif, -resultat.versement_mensuel, resultat.capital_net)
+    return (getattr(resultat, critere),)
+
+
+def calculer_capitaux(versement_annuel: float, taux_annuel: float, duree_annees: int, fiscalite: float) -> tuple[float, float]:
+    """
+    Calcule le capital brut puis le capital net après fiscalité sur les gains.
+
+    Returns:
+        tuple[float, float]: Le capital brut et le capital net.
+
+    Raises:
+        ValueError: Si la durée, le taux ou le versement est négatif.
+    """
+    # Calcul du capital brut avec intérêts
+    capital_brut = calcul_interets_composes(
+        versement_annuel=versement_annuel,
+        taux_annuel=taux_annuel,
+        duree_annees=duree_annees
+    )
+
+    # Application de la fiscalité (si le capital brut est positif)
+    gains_bruts = capital_brut - (versement_annuel * duree_annees)
+    if gains_bruts > 0:
+        imposition = gains_bruts * fiscalite
+        capital_net = capital_brut - imposition
+    else:
+        capital_net = capital_brut # Pas d'imposition si pas de gains
+    return capital_brut, capital_net
+
+
+@profiler(nom='suggestion_epargne')
 @log_suggestion_process
-def suggestion_epargne(personne: Personne, epargnes: list[Epargne]) -> list[ResultatEpargne]:
+def suggestion_epargne(personne: Personne, epargnes: list[Epargne] | CatalogueEpargne, cache: CacheScenarios = None,
+                       mode: str = MODE_PAR_DEFAUT, top_k: int = None, critere: str = CRITERE_PAR_DEFAUT) -> list[ResultatEpargne]:
     """
     Génère des scénarios de simulation d'épargne pour une personne donnée avec divers produits.
 
     Args:
         personne (Personne): L'instance de la personne pour la simulation.
-        epargnes (list[Epargne]): La liste des produits d'épargne disponibles.
+        epargnes (list[Epargne] | CatalogueEpargne): Les produits d'épargne disponibles. Avec un CatalogueEpargne,
+                                                     seuls les produits accessibles sont parcourus.
+        cache (CacheScenarios, optional): Cache des capitaux brut et net, partagé entre les appels et indexé par
+                                          (versement annuel effectif, taux, durée en années, fiscalité).
+        mode (str, optional): 'annuel' (calcul historique) ou 'mensuel' (moteur mensuel avec frais de gestion).
+                              Seul le mode 'mensuel' calcule le capital net réel, actualisé de l'inflation du produit
+                              sur la durée exacte en mois ; en mode 'annuel', capital_net_reel reste à None.
+        top_k (int, optional): Ne conserve que les top_k meilleurs scénarios selon critere (tas borné).
+                               Par défaut, tous les scénarios sont retournés.
+        critere (str, optional): Critère de classement du mode top_k (voir CRITERES_CLASSEMENT).
 
     Returns:
-        list[ResultatEpargne]: Une liste des résultats de simulation pour les scénarios valides.
+        list[ResultatEpargne]: Une liste des résultats de simulation pour les scénarios valides,
+        ou les top_k meilleurs du meilleur au moins bon.
+
+    Raises:
+        ValueError: Si le mode de calcul ou le critère n'est pas supporté.
     """
-    logging.info(f"Début de la simulation d'épargne pour {personne.nom}.")
+    verifier_mode(mode)
+    verifier_critere(critere, mode)
     resultats_simulations = []
+    instrumentation.incrementer('personnes_simulees')
 
     # Vérifier que la capacité d'épargne est valide
     if np.isnan(personne.capacite_epargne_mensuelle) or personne.capacite_epargne_mensuelle <= 0:
-        logging.warning(f"La capacité d'épargne de {personne.nom} est invalide ou nulle ({personne.capacite_epargne_mensuelle:.2f} €). Pas de simulation possible.")
+        instrumentation.incrementer('personnes_sans_capacite')
         return []
 
     capacite_epargne_mensuelle = personne.capacite_epargne_mensuelle
@@ -45,15 +140,21 @@ def suggestion_epargne(personne: Personne, epargnes: list[Epargne]) -> list[Resu
 
     # Durée de l'épargne en années pour la fonction de calcul des intérêts composés
     duree_epargne_annees = max(1, round(personne.duree_epargne / 12)) # Au moins 1 an si durée en mois est 0 ou faible
+    duree_epargne_mois = max(1, personne.duree_epargne) # Durée du moteur mensuel : au moins 1 mois
 
-    for epargne_produit in epargnes:
-        logging.info(f"  Analyse du produit '{epargne_produit.nom}'.")
+    # Compteurs locaux, reportés une seule fois dans l'instrumentation en fin de simulation
+    produits_ignores = versements_plafonnes = erreurs_calcul = 0
+    trace_active = instrumentation.trace_active
 
+    if isinstance(epargnes, CatalogueEpargne):
+        # Les produits accessibles sont obtenus par bisect sur l'index du catalogue, sans contrôle produit par produit
+        produits = epargnes.produits_eligibles(personne.duree_epargne)
+    else:
         # Ignorer les produits inaccessibles selon la durée d'investissement
-        if personne.duree_epargne < epargne_produit.duree_min:
-            logging.info(f"    Produit '{epargne_produit.nom}' ignoré : durée minimale ({epargne_produit.duree_min} mois) non atteinte par la durée d'épargne de {personne.duree_epargne} mois.")
-            continue
+        produits = [e for e in epargnes if not personne.duree_epargne < e.duree_min]
+    produits_ignores = len(epargnes) - len(produits)
 
+    for epargne_produit in produits:
         for versement_mensuel in scenarios_versement_mensuel:
             # Calculer le versement annuel
             versement_annuel_total = versement_mensuel * 12
@@ -66,39 +167,52 @@ def suggestion_epargne(personne: Personne, epargnes: list[Epargne]) -> list[Resu
                 # Et donc le versement mensuel effectif est le plafond annuel / 12
                 versement_mensuel_effectif = versement_annuel_effectif / 12
                 message_scenario = f"Versement ajusté au plafond ({epargne_produit.versement_max:.2f} €/an)."
-                logging.info(f"    Scénario: {versement_mensuel:.2f} €/mois. Versement annuel {versement_annuel_total:.2f} € dépasse le plafond de '{epargne_produit.nom}'. Ajusté à {versement_mensuel_effectif:.2f} €/mois.")
+                versements_plafonnes += 1
             else:
                 versement_annuel_effectif = versement_annuel_total
                 versement_mensuel_effectif = versement_mensuel
-                logging.info(f"    Scénario: {versement_mensuel:.2f} €/mois. Versement annuel effectif: {versement_annuel_effectif:.2f} €.")
 
             # S'assurer que le versement effectif est positif
             if versement_annuel_effectif <= 0:
-                logging.info(f"    Versement effectif de {versement_annuel_effectif:.2f} €/an est nul ou négatif. Scénario ignoré.")
                 continue
 
-            # Calcul du capital brut avec intérêts
+            # Calcul des capitaux brut et net, éventuellement depuis le cache
+            capital_net_reel = None # Calculé en mode 'mensuel' uniquement
             try:
-                capital_brut = calcul_interets_composes(
-                    versement_annuel=versement_annuel_effectif,
-                    taux_annuel=epargne_produit.taux_interet_annuel,
-                    duree_annees=duree_epargne_annees
-                )
+                if mode == 'mensuel':
+                    cle = ('mensuel', versement_mensuel_effectif, epargne_produit.taux_interet_annuel, epargne_produit.frais_gestion_annuels,
+                           epargne_produit.inflation_annuelle, epargne_produit.fiscalite, duree_epargne_mois)
+                    capitaux = None if cache is None else cache.obtenir(cle)
+                    if capitaux is None:
+                        capitaux = calcul_capitaux_mensuels(*cle[1:])
+                        if cache is not None:
+                            cache.ajouter(cle, capitaux)
+                    capital_brut, capital_net, capital_net_reel = capitaux
+                elif cache is None:
+                    capital_brut, capital_net = calculer_capitaux(versement_annuel_effectif, epargne_produit.taux_interet_annuel,
+                                                                  duree_epargne_annees, epargne_produit.fiscalite)
+                else:
+                    cle = (versement_annuel_effectif, epargne_produit.taux_interet_annuel, duree_epargne_annees, epargne_produit.fiscalite)
+                    capitaux = cache.obtenir(cle)
+                    if capitaux is None:
+                        capitaux = calculer_capitaux(*cle)
+                        cache.ajouter(cle, capitaux)
+                    capital_brut, capital_net = capitaux
             except ValueError as e:
-                logging.error(f"Erreur de calcul des intérêts pour {epargne_produit.nom} avec {versement_annuel_effectif}€/an sur {duree_epargne_annees} ans: {e}")
+                erreurs_calcul += 1
+                if trace_active:
+                    instrumentation.tracer("Erreur de calcul des intérêts pour %s avec %s€/an sur %s ans: %s",
+                                           epargne_produit.nom, versement_annuel_effectif, duree_epargne_annees, e)
                 continue # Passe au scénario suivant
 
-            # Application de la fiscalité (si le capital brut est positif)
-            gains_bruts = capital_brut - (versement_annuel_effectif * duree_epargne_annees)
-            if gains_bruts > 0:
-                imposition = gains_bruts * epargne_produit.fiscalite
-                capital_net = capital_brut - imposition
-            else:
-                capital_net = capital_brut # Pas d'imposition si pas de gains
-
             # Vérifier si l'objectif est atteint
             atteint_objectif = capital_net >= personne.objectif
 
+            if trace_active and instrumentation.echantillonner():
+                instrumentation.tracer("%s / %s : %.2f €/mois sur %s mois -> brut %.2f €, net %.2f €, objectif %s. %s",
+                                       personne.nom, epargne_produit.nom, versement_mensuel_effectif, personne.duree_epargne,
+                                       capital_brut, capital_net, 'atteint' if atteint_objectif else 'non atteint', message_scenario)
+
             # Ajouter le résultat à la liste
             resultats_simulations.append(
                 ResultatEpargne(
@@ -111,8 +225,371 @@ def suggestion_epargne(personne: Personne, epargnes: list[Epargne]) -> list[Resu
                     capital_brut=capital_brut,
                     capital_net=capital_net,
                     atteint_objectif=atteint_objectif,
-                    message=message_scenario
+                    message=message_scenario,
+                    capital_net_reel=capital_net_reel
                 )
             )
-    logging.info(f"Simulation d'épargne terminée pour {personne.nom}. Total de {len(resultats_simulations)} scénarios générés.")
-    return resultats_simulations
\ No newline at end of file
+    instrumentation.incrementer('scenarios_evalues', len(resultats_simulations))
+    instrumentation.incrementer('produits_ignores_duree_min', produits_ignores)
+    instrumentation.incrementer('versements_plafonnes', versements_plafonnes)
+    instrumentation.incrementer('erreurs_calcul', erreurs_calcul)
+    if top_k is not None:
+        # nlargest garde un tas de top_k éléments et conserve l'ordre d'origine en cas d'égalité
+        return heapq.nlargest(top_k, resultats_simulations, key=lambda r: _cle_classement(r, critere))
+    return resultats_simulations
+
+# ====================================================================================
+# MOTEUR VECTORISÉ (PERSONNES × PRODUITS × SCÉNARIOS)
+# ====================================================================================
+
+EFFORTS_POURCENTAGE = (0.25, 0.50, 0.75, 1.00)
+NB_SCENARIOS = len(EFFORTS_POURCENTAGE) + 1 # + le versement défini par l'utilisateur
+CELLULES_PAR_BLOC = 2_000_000 # Nombre cible de cellules (personne, produit, scénario) par bloc
+
+
+def _en_float(valeur) -> float:
+    """Convertit une valeur en float, None devenant np.nan."""
+    return np.nan if valeur is None else float(valeur)
+
+
+def tableaux_personnes(personnes: list[Personne] | PersonnesArray) -> dict[str, np.ndarray]:
+    """
+    Convertit une liste de Personne en tableaux NumPy (une colonne par attribut utile à la simulation).
+
+    Args:
+        personnes (list[Personne] | PersonnesArray): Les personnes à simuler. Les colonnes
+                                                    d'un PersonnesArray sont réutilisées sans copie.
+
+    Returns:
+        dict[str, np.ndarray]: Les colonnes 'nom', 'capacite', 'versement_utilisateur', 'objectif' et 'duree_epargne'.
+    """
+    if isinstance(personnes, PersonnesArray):
+        return personnes.tableaux()
+    return {
+        'nom': np.array([p.nom for p in personnes], dtype=object),
+        'capacite': np.array([_en_float(p.capacite_epargne_mensuelle) for p in personnes], dtype=float),
+        'versement_utilisateur': np.array([_en_float(p.versement_mensuel_utilisateur) for p in personnes], dtype=float),
+        'objectif': np.array([_en_float(p.objectif) for p in personnes], dtype=float),
+        'duree_epargne': np.array([p.duree_epargne for p in personnes], dtype=np.int64),
+    }
+
+
+def tableaux_epargnes(epargnes: list[Epargne] | CatalogueEpargne) -> dict[str, np.ndarray]:
+    """
+    Convertit une liste d'Epargne en tableaux NumPy (une colonne par attribut utile à la simulation).
+
+    Args:
+        epargnes (list[Epargne] | CatalogueEpargne): Les produits d'épargne disponibles. Les colonnes
+                                                     d'un CatalogueEpargne sont réutilisées sans recalcul.
+
+    Returns:
+        dict[str, np.ndarray]: Les colonnes 'nom', 'taux', 'frais', 'inflation', 'fiscalite', 'duree_min',
+        'versement_max' et 'message_plafond'.
+    """
+    if isinstance(epargnes, CatalogueEpargne):
+        return epargnes.tableaux
+    return CatalogueEpargne(epargnes).tableaux
+
+
+def _scenarios_versements(capacite: np.ndarray, versement_utilisateur: np.ndarray) -> np.ndarray:
+    """
+    Construit la matrice (personnes × scénarios) des versements mensuels à tester.
+
+    Reproduit suggestion_epargne : versement utilisateur (s'il est positif) et 25/50/75/100 %
+    de la capacité, triés par ordre croissant et sans doublons. Les cases inutilisées valent np.nan.
+    """
+    scenarios = np.empty((len(capacite), NB_SCENARIOS), dtype=float)
+    scenarios[:, 0] = versement_utilisateur
+    scenarios[:, 1:] = capacite[:, None] * np.array(EFFORTS_POURCENTAGE)
+    scenarios[~(scenarios > 0)] = np.nan # Les versements nuls, négatifs ou manquants sont écartés
+    scenarios.sort(axis=1) # Les np.nan sont placés en fin de ligne
+
+    doublons = np.zeros(scenarios.shape, dtype=bool)
+    doublons[:, 1:] = scenarios[:, 1:] == scenarios[:, :-1]
+    scenarios[doublons] = np.nan
+    return scenarios
+
+
+def simuler_grille(personnes: dict[str, np.ndarray], epargnes: dict[str, np.ndarray],
+                   mode: str = MODE_PAR_DEFAUT) -> dict[str, np.ndarray]:
+    """
+    Simule en une seule passe NumPy toutes les combinaisons personnes × produits × scénarios.
+
+    Les calculs sont identiques à ceux de suggestion_epargne : éligibilité selon duree_min,
+    plafonnement au versement_max, capital brut, fiscalité sur les gains et atteinte de l'objectif.
+
+    Args:
+        personnes (dict[str, np.ndarray]): Colonnes issues de tableaux_personnes.
+        epargnes (dict[str, np.ndarray]): Colonnes issues de tableaux_epargnes.
+        mode (str, optional): Mode de calcul, 'annuel' ou 'mensuel' (voir suggestion_epargne).
+
+    Returns:
+        dict[str, np.ndarray]: Les colonnes des scénarios valides, dans le même ordre que
+        suggestion_epargne appelée personne par personne. Les colonnes 'indice_personne' et
+        'indice_produit' renvoient aux lignes des tableaux d'entrée.
+    """
+    capacite = personnes['capacite']
+    versements = _scenarios_versements(capacite, personnes['versement_utilisateur'])[:, None, :] # (P, 1, S)
+    duree_epargne = personnes['duree_epargne']
+    duree_annees = np.maximum(1, np.round(duree_epargne / 12)).astype(np.int64)[:, None, None]
+
+    taux = epargnes['taux'][None, :, None] # (1, E, 1)
+    fiscalite = epargnes['fiscalite'][None, :, None]
+    versement_max = epargnes['versement_max'][None, :, None]
+
+    # Gérer le plafond de versement
+    versement_annuel_total = versements * 12
+    plafonne = ~np.isnan(versement_max) & (versement_annuel_total > versement_max)
+    versement_annuel_effectif = np.where(plafonne, versement_max, versement_annuel_total)
+    versement_mensuel_effectif = np.where(plafonne, versement_max / 12, versements)
+
+    valide = (
+        (capacite > 0)[:, None, None] # Capacité d'épargne valide
+        & ~(duree_epargne[:, None] < epargnes['duree_min'][None, :])[:, :, None] # Durée minimale atteinte
+        & ~np.isnan(versements) # Scénario existant
+        & (versement_annuel_effectif > 0) # Versement effectif positif
+    )
+
+    # Les taux négatifs lèvent une erreur de calcul dans suggestion_epargne : scénarios ignorés
+    taux_invalides = epargnes['taux'] < 0
+    if taux_invalides.any():
+        instrumentation.incrementer('erreurs_calcul', np.count_nonzero(valide & taux_invalides[None, :, None]))
+        valide &= ~taux_invalides[None, :, None]
+
+    # Les cellules invalides sont neutralisées pour ne pas déclencher les contrôles de calcul
+    taux_calcul = np.where(taux < 0, 0.0, taux)
+    inflation = epargnes['inflation'][None, :, None]
+    if mode == 'mensuel':
+        capital_brut, capital_net, capital_net_reel = calcul_capitaux_mensuels(
+            versement_mensuel=np.where(versement_mensuel_effectif > 0, versement_mensuel_effectif, 0.0),
+            taux_annuel=taux_calcul,
+            frais_annuels=epargnes['frais'][None, :, None],
+            inflation_annuelle=inflation,
+            fiscalite=fiscalite,
+            duree_mois=np.maximum(1, duree_epargne)[:, None, None]
+        )
+    else:
+        capital_brut = calcul_interets_composes(
+            versement_annuel=np.where(versement_annuel_effectif > 0, versement_annuel_effectif, 0.0),
+            taux_annuel=taux_calcul,
+            duree_annees=duree_annees
+        )
+
+        # Application de la fiscalité (si les gains sont positifs)
+        gains_bruts = capital_brut - (versement_annuel_effectif * duree_annees)
+        capital_net = np.where(gains_bruts > 0, capital_brut - gains_bruts * fiscalite, capital_brut)
+        capital_net_reel = np.nan # Capital réel calculé en mode 'mensuel' uniquement
+
+    atteint_objectif = capital_net >= personnes['objectif'][:, None, None]
+
+    # Aplatissement des scénarios valides dans l'ordre personne → produit → versement
+    indice_personne, indice_produit, indice_scenario = np.nonzero(valide)
+    cellules = (indice_personne, indice_produit, indice_scenario)
+    plafonne_valide = np.broadcast_to(plafonne, valide.shape)[cellules]
+
+    personne_valide = capacite > 0
+    instrumentation.incrementer('personnes_simulees', len(capacite))
+    instrumentation.incrementer('personnes_sans_capacite', np.count_nonzero(~personne_valide))
+    instrumentation.incrementer('scenarios_evalues', len(indice_personne))
+    instrumentation.incrementer('produits_ignores_duree_min', np.count_nonzero(
+        personne_valide[:, None] & (duree_epargne[:, None] < epargnes['duree_min'][None, :])))
+    instrumentation.incrementer('versements_plafonnes', np.count_nonzero(plafonne_valide))
+
+    colonnes = {
+        'indice_personne': indice_personne,
+        'indice_produit': indice_produit,
+        'personne_nom': personnes['nom'][indice_personne],
+        'produit_nom': epargnes['nom'][indice_produit],
+        'taux_interet': epargnes['taux'][indice_produit],
+        'fiscalite': epargnes['fiscalite'][indice_produit],
+        'versement_mensuel': np.broadcast_to(versement_mensuel_effectif, valide.shape)[cellules],
+        'duree_mois': duree_epargne[indice_personne],
+        'capital_brut': np.broadcast_to(capital_brut, valide.shape)[cellules],
+        'capital_net': np.broadcast_to(capital_net, valide.shape)[cellules],
+        'capital_net_reel': np.broadcast_to(capital_net_reel, valide.shape)[cellules],
+        'atteint_objectif': np.broadcast_to(atteint_objectif, valide.shape)[cellules],
+        'message': np.where(plafonne_valide, epargnes['message_plafond'][indice_produit], ""),
+    }
+    if instrumentation.trace_active:
+        _tracer_echantillon(colonnes)
+    return colonnes
+
+
+def _tracer_echantillon(colonnes: dict[str, np.ndarray]):
+    """Trace un échantillon des scénarios d'un bloc, selon le taux de l'instrumentation."""
+    for i in instrumentation.echantillonner_indices(len(colonnes['capital_net'])):
+        instrumentation.tracer("%s / %s : %.2f €/mois sur %s mois -> brut %.2f €, net %.2f €, objectif %s. %s",
+                               colonnes['personne_nom'][i], colonnes['produit_nom'][i], colonnes['versement_mensuel'][i],
+                               colonnes['duree_mois'][i], colonnes['capital_brut'][i], colonnes['capital_net'][i],
+                               'atteint' if colonnes['atteint_objectif'][i] else 'non atteint', colonnes['message'][i])
+
+
+def _scores_classement(colonnes: dict[str, np.ndarray], critere: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Scores de classement (les plus grands sont les meilleurs) de chaque scénario d'un bloc de colonnes :
+    un score principal et un score secondaire départageant les égalités.
+    """
+    if critere == 'objectif_puis_versement':
+        # Un scénario atteignant l'objectif passe devant tous les autres, quel que soit son versement
+        versements = colonnes['versement_mensuel']
+        ecart = 2 * versements.max(initial=0.0) + 1
+        return colonnes['atteint_objectif'] * ecart - versements, colonnes['capital_net']
+    return colonnes[critere], np.zeros(len(colonnes[critere]))
+
+
+def _masque_meilleurs(principal: np.ndarray, secondaire: np.ndarray, top_k: int) -> np.ndarray:
+    """
+    Masque des top_k meilleures cases de chaque ligne, selon le score principal puis le score secondaire
+    puis la position, sans trier les lignes entières.
+    """
+    seuil = -np.partition(-principal, top_k - 1, axis=1)[:, top_k - 1:top_k] # k-ième meilleur score principal
+    masque = principal > seuil
+    egaux = principal == seuil
+    besoin = top_k - masque.sum(axis=1)
+
+    # Égalités au seuil : le tri complet n'est fait que pour les lignes où il faut départager
+    a_departager = egaux.sum(axis=1) > besoin
+    masque[~a_departager] |= egaux[~a_departager]
+    departage = np.flatnonzero(a_departager)
+    if len(departage):
+        secondaire_egaux = np.where(egaux[departage], secondaire[departage], np.nan)
+        ordre = np.argsort(-secondaire_egaux, axis=1, kind='stable') # Les np.nan (non égaux) sont placés en fin
+        rangs = np.empty_like(ordre)
+        np.put_along_axis(rangs, ordre, np.arange(ordre.shape[1])[None, :], axis=1)
+        masque[departage] |= egaux[departage] & (rangs < besoin[departage, None])
+    return masque
+
+
+def selectionner_top_k(colonnes: dict[str, np.ndarray], top_k: int, critere: str = CRITERE_PAR_DEFAUT) -> dict[str, np.ndarray]:
+    """
+    Ne conserve que les top_k meilleurs scénarios de chaque personne d'un bloc de colonnes.
+
+    Les scénarios sont rangés dans une matrice (personnes × scénarios) puis une sélection partielle
+    (np.partition) isole les top_k meilleurs par ligne ; seuls ces candidats sont ensuite triés.
+    Le classement est identique à celui de suggestion_epargne avec top_k.
+
+    Args:
+        colonnes (dict[str, np.ndarray]): Colonnes issues de simuler_grille (triées par indice_personne).
+        top_k (int): Nombre de scénarios conservés par personne.
+        critere (str, optional): Critère de classement (voir CRITERES_CLASSEMENT).
+
+    Returns:
+        dict[str, np.ndarray]: Les colonnes des scénarios retenus, personne par personne et du meilleur
+        au moins bon, avec une colonne 'rang' (1 pour le meilleur).
+
+    Raises:
+        ValueError: Si top_k n'est pas strictement positif ou si le critère n'est pas supporté.
+    """
+    if top_k < 1:
+        raise ValueError("top_k doit être strictement positif.")
+    verifier_critere(critere)
+    indice_personne = colonnes['indice_personne']
+    if len(indice_personne) == 0:
+        return {**colonnes, 'rang': np.empty(0, dtype=np.int64)}
+
+    # Position de chaque scénario dans sa personne (les scénarios d'une personne sont contigus)
+    _, debuts, nombres = np.unique(indice_personne, return_index=True, return_counts=True)
+    ligne = np.repeat(np.arange(len(debuts)), nombres)
+    position = np.arange(len(indice_personne)) - debuts[ligne]
+
+    principal = np.full((len(debuts), nombres.max()), -np.inf) # Les cases vides ne sont jamais retenues
+    secondaire = np.zeros(principal.shape)
+    principal[ligne, position], secondaire[ligne, position] = _scores_classement(colonnes, critere)
+    top_k = min(top_k, principal.shape[1])
+
+    # Exactement top_k candidats par ligne, dans l'ordre des positions, puis triés entre eux
+    candidats = np.nonzero(_masque_meilleurs(principal, secondaire, top_k))[1].reshape(-1, top_k)
+    ordre = np.lexsort((np.take_along_axis(-secondaire, candidats, axis=1), np.take_along_axis(-principal, candidats, axis=1)))
+    candidats = np.take_along_axis(candidats, ordre, axis=1)
+
+    retenus = np.isfinite(np.take_along_axis(principal, candidats, axis=1)) # Écarte les cases vides
+    selection = (debuts[:, None] + candidats)[retenus]
+    resultat = {nom: valeurs[selection] for nom, valeurs in colonnes.items()}
+    resultat['rang'] = np.broadcast_to(np.arange(1, top_k + 1), candidats.shape)[retenus]
+    return resultat
+
+
+def iterer_blocs_grille(personnes: list[Personne] | PersonnesArray, epargnes: list[Epargne], taille_bloc: int = None,
+                        mode: str = MODE_PAR_DEFAUT, top_k: int = None, critere: str = CRITERE_PAR_DEFAUT):
+    """
+    Découpe la simulation vectorisée en blocs de personnes pour borner la mémoire utilisée.
+
+    Args:
+        personnes (list[Personne] | PersonnesArray): Les personnes à simuler.
+        epargnes (list[Epargne] | CatalogueEpargne): Les produits d'épargne disponibles (index construit si besoin).
+        taille_bloc (int, optional): Nombre de personnes par bloc. Par défaut, calculé pour
+                                     traiter environ CELLULES_PAR_BLOC cellules par bloc.
+        mode (str, optional): Mode de calcul, 'annuel' ou 'mensuel' (voir suggestion_epargne).
+        top_k (int, optional): Ne conserve que les top_k meilleurs scénarios de chaque personne (voir selectionner_top_k).
+        critere (str, optional): Critère de classement du mode top_k (voir CRITERES_CLASSEMENT).
+
+    Yields:
+        dict[str, np.ndarray]: Les colonnes de résultats de chaque bloc (voir simuler_grille).
+
+    Raises:
+        ValueError: Si le mode de calcul ou le critère n'est pas supporté.
+    """
+    verifier_mode(mode)
+    verifier_critere(critere, mode)
+    catalogue = epargnes if isinstance(epargnes, CatalogueEpargne) else CatalogueEpargne(epargnes)
+    if taille_bloc is None:
+        taille_bloc = max(1, CELLULES_PAR_BLOC // max(1, len(epargnes) * NB_SCENARIOS))
+
+    for debut in range(0, len(personnes), taille_bloc):
+        colonnes_personnes = tableaux_personnes(personnes[debut:debut + taille_bloc])
+        # Seuls les produits accessibles à la plus longue durée du bloc (préfixe du catalogue trié par
+        # duree_min) entrent dans la grille ; l'éligibilité par personne reste un masque vectorisé
+        duree_max = int(colonnes_personnes['duree_epargne'].max())
+        indices = catalogue.indices_eligibles(duree_max)
+        colonnes = simuler_grille(colonnes_personnes, catalogue.tableaux_eligibles(duree_max), mode)
+        colonnes['indice_produit'] = indices[colonnes['indice_produit']]
+        colonnes['indice_personne'] = colonnes['indice_personne'] + debut
+        if len(indices) < len(catalogue):
+            # Produits écartés du bloc : ignorés pour chaque personne ayant une capacité d'épargne
+            instrumentation.incrementer('produits_ignores_duree_min', (len(catalogue) - len(indices))
+                                        * np.count_nonzero(colonnes_personnes['capacite'] > 0))
+        yield colonnes if top_k is None else selectionner_top_k(colonnes, top_k, critere)
+
+
+def simuler_resultats_batch(personnes: list[Personne] | PersonnesArray, epargnes: list[Epargne], taille_bloc: int = None,
+                            mode: str = MODE_PAR_DEFAUT, top_k: int = None, critere: str = CRITERE_PAR_DEFAUT) -> ResultatsBatch:
+    """
+    Simule toutes les personnes avec le moteur vectorisé et remplit directement un ResultatsBatch.
+
+    Args:
+        personnes (list[Personne] | PersonnesArray): Les personnes à simuler.
+        epargnes (list[Epargne]): Les produits d'épargne disponibles.
+        taille_bloc (int, optional): Nombre de personnes simulées simultanément.
+        mode (str, optional): Mode de calcul, 'annuel' ou 'mensuel' (voir suggestion_epargne).
+        top_k (int, optional): Ne conserve que les top_k meilleurs scénarios de chaque personne (voir selectionner_top_k).
+        critere (str, optional): Critère de classement du mode top_k (voir CRITERES_CLASSEMENT).
+
+    Returns:
+        ResultatsBatch: Les résultats de simulation, dans l'ordre de suggestion_epargne.
+    """
+    logging.info(f"Début de la simulation vectorisée pour {len(personnes)} personnes et {len(epargnes)} produits.")
+    resultats = ResultatsBatch(avec_capital_reel=mode == 'mensuel')
+    for colonnes in iterer_blocs_grille(personnes, epargnes, taille_bloc, mode, top_k, critere):
+        resultats.ajouter(colonnes)
+    logging.info(f"Simulation vectorisée terminée. Total de {len(resultats)} scénarios générés.")
+    return resultats
+
+
+def suggestion_epargne_batch(personnes: list[Personne] | PersonnesArray, epargnes: list[Epargne], taille_bloc: int = None,
+                             mode: str = MODE_PAR_DEFAUT, top_k: int = None, critere: str = CRITERE_PAR_DEFAUT) -> list[ResultatEpargne]:
+    """
+    Équivalent vectorisé de suggestion_epargne appliquée à chaque personne d'une liste.
+
+    Args:
+        personnes (list[Personne] | PersonnesArray): Les personnes à simuler.
+        epargnes (list[Epargne]): Les produits d'épargne disponibles.
+        taille_bloc (int, optional): Nombre de personnes simulées simultanément.
+        mode (str, optional): Mode de calcul, 'annuel' ou 'mensuel' (voir suggestion_epargne).
+        top_k (int, optional): Ne conserve que les top_k meilleurs scénarios de chaque personne (voir selectionner_top_k).
+        critere (str, optional): Critère de classement du mode top_k (voir CRITERES_CLASSEMENT).
+
+    Returns:
+        list[ResultatEpargne]: Les mêmes résultats, dans le même ordre, que la concaténation
+        des appels à suggestion_epargne pour chaque personne.
+    """
+    return list(simuler_resultats_batch(personnes, epargnes, taille_bloc, mode, top_k, critere))
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np # <-- NOUVELLE IMPORTATION POUR np.nan
+from src.mon_module.profilage import profiler
 
 def nettoyer_taux(taux):
     """Convertit un taux en float, gère les pourcentages et les erreurs."""
@@ -26,23 +27,122 @@ def nettoyer_nombre(nombre, type_cible=float): # <-- Changement du type_cible pa
     except ValueError:
         raise ValueError(f"Nombre invalide : '{nombre}'")
 
-def nettoyer_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-    """Nettoie un DataFrame pandas pour l'import des données Personne ou Epargne."""
+# Colonnes par type de nettoyage attendu
+COLS_POUR_TAUX = ['taux_interet', 'fiscalite']
+COLS_POUR_FLOAT = ['revenu_annuel', 'loyer', 'depenses_mensuelles', 'versement_max', 'versement_mensuel_utilisateur']
+COLS_POUR_INT = ['age', 'duree_min', 'duree_epargne'] # Ajout de duree_epargne
+
+
+class ErreurNettoyage(ValueError):
+    """Erreur levée lorsque des valeurs ne peuvent pas être converties, avec les lignes fautives par colonne."""
+    def __init__(self, erreurs: dict[str, list]):
+        self.erreurs = erreurs
+        details = ", ".join(f"'{col}' (lignes {indices})" for col, indices in erreurs.items())
+        super().__init__(f"Valeurs invalides dans {len(erreurs)} colonne(s) : {details}")
+
+
+def _convertir_colonne(serie: pd.Series, pourcentage: bool) -> tuple[pd.Series, list]:
+    """
+    Convertit une colonne en float de façon vectorisée, avec les mêmes règles que nettoyer_taux / nettoyer_nombre.
+
+    Returns:
+        tuple[pd.Series, list]: La colonne convertie (np.nan pour les valeurs manquantes ou invalides)
+        et les index des valeurs invalides.
+    """
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        return serie.astype(float), [] # Colonne déjà numérique : rien à analyser
+
+    texte = serie.astype(str).str.strip()
+    manquant = serie.isna() | (texte.str.lower() == 'none') | (texte == '')
+    texte = texte.str.replace(',', '.', regex=False)
+    if pourcentage:
+        est_pourcentage = texte.str.contains('%', regex=False) & ~manquant
+        texte = texte.where(~est_pourcentage, texte.str.strip('%'))
+
+    valeurs = pd.to_numeric(texte.where(~manquant), errors='coerce').astype(float)
+
+    # Les rares échecs de pd.to_numeric repassent par float() pour garder exactement ses règles
+    invalides = []
+    for index in valeurs.index[valeurs.isna() & ~manquant]:
+        try:
+            valeurs[index] = float(texte[index])
+        except ValueError:
+            invalides.append(index)
+
+    if pourcentage:
+        valeurs[est_pourcentage] /= 100
+    return valeurs, invalides
+
+
+def nettoyer_colonne_taux(serie: pd.Series) -> tuple[pd.Series, list]:
+    """Version vectorisée de nettoyer_taux pour une colonne entière. Retourne aussi les index invalides."""
+    return _convertir_colonne(serie, pourcentage=True)
+
+
+def nettoyer_colonne_nombre(serie: pd.Series, type_cible=float) -> tuple[pd.Series, list]:
+    """Version vectorisée de nettoyer_nombre pour une colonne entière. Retourne aussi les index invalides."""
+    valeurs, invalides = _convertir_colonne(serie, pourcentage=False)
+    if type_cible is int:
+        valeurs = np.trunc(valeurs) # int(float) tronque vers zéro
+        if not valeurs.isna().any():
+            valeurs = valeurs.astype(np.int64) # Comme Series.apply, entiers seulement sans valeur manquante
+    return valeurs, invalides
+
+
+@profiler(nom='nettoyer_dataframe')
+def nettoyer_dataframe(df: pd.DataFrame, rapport_erreurs: dict = None) -> pd.DataFrame:
+    """
+    Nettoie un DataFrame pandas pour l'import des données Personne ou Epargne.
+
+    Le nettoyage est effectué colonne par colonne avec des opérations vectorisées.
+
+    Args:
+        df (pd.DataFrame): Le DataFrame brut.
+        rapport_erreurs (dict, optional): Si fourni, reçoit pour chaque colonne la liste des index
+                                          des valeurs invalides, qui sont remplacées par np.nan.
+                                          Sinon, une ErreurNettoyage est levée.
+
+    Returns:
+        pd.DataFrame: Le DataFrame nettoyé.
+
+    Raises:
+        ErreurNettoyage: Si des valeurs sont invalides et que rapport_erreurs n'est pas fourni.
+    """
     # Crée une copie du DataFrame pour éviter les SettingWithCopyWarning
     df_cleaned = df.copy()
 
-    # Définir les colonnes par type de nettoyage attendu
-    cols_pour_taux = ['taux_interet', 'fiscalite']
-    cols_pour_float = ['revenu_annuel', 'loyer', 'depenses_mensuelles', 'versement_max', 'versement_mensuel_utilisateur']
-    cols_pour_int = ['age', 'duree_min', 'duree_epargne'] # Ajout de duree_epargne
-
+    erreurs = {}
     for col in df_cleaned.columns:
-        if col in cols_pour_taux:
-            df_cleaned[col] = df_cleaned[col].apply(nettoyer_taux)
-        elif col in cols_pour_float:
-            # S'assurer que le nettoyage de nombre est appelé avec float
-            df_cleaned[col] = df_cleaned[col].apply(lambda x: nettoyer_nombre(x, float))
-        elif col in cols_pour_int:
-            # S'assurer que le nettoyage de nombre est appelé avec int
-            df_cleaned[col] = df_cleaned[col].apply(lambda x: nettoyer_nombre(x, int))
-    return df_cleaned
\ No newline at end of file
+        if col in COLS_POUR_TAUX:
+            df_cleaned[col], invalides = nettoyer_colonne_taux(df_cleaned[col])
+        elif col in COLS_POUR_FLOAT:
+            df_cleaned[col], invalides = nettoyer_colonne_nombre(df_cleaned[col], float)
+        elif col in COLS_POUR_INT:
+            df_cleaned[col], invalides = nettoyer_colonne_nombre(df_cleaned[col], int)
+        else:
+            continue
+        if invalides:
+            erreurs[col] = invalides
+
+    if erreurs:
+        if rapport_erreurs is None:
+            raise ErreurNettoyage(erreurs)
+        rapport_erreurs.update(erreurs)
+    return df_cleaned
+
+
+def est_dataframe_nettoye(df: pd.DataFrame) -> bool:
+    """
+    Indique si un DataFrame a déjà les types produits par nettoyer_dataframe (par exemple relu depuis Parquet).
+
+    Toutes les colonnes à nettoyer présentes doivent être numériques, et entières pour les colonnes
+    entières sans valeur manquante.
+    """
+    for col in df.columns:
+        if col in COLS_POUR_TAUX + COLS_POUR_FLOAT + COLS_POUR_INT:
+            serie = df[col]
+            if not pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+                return False
+            if col in COLS_POUR_INT and not pd.api.types.is_integer_dtype(serie) and not serie.isna().any():
+                return False
+    return True
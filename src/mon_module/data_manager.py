@@ -1,22 +1,42 @@
 import pandas as pd
 import os
 import logging
+import gzip
+import sqlite3
 import numpy as np
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-from src.mon_module.models.personne import Personne
+from src.mon_module.models.personne import Personne, ATTRIBUTS_PERSONNE
+from src.mon_module.models.personnes_array import PersonnesArray
 from src.mon_module.models.epargne import Epargne
-from src.mon_module.data_cleaning import nettoyer_dataframe, nettoyer_nombre, nettoyer_taux
-from src.mon_module.models.resultat import ResultatEpargne
+from src.mon_module.models.catalogue import CatalogueEpargne
+from src.mon_module.data_cleaning import nettoyer_dataframe, nettoyer_nombre, nettoyer_taux, est_dataframe_nettoye
+from src.mon_module.models.resultat import ResultatEpargne, ResultatsBatch, COLONNES_RESULTATS
+from src.mon_module.stockage_binaire import save_resultats_binaire, EXTENSION_BINAIRE
+from src.mon_module.profilage import profiler
+
+# Formats colonnaires typés : les dtypes sont conservés, les données déjà nettoyées n'ont pas à l'être à nouveau
+FORMATS_TYPES = ('.parquet', '.feather', '.arrow')
+FORMATS_SUPPORTES = ('.csv', '.txt', '.xlsx') + FORMATS_TYPES
+FORMATS_SQLITE = ('.db', '.sqlite', '.sqlite3')
+# CSV compressés, reconnus à leur double extension (lus par pandas, écrits par EcrivainResultatsCSV)
+COMPRESSIONS_CSV = {'.csv.gz': 'gzip', '.csv.zst': 'zstd'}
+EXTENSIONS_CSV = ('.csv',) + tuple(COMPRESSIONS_CSV)
+
 
-def importer_donnees_dataframe(chemin_fichier: str) -> pd.DataFrame:
+def est_fichier_csv(chemin_fichier: str) -> bool:
+    """Indique si un chemin désigne un fichier CSV, éventuellement compressé (.csv.gz, .csv.zst)."""
+    return chemin_fichier.lower().endswith(EXTENSIONS_CSV)
+
+
+def importer_donnees_dataframe(chemin_fichier: str, colonnes: list[str] = None) -> pd.DataFrame:
     """
-    Importe les données depuis un fichier CSV, TXT ou XLSX et les retourne sous forme de DataFrame Pandas.
+    Importe les données depuis un fichier CSV (éventuellement compressé : .csv.gz, .csv.zst), TXT, XLSX, Parquet ou Feather/Arrow IPC
+    et les retourne sous forme de DataFrame Pandas.
     Cette fonction est générique pour la lecture de fichier brut avant nettoyage spécifique.
 
     Args:
-        chemin_fichier (str): Chemin complet vers le fichier de données (CSV, TXT, XLSX).
+        chemin_fichier (str): Chemin complet vers le fichier de données (CSV, TXT, XLSX, PARQUET, FEATHER, ARROW).
+        colonnes (list[str], optional): Colonnes à lire (projection). Par défaut, toutes les colonnes.
 
     Returns:
         pd.DataFrame: Un DataFrame Pandas contenant les données brutes lues.
@@ -29,14 +49,18 @@ def importer_donnees_dataframe(chemin_fichier: str) -> pd.DataFrame:
     df = None
 
     try:
-        if extension == '.csv':
-            df = pd.read_csv(chemin_fichier)
+        if est_fichier_csv(chemin_fichier):
+            df = pd.read_csv(chemin_fichier, usecols=colonnes)
         elif extension == '.txt':
-            df = pd.read_csv(chemin_fichier, sep='\t')
+            df = pd.read_csv(chemin_fichier, sep='\t', usecols=colonnes)
         elif extension == '.xlsx':
-            df = pd.read_excel(chemin_fichier)
+            df = pd.read_excel(chemin_fichier, usecols=colonnes)
+        elif extension == '.parquet':
+            df = pd.read_parquet(chemin_fichier, columns=colonnes)
+        elif extension in ('.feather', '.arrow'):
+            df = pd.read_feather(chemin_fichier, columns=colonnes)
         else:
-            raise ValueError(f"Format de fichier non supporté : {extension}. Les formats supportés sont .csv, .txt, .xlsx.")
+            raise ValueError(f"Format de fichier non supporté : {extension}. Les formats supportés sont {', '.join(FORMATS_SUPPORTES)}.")
         logging.info(f"Fichier '{chemin_fichier}' importé avec succès dans un DataFrame.")
         return df
 
@@ -48,6 +72,145 @@ def importer_donnees_dataframe(chemin_fichier: str) -> pd.DataFrame:
         raise ValueError(f"Impossible de lire le fichier '{chemin_fichier}' : {e}")
 
 
+def exporter_dataframe(df: pd.DataFrame, fichier: str, compression: str = None):
+    """
+    Écrit un DataFrame dans un fichier dont le format est déduit de l'extension.
+
+    Args:
+        df (pd.DataFrame): Les données à écrire.
+        fichier (str): Chemin du fichier (CSV, TXT, XLSX, PARQUET, FEATHER, ARROW).
+        compression (str, optional): Compression des formats Parquet ('snappy' par défaut, 'zstd', 'gzip'...)
+                                     et Feather/Arrow ('lz4' par défaut, 'zstd', 'uncompressed').
+
+    Raises:
+        ValueError: Si le format de fichier n'est pas supporté.
+    """
+    extension = os.path.splitext(fichier)[1].lower()
+    if extension == '.csv':
+        df.to_csv(fichier, index=False)
+    elif extension == '.txt':
+        df.to_csv(fichier, sep='\t', index=False)
+    elif extension == '.xlsx':
+        df.to_excel(fichier, index=False)
+    elif extension == '.parquet':
+        df.to_parquet(fichier, index=False, compression=compression or 'snappy')
+    elif extension in ('.feather', '.arrow'):
+        df.reset_index(drop=True).to_feather(fichier, compression=compression or 'lz4')
+    else:
+        raise ValueError(f"Format de fichier non supporté pour l'export : {extension}. Formats supportés : {', '.join(FORMATS_SUPPORTES)}.")
+
+
+def nettoyer_si_necessaire(df: pd.DataFrame, fichier: str) -> pd.DataFrame:
+    """
+    Nettoie un DataFrame brut lu depuis un fichier, sauf s'il provient d'un format typé (Parquet, Feather)
+    et que ses colonnes sont déjà numériques (voir est_dataframe_nettoye).
+
+    Args:
+        df (pd.DataFrame): Les données brutes lues par importer_donnees_dataframe ou importer_donnees_par_blocs.
+        fichier (str): Le chemin du fichier d'origine, dont l'extension détermine si le nettoyage peut être évité.
+
+    Returns:
+        pd.DataFrame: Les données nettoyées (ou le DataFrame d'origine, déjà typé).
+    """
+    if os.path.splitext(fichier)[1].lower() in FORMATS_TYPES and est_dataframe_nettoye(df):
+        logging.info(f"Données de '{fichier}' déjà typées : nettoyage ignoré.")
+        return df
+    return nettoyer_dataframe(df)
+
+
+def importer_donnees_par_blocs(chemin_fichier: str, taille_bloc: int):
+    """
+    Lit un fichier CSV (éventuellement compressé), TXT ou XLSX par blocs de lignes, sans le charger entièrement en mémoire.
+
+    Args:
+        chemin_fichier (str): Chemin complet vers le fichier de données (CSV, TXT, XLSX).
+        taille_bloc (int): Nombre de lignes par bloc.
+
+    Yields:
+        pd.DataFrame: Les blocs de données brutes, avec un index continu d'un bloc à l'autre.
+
+    Raises:
+        FileNotFoundError: Si le fichier n'est pas trouvé.
+        ValueError: Si le format de fichier n'est pas supporté.
+    """
+    extension = os.path.splitext(chemin_fichier)[1].lower()
+    if est_fichier_csv(chemin_fichier):
+        yield from pd.read_csv(chemin_fichier, chunksize=taille_bloc)
+    elif extension == '.txt':
+        yield from pd.read_csv(chemin_fichier, sep='\t', chunksize=taille_bloc)
+    elif extension == '.parquet':
+        import pyarrow.parquet as pq # Dépendance optionnelle, requise uniquement pour Parquet
+        debut = 0
+        for lot in pq.ParquetFile(chemin_fichier).iter_batches(batch_size=taille_bloc):
+            df = lot.to_pandas()
+            df.index = pd.RangeIndex(debut, debut + len(df))
+            debut += len(df)
+            yield df
+    elif extension in ('.xlsx', '.feather', '.arrow'):
+        # Ces formats ne se lisent pas par morceaux avec pandas : lecture complète puis découpage
+        logging.warning(f"Le format {extension} ne permet pas une lecture par blocs : '{chemin_fichier}' est chargé entièrement.")
+        df = importer_donnees_dataframe(chemin_fichier)
+        for debut in range(0, len(df), taille_bloc):
+            yield df.iloc[debut:debut + taille_bloc]
+    else:
+        raise ValueError(f"Format de fichier non supporté : {extension}. Les formats supportés sont {', '.join(FORMATS_SUPPORTES)}.")
+
+
+def creer_personnes_array(df_nettoye: pd.DataFrame) -> PersonnesArray:
+    """
+    Convertit un DataFrame de personnes déjà nettoyé en PersonnesArray, colonne par colonne (sans iterrows).
+
+    Un objectif non numérique est ramené à 0, une durée d'épargne manquante ou non numérique à 0,
+    avec un avertissement par ligne concernée.
+
+    Raises:
+        ValueError: Si une colonne obligatoire est manquante ou si la création du tableau échoue.
+    """
+    try:
+        objectif = np.zeros(len(df_nettoye))
+        if 'objectif' in df_nettoye.columns:
+            objectif = pd.to_numeric(df_nettoye['objectif'], errors='coerce')
+            for index in df_nettoye.index[objectif.isna() & df_nettoye['objectif'].notna()]:
+                logging.warning(f"Objectif invalide pour {df_nettoye.at[index, 'nom']} (ligne {index+2}). Défini à 0.")
+            objectif = objectif.where(objectif.notna() | df_nettoye['objectif'].isna(), 0.0).to_numpy(dtype=float)
+
+        duree_epargne = np.zeros(len(df_nettoye), dtype=np.int64)
+        if 'duree_epargne' in df_nettoye.columns:
+            duree_epargne = pd.to_numeric(df_nettoye['duree_epargne'], errors='coerce')
+            for index in df_nettoye.index[duree_epargne.isna()]:
+                logging.warning(f"Durée d'épargne invalide pour {df_nettoye.at[index, 'nom']} (ligne {index+2}). Défini à 0.")
+            duree_epargne = np.trunc(duree_epargne.fillna(0).to_numpy(dtype=float)).astype(np.int64)
+
+        versement = df_nettoye['versement_mensuel_utilisateur'].to_numpy() if 'versement_mensuel_utilisateur' in df_nettoye.columns else None
+        return PersonnesArray(
+            nom=df_nettoye['nom'].to_numpy(dtype=object),
+            age=df_nettoye['age'].to_numpy(),
+            revenu_annuel=df_nettoye['revenu_annuel'].to_numpy(dtype=float),
+            loyer=df_nettoye['loyer'].to_numpy(dtype=float),
+            depenses_mensuelles=df_nettoye['depenses_mensuelles'].to_numpy(dtype=float),
+            objectif=objectif,
+            duree_epargne=duree_epargne,
+            versement_mensuel_utilisateur=versement
+        )
+    except KeyError as e:
+        logging.error(f"Colonne manquante pour la création des personnes : {e}. Vérifiez le fichier.")
+        raise ValueError(f"Données Personne invalides : colonne '{e}' manquante.")
+    except Exception as e:
+        logging.error(f"Erreur inattendue lors de la création des personnes : {e}")
+        raise ValueError(f"Erreur de création d'objet Personne : {e}")
+
+
+def creer_personnes(df_nettoye: pd.DataFrame) -> list[Personne]:
+    """
+    Convertit un DataFrame de personnes déjà nettoyé en objets Personne (voir creer_personnes_array).
+
+    Raises:
+        ValueError: Si une colonne obligatoire est manquante ou si la création d'un objet échoue.
+    """
+    return creer_personnes_array(df_nettoye).vers_personnes()
+
+
+@profiler(nom='import_personnes')
 def import_personnes(fichier: str) -> list[Personne]:
     """
     Importe les données de personnes depuis un fichier, les nettoie et les convertit en objets Personne.
@@ -64,58 +227,81 @@ def import_personnes(fichier: str) -> list[Personne]:
     logging.info(f"Début de l'importation des personnes depuis '{fichier}'.")
     try:
         df = importer_donnees_dataframe(fichier)
-        df_nettoye = nettoyer_dataframe(df.copy()) # Applique le nettoyage
+        df_nettoye = nettoyer_si_necessaire(df, fichier) # Applique le nettoyage (nettoyer_dataframe travaille sur une copie)
 
-        # --- AJOUTÉ POUR LE DÉBOGAGE ---
         logging.info(f"DataFrame nettoyé pour les personnes contient {len(df_nettoye)} lignes.")
-        # --- FIN DE L'AJOUT ---
-
-        # --- DEBUGGING : Afficher le DataFrame nettoyé avant de créer les objets Personne ---
-        logging.info(f"Contenu du DataFrame nettoyé avant création des objets Personne:\n{df_nettoye.to_string()}")
-        # --- FIN DEBUGGING ---
-
-        personnes = []
-        for index, row in df_nettoye.iterrows():
-            try:
-                objectif = row.get('objectif', 0)
-                duree_epargne = row.get('duree_epargne', 0)
-
-                try:
-                    objectif = float(objectif)
-                except (ValueError, TypeError):
-                    logging.warning(f"Objectif invalide pour {row['nom']} (ligne {index+2}). Défini à 0.")
-                    objectif = 0.0
-
-                try:
-                    duree_epargne = int(duree_epargne)
-                except (ValueError, TypeError):
-                    logging.warning(f"Durée d'épargne invalide pour {row['nom']} (ligne {index+2}). Défini à 0.")
-                    duree_epargne = 0
-
-
-                personne = Personne(
-                    nom=row['nom'],
-                    age=row['age'],
-                    revenu_annuel=row['revenu_annuel'],
-                    loyer=row['loyer'],
-                    depenses_mensuelles=row['depenses_mensuelles'],
-                    objectif=objectif,
-                    duree_epargne=duree_epargne,
-                    versement_mensuel_utilisateur=row.get('versement_mensuel_utilisateur')
-                )
-                personnes.append(personne)
-            except KeyError as e:
-                logging.error(f"Colonne manquante pour la création d'objet Personne à la ligne {index+2} : {e}. Vérifiez le fichier.")
-                raise ValueError(f"Données Personne invalides : colonne '{e}' manquante.")
-            except Exception as e:
-                logging.error(f"Erreur inattendue lors de la création d'un objet Personne à la ligne {index+2} : {e}")
-                raise ValueError(f"Erreur de création d'objet Personne : {e}")
+        # Le contenu complet n'est formaté qu'en mode DEBUG : to_string() est coûteux sur de gros fichiers
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(f"Contenu du DataFrame nettoyé avant création des objets Personne:\n{df_nettoye.to_string()}")
+
+        personnes = creer_personnes(df_nettoye)
         logging.info(f"{len(personnes)} personnes importées avec succès depuis '{fichier}'.")
         return personnes
     except Exception as e:
         logging.error(f"Échec de l'importation des personnes depuis '{fichier}' : {e}")
         raise
 
+
+def iterer_personnes_par_blocs(fichier: str, taille_bloc: int = 100_000, compact: bool = False):
+    """
+    Importe les personnes bloc par bloc : chaque bloc est lu, nettoyé puis converti en objets Personne.
+
+    Args:
+        fichier (str): Chemin du fichier CSV, TXT ou XLSX contenant les données des personnes.
+        taille_bloc (int, optional): Nombre de lignes lues par bloc. Défaut à 100 000.
+        compact (bool, optional): Restitue chaque bloc en PersonnesArray, sans créer d'objet par personne.
+
+    Yields:
+        list[Personne] | PersonnesArray: Les personnes de chaque bloc.
+
+    Raises:
+        ValueError: Si une erreur survient lors de l'importation ou de la création des objets.
+    """
+    logging.info(f"Début de l'importation par blocs de {taille_bloc} lignes des personnes depuis '{fichier}'.")
+    try:
+        for df in importer_donnees_par_blocs(fichier, taille_bloc):
+            df_nettoye = nettoyer_si_necessaire(df, fichier)
+            yield creer_personnes_array(df_nettoye) if compact else creer_personnes(df_nettoye)
+    except Exception as e:
+        logging.error(f"Échec de l'importation par blocs des personnes depuis '{fichier}' : {e}")
+        raise
+
+def creer_epargnes(df_nettoye: pd.DataFrame) -> list[Epargne]:
+    """
+    Convertit un DataFrame de produits d'épargne déjà nettoyé en objets Epargne.
+
+    Raises:
+        ValueError: Si une colonne obligatoire est manquante ou si la création d'un objet échoue.
+    """
+    try:
+        colonnes = {
+            'nom': df_nettoye['nom'].tolist(),
+            'taux_interet_annuel': df_nettoye['taux_interet'].tolist(),
+            'frais_gestion_annuels': df_nettoye['frais_gestion_annuels'].tolist() if 'frais_gestion_annuels' in df_nettoye.columns else None,
+            'inflation_annuelle': df_nettoye['inflation_annuelle'].tolist() if 'inflation_annuelle' in df_nettoye.columns else None,
+            'fiscalite': df_nettoye['fiscalite'].tolist(),
+            'duree_min': df_nettoye['duree_min'].tolist(),
+            'versement_max': df_nettoye['versement_max'].tolist() if 'versement_max' in df_nettoye.columns else None,
+        }
+    except KeyError as e:
+        logging.error(f"Colonne manquante pour la création d'objet Epargne : '{e}'. "
+                      f"Vérifiez que les colonnes 'nom', 'taux_interet', 'fiscalite', 'duree_min' "
+                      f"et éventuellement 'frais_gestion_annuels', 'inflation_annuelle', 'versement_max' "
+                      f"existent bien dans votre fichier CSV 'epargnes.csv'.")
+        raise ValueError(f"Données Epargne invalides : colonne '{e}' manquante.")
+
+    # Valeurs par défaut des colonnes optionnelles absentes, comme Series.get
+    nombre = len(df_nettoye)
+    for nom, defaut in (('frais_gestion_annuels', 0.0), ('inflation_annuelle', 0.0), ('versement_max', None)):
+        if colonnes[nom] is None:
+            colonnes[nom] = [defaut] * nombre
+    try:
+        return [Epargne(*valeurs) for valeurs in zip(*colonnes.values())]
+    except Exception as e:
+        logging.error(f"Erreur inattendue lors de la création des objets Epargne : {e}")
+        raise ValueError(f"Erreur de création d'objet Epargne : {e}")
+
+
 def import_epargnes(fichier: str) -> list[Epargne]:
     """
     Importe les données des produits d'épargne depuis un fichier, les nettoie et les convertit en objets Epargne.
@@ -132,101 +318,192 @@ def import_epargnes(fichier: str) -> list[Epargne]:
     logging.info(f"Début de l'importation des produits d'épargne depuis '{fichier}'.")
     try:
         df = importer_donnees_dataframe(fichier)
-        df_nettoye = nettoyer_dataframe(df.copy()) # Applique le nettoyage
-        epargnes = []
-        for index, row in df_nettoye.iterrows():
-            try:
-                epargne = Epargne(
-                    nom=row['nom'],
-                    taux_interet_annuel=row['taux_interet'],
-                    frais_gestion_annuels=row.get('frais_gestion_annuels', 0.0),
-                    inflation_annuelle=row.get('inflation_annuelle', 0.0),
-                    fiscalite=row['fiscalite'],
-                    duree_min=row['duree_min'],
-                    versement_max=row.get('versement_max')
-                )
-                epargnes.append(epargne)
-            except KeyError as e:
-                logging.error(f"Colonne manquante pour la création d'objet Epargne à la ligne {index+2} : '{e}'. "
-                              f"Vérifiez que les colonnes 'nom', 'taux_interet', 'fiscalite', 'duree_min' "
-                              f"et éventuellement 'frais_gestion_annuels', 'inflation_annuelle', 'versement_max' "
-                              f"existent bien dans votre fichier CSV 'epargnes.csv'.")
-                raise ValueError(f"Données Epargne invalides : colonne '{e}' manquante.")
-            except Exception as e:
-                logging.error(f"Erreur inattendue lors de la création d'un objet Epargne à la ligne {index+2} : {e}")
-                raise ValueError(f"Erreur de création d'objet Epargne : {e}")
+        if 'taux_interet' not in df.columns and 'taux_interet_annuel' in df.columns:
+            df = df.rename(columns={'taux_interet_annuel': 'taux_interet'}) # Fichiers produits par save_epargnes
+        df_nettoye = nettoyer_si_necessaire(df, fichier) # Applique le nettoyage (nettoyer_dataframe travaille sur une copie)
+        epargnes = creer_epargnes(df_nettoye)
         logging.info(f"{len(epargnes)} produits d'épargne importés avec succès depuis '{fichier}'.")
         return epargnes
     except Exception as e:
         logging.error(f"Échec de l'importation des produits d'épargne depuis '{fichier}' : {e}")
         raise
 
-def save_personnes(personnes: list[Personne], fichier: str):
+
+def import_catalogue(fichier: str) -> CatalogueEpargne:
     """
-    Exporte une liste d'objets Personne vers un fichier CSV, TXT ou XLSX.
+    Importe les produits d'épargne d'un fichier et construit leur CatalogueEpargne, à réutiliser pour toutes les simulations.
+
+    Args:
+        fichier (str): Chemin du fichier CSV, TXT ou XLSX contenant les données d'épargne.
+
+    Returns:
+        CatalogueEpargne: Le catalogue indexé des produits, dans l'ordre du fichier.
+
+    Raises:
+        ValueError: Si une erreur survient lors de l'importation ou de la création des objets.
+    """
+    return CatalogueEpargne(import_epargnes(fichier))
+
+def save_personnes(personnes: list[Personne], fichier: str, compression: str = None):
+    """
+    Exporte une liste d'objets Personne vers un fichier CSV, TXT, XLSX, Parquet ou Feather/Arrow.
+    L'argument compression s'applique aux formats Parquet et Feather (voir exporter_dataframe).
     """
     logging.info(f"Début de l'exportation des personnes vers '{fichier}'.")
     try:
-        data = {
-            'nom': [p.nom for p in personnes],
-            'age': [p.age for p in personnes],
-            'revenu_annuel': [p.revenu_annuel for p in personnes],
-            'loyer': [p.loyer for p in personnes],
-            'depenses_mensuelles': [p.depenses_mensuelles for p in personnes],
-            'objectif': [p.objectif for p in personnes],
-            'duree_epargne': [p.duree_epargne for p in personnes],
-            'versement_mensuel_utilisateur': [p.versement_mensuel_utilisateur for p in personnes]
-        }
-        df = pd.DataFrame(data)
-
-        extension = os.path.splitext(fichier)[1].lower()
-        if extension == '.csv':
-            df.to_csv(fichier, index=False)
-        elif extension == '.txt':
-            df.to_csv(fichier, sep='\t', index=False)
-        elif extension == '.xlsx':
-            df.to_excel(fichier, index=False)
-        else:
-            raise ValueError(f"Format de fichier non supporté pour l'export : {extension}. Formats supportés : .csv, .txt, .xlsx.")
+        exporter_dataframe(_dataframe_personnes(personnes), fichier, compression)
         logging.info(f"{len(personnes)} personnes exportées avec succès vers '{fichier}'.")
     except Exception as e:
         logging.error(f"Échec de l'exportation des personnes vers '{fichier}' : {e}")
         raise
 
-def save_epargnes(epargnes: list[Epargne], fichier: str):
+def _dataframe_personnes(personnes: list[Personne] | PersonnesArray) -> pd.DataFrame:
+    """Construit le DataFrame d'export des personnes (une colonne par attribut d'entrée)."""
+    if isinstance(personnes, PersonnesArray):
+        return pd.DataFrame({nom: personnes.colonnes[nom] for nom in ATTRIBUTS_PERSONNE if nom != 'capacite_epargne_mensuelle'})
+    data = {
+        'nom': [p.nom for p in personnes],
+        'age': [p.age for p in personnes],
+        'revenu_annuel': [p.revenu_annuel for p in personnes],
+        'loyer': [p.loyer for p in personnes],
+        'depenses_mensuelles': [p.depenses_mensuelles for p in personnes],
+        'objectif': [p.objectif for p in personnes],
+        'duree_epargne': [p.duree_epargne for p in personnes],
+        'versement_mensuel_utilisateur': [p.versement_mensuel_utilisateur for p in personnes]
+    }
+    return pd.DataFrame(data)
+
+def save_epargnes(epargnes: list[Epargne], fichier: str, compression: str = None):
     """
-    Exporte une liste d'objets Epargne vers un fichier CSV, TXT ou XLSX.
+    Exporte une liste d'objets Epargne vers un fichier CSV, TXT, XLSX, Parquet ou Feather/Arrow.
+    L'argument compression s'applique aux formats Parquet et Feather (voir exporter_dataframe).
     """
     logging.info(f"Début de l'exportation des produits d'épargne vers '{fichier}'.")
     try:
-        data = {
-            'nom': [e.nom for e in epargnes],
-            'taux_interet_annuel': [e.taux_interet_annuel for e in epargnes],
-            'frais_gestion_annuels': [e.frais_gestion_annuels for e in epargnes],
-            'inflation_annuelle': [e.inflation_annuelle for e in epargnes],
-            'fiscalite': [e.fiscalite for e in epargnes],
-            'duree_min': [e.duree_min for e in epargnes],
-            'versement_max': [e.versement_max for e in epargnes]
-        }
-        df = pd.DataFrame(data)
-
-        extension = os.path.splitext(fichier)[1].lower()
-        if extension == '.csv':
-            df.to_csv(fichier, index=False)
-        elif extension == '.txt':
-            df.to_csv(fichier, sep='\t', index=False)
-        elif extension == '.xlsx':
-            df.to_excel(fichier, index=False)
-        else:
-            raise ValueError(f"Format de fichier non supporté pour l'export : {extension}. Formats supportés : .csv, .txt, .xlsx.")
+        exporter_dataframe(_dataframe_epargnes(epargnes), fichier, compression)
         logging.info(f"{len(epargnes)} produits d'épargne exportés avec succès vers '{fichier}'.")
     except Exception as e:
         logging.error(f"Échec de l'exportation des produits d'épargne vers '{fichier}' : {e}")
         raise
 
-def save_resultats_simulation(resultats: list[ResultatEpargne], chemin_fichier: str):
+def _dataframe_epargnes(epargnes: list[Epargne]) -> pd.DataFrame:
+    """Construit le DataFrame d'export des produits d'épargne (une colonne par attribut)."""
+    data = {
+        'nom': [e.nom for e in epargnes],
+        'taux_interet_annuel': [e.taux_interet_annuel for e in epargnes],
+        'frais_gestion_annuels': [e.frais_gestion_annuels for e in epargnes],
+        'inflation_annuelle': [e.inflation_annuelle for e in epargnes],
+        'fiscalite': [e.fiscalite for e in epargnes],
+        'duree_min': [e.duree_min for e in epargnes],
+        'versement_max': [e.versement_max for e in epargnes]
+    }
+    return pd.DataFrame(data)
+
+TAILLE_TAMPON_CSV = 1 << 20 # Octets accumulés avant chaque écriture sur disque
+
+
+class EcrivainResultatsCSV:
+    """
+    Écrit des blocs de résultats à la suite dans un fichier CSV, éventuellement compressé (gzip ou zstd).
+
+    Le fichier est ouvert une seule fois : chaque bloc est mis en forme d'un coup (colonnes du ResultatsBatch
+    converties par pandas) puis écrit dans un tampon, et l'en-tête n'est écrit qu'une fois : les colonnes du premier
+    bloc écrit valent pour tout le fichier (voir COLONNES_RESULTATS pour 'Capital Net Reel'). Le fichier produit
+    est identique à celui de save_resultats_simulation, une fois décompressé. À utiliser comme gestionnaire
+    de contexte : la compression n'est finalisée qu'à la fermeture.
     """
-    Exporte une liste de ResultatEpargne vers un fichier CSV ou Excel.
+    def __init__(self, chemin: str, ajout: bool = False, compression: str = None, taille_tampon: int = TAILLE_TAMPON_CSV,
+                 avec_capital_reel: bool = False):
+        """
+        Args:
+            chemin (str): Chemin du fichier CSV (.csv, .csv.gz ou .csv.zst).
+            ajout (bool, optional): Ajoute les résultats en fin de fichier au lieu de l'écraser. L'en-tête n'est
+                                    écrit que si le fichier n'existe pas encore ou est vide.
+            compression (str, optional): 'gzip' ou 'zstd'. Par défaut, déduite de l'extension (voir COMPRESSIONS_CSV).
+            taille_tampon (int, optional): Taille du tampon d'écriture, en octets.
+            avec_capital_reel (bool, optional): Résultats du mode 'mensuel' : l'en-tête d'un fichier sans résultat
+                                                contient alors 'Capital Net Reel' (voir ResultatsBatch.avec_capital_reel).
+
+        Raises:
+            ValueError: Si la compression n'est pas supportée.
+        """
+        if compression is None:
+            compression = next((nom for extension, nom in COMPRESSIONS_CSV.items() if chemin.lower().endswith(extension)), None)
+        if compression not in (None, 'gzip', 'zstd'):
+            raise ValueError(f"Compression non supportée pour les CSV de résultats : {compression}. Compressions supportées : gzip, zstd.")
+        self.chemin = chemin
+        self.compression = compression
+        self.nombre = 0
+        self._colonnes = None # Colonnes du premier bloc écrit
+        self.avec_capital_reel = avec_capital_reel
+        self._entete = not (ajout and os.path.exists(chemin) and os.path.getsize(chemin) > 0)
+
+        mode = 'ab' if ajout else 'wb' # Un ajout compressé crée un nouveau membre gzip (ou une nouvelle trame zstd)
+        self._fichier = open(chemin, mode, buffering=taille_tampon)
+        if compression == 'gzip':
+            self._flux = gzip.GzipFile(fileobj=self._fichier, mode=mode, compresslevel=6)
+        elif compression == 'zstd':
+            import zstandard # Dépendance optionnelle, requise uniquement pour les CSV .zst
+            self._flux = zstandard.ZstdCompressor().stream_writer(self._fichier, closefd=False)
+        else:
+            self._flux = self._fichier
+
+    def ajouter(self, resultats: list[ResultatEpargne] | ResultatsBatch):
+        """
+        Ajoute un bloc de résultats en fin de fichier.
+
+        Args:
+            resultats (list[ResultatEpargne] | ResultatsBatch): Les résultats à écrire.
+
+        Raises:
+            ValueError: Si l'écrivain est déjà fermé.
+        """
+        if self._flux is None:
+            raise ValueError(f"L'écrivain du fichier '{self.chemin}' est fermé.")
+        if not isinstance(resultats, ResultatsBatch):
+            resultats = ResultatsBatch.depuis_resultats(resultats)
+        if len(resultats) == 0:
+            return
+        df = resultats.to_dataframe()
+        if self._colonnes is None:
+            self._colonnes = list(df.columns)
+        else:
+            df = df.reindex(columns=self._colonnes)
+        self._flux.write(df.to_csv(index=False, header=self._entete).encode('utf-8'))
+        self._entete = False
+        self.nombre += len(resultats)
+
+    def fermer(self):
+        """Écrit l'en-tête si aucun résultat n'a été écrit, finalise la compression et ferme le fichier."""
+        if self._flux is None:
+            return
+        if self._entete:
+            self._flux.write(ResultatsBatch(avec_capital_reel=self.avec_capital_reel).to_dataframe().to_csv(index=False).encode('utf-8'))
+        if self._flux is not self._fichier:
+            self._flux.close()
+        self._fichier.close()
+        self._flux = None
+        logging.info(f"{self.nombre} résultats de simulation écrits dans '{self.chemin}'.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+def save_resultats_simulation(resultats: list[ResultatEpargne] | ResultatsBatch, chemin_fichier: str, ajout: bool = False,
+                              compression: str = None):
+    """
+    Exporte une liste de ResultatEpargne ou un ResultatsBatch vers un fichier CSV, Excel, Parquet ou Feather/Arrow.
+    L'argument compression s'applique aux formats Parquet et Feather (voir exporter_dataframe) ; un CSV
+    est compressé selon son extension, '.csv.gz' (gzip) ou '.csv.zst' (zstd) (voir EcrivainResultatsCSV).
+
+    Avec ajout=True (CSV ou SQLite), les résultats sont ajoutés en fin de fichier et l'en-tête
+    n'est écrit que si le fichier n'existe pas encore : c'est l'export incrémental par blocs.
+    Pour de nombreux blocs, un EcrivainResultatsCSV ouvert une seule fois évite de rouvrir le fichier à chaque bloc.
+    Une base SQLite (.db, .sqlite, .sqlite3) reçoit les résultats dans sa table 'resultats' (voir save_resultats_sqlite).
+    Un fichier '.bin' reçoit les résultats au format binaire projeté en mémoire (voir stockage_binaire).
     """
     logging.info(f"Début de l'exportation des résultats de simulation vers '{chemin_fichier}'.")
 
@@ -235,16 +512,249 @@ def save_resultats_simulation(resultats: list[ResultatEpargne], chemin_fichier:
         return
 
     try:
-        df_results = pd.concat([res.to_dataframe() for res in resultats], ignore_index=True)
-
-        if chemin_fichier.endswith('.csv'):
-            df_results.to_csv(chemin_fichier, index=False, sep=',')
-            logging.info(f"{len(resultats)} résultats de simulation exportés avec succès vers '{chemin_fichier}'.")
-        elif chemin_fichier.endswith('.xlsx'):
-            df_results.to_excel(chemin_fichier, index=False)
+        if not isinstance(resultats, ResultatsBatch):
+            resultats = ResultatsBatch.depuis_resultats(resultats)
+
+        if est_fichier_csv(chemin_fichier):
+            with EcrivainResultatsCSV(chemin_fichier, ajout=ajout) as ecrivain:
+                ecrivain.ajouter(resultats)
+        elif chemin_fichier.endswith(FORMATS_SQLITE):
+            save_resultats_sqlite(resultats, chemin_fichier, ajout=ajout)
+        elif chemin_fichier.endswith(EXTENSION_BINAIRE) and not ajout:
+            save_resultats_binaire(resultats, chemin_fichier)
+        elif chemin_fichier.endswith(('.xlsx',) + FORMATS_TYPES) and not ajout:
+            exporter_dataframe(resultats.to_dataframe(), chemin_fichier, compression)
             logging.info(f"{len(resultats)} résultats de simulation exportés avec succès vers '{chemin_fichier}'.")
         else:
-            logging.error(f"Format de fichier non supporté pour l'exportation des résultats : '{chemin_fichier}'. Utilisez '.csv' ou '.xlsx'.")
+            logging.error(f"Format de fichier non supporté pour l'exportation des résultats : '{chemin_fichier}'. "
+                          f"Utilisez '.csv', '.csv.gz', '.csv.zst', '.xlsx', '.parquet', '.feather', '.arrow' '.db' ou '.bin' "
+                          f"(ajout : CSV et '.db' uniquement).")
 
     except Exception as e:
-        logging.error(f"Erreur lors de l'exportation des résultats de simulation vers '{chemin_fichier}' : {e}", exc_info=True)
\ No newline at end of file
+        logging.error(f"Erreur lors de l'exportation des résultats de simulation vers '{chemin_fichier}' : {e}", exc_info=True)
+
+
+# ====================================================================================
+# STOCKAGE SQLITE
+# ====================================================================================
+
+TABLE_PERSONNES = 'personnes'
+TABLE_EPARGNES = 'epargnes'
+TABLE_RESULTATS = 'resultats'
+TAILLE_LOT_SQLITE = 50_000 # Lignes insérées (ou lues) par appel à executemany (ou fetchmany)
+
+# Index des requêtes de reporting sur les résultats
+INDEX_RESULTATS = ('personne_nom', 'produit_nom', 'atteint_objectif')
+
+_TYPES_SQLITE = {'i': 'INTEGER', 'u': 'INTEGER', 'b': 'INTEGER', 'f': 'REAL'}
+
+
+def connecter_sqlite(chemin_base: str) -> sqlite3.Connection:
+    """
+    Ouvre une base SQLite en mode WAL : les lectures (reporting) ne bloquent pas l'écriture des résultats.
+
+    Args:
+        chemin_base (str): Chemin du fichier de base (créé s'il n'existe pas).
+
+    Returns:
+        sqlite3.Connection: La connexion ouverte.
+    """
+    connexion = sqlite3.connect(chemin_base)
+    connexion.execute("PRAGMA journal_mode=WAL")
+    connexion.execute("PRAGMA synchronous=NORMAL") # Suffisant en mode WAL, bien plus rapide que FULL
+    return connexion
+
+
+def _ecrire_table_sqlite(connexion: sqlite3.Connection, table: str, df: pd.DataFrame, ajout: bool = False):
+    """
+    Écrit un DataFrame dans une table (créée au besoin) par executemany, en une seule transaction.
+
+    Sans ajout, le contenu précédent de la table est remplacé. Les valeurs manquantes deviennent NULL.
+    """
+    colonnes = ', '.join(f'"{nom}" {_TYPES_SQLITE.get(df[nom].dtype.kind, "TEXT")}' for nom in df.columns)
+    marqueurs = ', '.join('?' * len(df.columns))
+    with connexion:
+        connexion.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({colonnes})')
+        if not ajout:
+            connexion.execute(f'DELETE FROM "{table}"')
+        for debut in range(0, len(df), TAILLE_LOT_SQLITE):
+            lot = df.iloc[debut:debut + TAILLE_LOT_SQLITE].astype(object)
+            lot = lot.where(lot.notna(), None) # NaN -> NULL
+            connexion.executemany(f'INSERT INTO "{table}" VALUES ({marqueurs})', lot.itertuples(index=False, name=None))
+
+
+def _verifier_base_sqlite(chemin_base: str):
+    """
+    Vérifie qu'une base SQLite existe avant de la lire : connecter_sqlite créerait sinon une base vide.
+
+    Raises:
+        FileNotFoundError: Si la base n'existe pas.
+    """
+    if not os.path.exists(chemin_base):
+        logging.error(f"Erreur: La base '{chemin_base}' n'a pas été trouvée.")
+        raise FileNotFoundError(f"La base SQLite '{chemin_base}' n'existe pas.")
+
+
+def _lire_table_sqlite(chemin_base: str, table: str) -> pd.DataFrame:
+    """Lit une table entière d'une base SQLite dans un DataFrame."""
+    _verifier_base_sqlite(chemin_base)
+    connexion = connecter_sqlite(chemin_base)
+    try:
+        return pd.read_sql_query(f'SELECT * FROM "{table}"', connexion)
+    except Exception as e:
+        raise ValueError(f"Impossible de lire la table '{table}' de '{chemin_base}' : {e}")
+    finally:
+        connexion.close()
+
+
+def save_personnes_sqlite(personnes: list[Personne], chemin_base: str, ajout: bool = False):
+    """
+    Exporte une liste d'objets Personne dans la table 'personnes' d'une base SQLite (mêmes colonnes que save_personnes).
+    Sans ajout, le contenu précédent de la table est remplacé.
+    """
+    logging.info(f"Début de l'exportation des personnes vers la base '{chemin_base}'.")
+    connexion = connecter_sqlite(chemin_base)
+    try:
+        _ecrire_table_sqlite(connexion, TABLE_PERSONNES, _dataframe_personnes(personnes), ajout)
+        logging.info(f"{len(personnes)} personnes exportées avec succès vers la base '{chemin_base}'.")
+    except Exception as e:
+        logging.error(f"Échec de l'exportation des personnes vers la base '{chemin_base}' : {e}")
+        raise
+    finally:
+        connexion.close()
+
+
+def import_personnes_sqlite(chemin_base: str) -> list[Personne]:
+    """
+    Importe les personnes de la table 'personnes' d'une base SQLite (voir save_personnes_sqlite).
+
+    Raises:
+        FileNotFoundError: Si la base n'existe pas.
+        ValueError: Si la table est illisible ou si la création des objets échoue.
+    """
+    logging.info(f"Début de l'importation des personnes depuis la base '{chemin_base}'.")
+    df = _lire_table_sqlite(chemin_base, TABLE_PERSONNES)
+    personnes = creer_personnes(df if est_dataframe_nettoye(df) else nettoyer_dataframe(df))
+    logging.info(f"{len(personnes)} personnes importées avec succès depuis la base '{chemin_base}'.")
+    return personnes
+
+
+def save_epargnes_sqlite(epargnes: list[Epargne], chemin_base: str, ajout: bool = False):
+    """
+    Exporte une liste d'objets Epargne dans la table 'epargnes' d'une base SQLite (mêmes colonnes que save_epargnes).
+    Sans ajout, le contenu précédent de la table est remplacé.
+    """
+    logging.info(f"Début de l'exportation des produits d'épargne vers la base '{chemin_base}'.")
+    connexion = connecter_sqlite(chemin_base)
+    try:
+        _ecrire_table_sqlite(connexion, TABLE_EPARGNES, _dataframe_epargnes(epargnes), ajout)
+        logging.info(f"{len(epargnes)} produits d'épargne exportés avec succès vers la base '{chemin_base}'.")
+    except Exception as e:
+        logging.error(f"Échec de l'exportation des produits d'épargne vers la base '{chemin_base}' : {e}")
+        raise
+    finally:
+        connexion.close()
+
+
+def import_epargnes_sqlite(chemin_base: str) -> list[Epargne]:
+    """
+    Importe les produits d'épargne de la table 'epargnes' d'une base SQLite (voir save_epargnes_sqlite).
+
+    Raises:
+        FileNotFoundError: Si la base n'existe pas.
+        ValueError: Si la table est illisible ou si la création des objets échoue.
+    """
+    logging.info(f"Début de l'importation des produits d'épargne depuis la base '{chemin_base}'.")
+    df = _lire_table_sqlite(chemin_base, TABLE_EPARGNES).rename(columns={'taux_interet_annuel': 'taux_interet'})
+    epargnes = creer_epargnes(df if est_dataframe_nettoye(df) else nettoyer_dataframe(df))
+    logging.info(f"{len(epargnes)} produits d'épargne importés avec succès depuis la base '{chemin_base}'.")
+    return epargnes
+
+
+def save_resultats_sqlite(resultats: list[ResultatEpargne] | ResultatsBatch, chemin_base: str, ajout: bool = False):
+    """
+    Exporte des résultats de simulation dans la table 'resultats' d'une base SQLite, indexée pour le reporting.
+
+    Les colonnes portent les noms des attributs de ResultatEpargne (personne_nom, produit_nom...).
+    Avec ajout=True, les résultats sont ajoutés à ceux déjà présents (export par blocs).
+
+    Args:
+        resultats (list[ResultatEpargne] | ResultatsBatch): Les résultats à exporter.
+        chemin_base (str): Chemin du fichier de base SQLite.
+        ajout (bool, optional): Ajoute les résultats au lieu de remplacer le contenu de la table.
+    """
+    if not isinstance(resultats, ResultatsBatch):
+        resultats = ResultatsBatch.depuis_resultats(resultats)
+    connexion = connecter_sqlite(chemin_base)
+    try:
+        _ecrire_table_sqlite(connexion, TABLE_RESULTATS, pd.DataFrame(resultats.colonnes), ajout)
+        with connexion:
+            for colonne in INDEX_RESULTATS:
+                connexion.execute(f'CREATE INDEX IF NOT EXISTS idx_resultats_{colonne} ON "{TABLE_RESULTATS}" ("{colonne}")')
+        logging.info(f"{len(resultats)} résultats de simulation exportés avec succès vers la base '{chemin_base}'.")
+    finally:
+        connexion.close()
+
+
+def iterer_resultats_sqlite(chemin_base: str, personne_nom: str = None, produit_nom: str = None, atteint_objectif: bool = None,
+                            taille_bloc: int = TAILLE_LOT_SQLITE):
+    """
+    Interroge les résultats d'une base SQLite par blocs, sans charger la table en mémoire.
+
+    Les filtres fournis sont combinés (ET) et s'appuient sur les index de save_resultats_sqlite. La présence
+    d'un capital réel dans la table (mode 'mensuel') est déterminée une seule fois, pour tous les blocs.
+
+    Args:
+        chemin_base (str): Chemin du fichier de base SQLite.
+        personne_nom (str, optional): Ne retient que les résultats de cette personne.
+        produit_nom (str, optional): Ne retient que les résultats de ce produit.
+        atteint_objectif (bool, optional): Ne retient que les scénarios atteignant (ou non) l'objectif.
+        taille_bloc (int, optional): Nombre de résultats par bloc.
+
+    Yields:
+        ResultatsBatch: Les résultats correspondants, bloc par bloc, dans l'ordre d'insertion.
+
+    Raises:
+        FileNotFoundError: Si la base n'existe pas.
+    """
+    _verifier_base_sqlite(chemin_base)
+    filtres = {'personne_nom': personne_nom, 'produit_nom': produit_nom, 'atteint_objectif': atteint_objectif}
+    conditions = [f'"{colonne}" = ?' for colonne, valeur in filtres.items() if valeur is not None]
+    parametres = [valeur for valeur in filtres.values() if valeur is not None]
+    requete = f'SELECT {", ".join(COLONNES_RESULTATS)} FROM "{TABLE_RESULTATS}"'
+    if conditions:
+        requete += " WHERE " + " AND ".join(conditions)
+
+    connexion = connecter_sqlite(chemin_base)
+    try:
+        avec_capital_reel = connexion.execute(
+            f'SELECT EXISTS(SELECT 1 FROM "{TABLE_RESULTATS}" WHERE capital_net_reel IS NOT NULL)').fetchone()[0] == 1
+        curseur = connexion.execute(requete + " ORDER BY rowid", parametres)
+        while lignes := curseur.fetchmany(taille_bloc):
+            yield ResultatsBatch(dict(zip(COLONNES_RESULTATS, zip(*lignes))), avec_capital_reel)
+    finally:
+        connexion.close()
+
+
+def personnes_atteignant_objectif(chemin_base: str, produit_nom: str) -> list[str]:
+    """
+    Liste les personnes dont au moins un scénario atteint l'objectif avec un produit donné (requête indexée).
+
+    Args:
+        chemin_base (str): Chemin du fichier de base SQLite.
+        produit_nom (str): Le nom du produit d'épargne.
+
+    Returns:
+        list[str]: Les noms des personnes, dans l'ordre de leur premier résultat.
+
+    Raises:
+        FileNotFoundError: Si la base n'existe pas.
+    """
+    _verifier_base_sqlite(chemin_base)
+    connexion = connecter_sqlite(chemin_base)
+    try:
+        lignes = connexion.execute(f'SELECT personne_nom FROM "{TABLE_RESULTATS}" WHERE produit_nom = ? AND atteint_objectif = 1 '
+                                   'GROUP BY personne_nom ORDER BY MIN(rowid)', (produit_nom,)).fetchall()
+    finally:
+        connexion.close()
+    return [nom for (nom,) in lignes]
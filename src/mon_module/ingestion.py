@@ -0,0 +1,176 @@
+import os
+import glob
+import logging
+from collections import deque
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import pandas as pd
+
+from src.mon_module.models.personne import Personne
+from src.mon_module.data_manager import (FORMATS_SUPPORTES, EXTENSIONS_CSV, est_fichier_csv, importer_donnees_dataframe,
+                                         nettoyer_si_necessaire, creer_personnes)
+
+# Formats dont l'analyse est coûteuse en CPU (openpyxl, pur Python) : lus dans des processus séparés.
+# Les autres formats sont limités par les entrées/sorties et lus dans des threads.
+FORMATS_PROCESSUS = ('.xlsx',)
+NB_THREADS_PAR_DEFAUT = 8
+
+
+def _format_supporte(chemin_fichier: str) -> bool:
+    """Indique si un fichier est d'un format supporté, y compris les CSV compressés (.csv.gz, .csv.zst)."""
+    return est_fichier_csv(chemin_fichier) or os.path.splitext(chemin_fichier)[1].lower() in FORMATS_SUPPORTES
+
+
+def _lu_par_processus(chemin_fichier: str) -> bool:
+    """Indique si un fichier est lu dans le pool de processus (voir FORMATS_PROCESSUS) ; les CSV, compressés ou non, sont lus par des threads."""
+    return not est_fichier_csv(chemin_fichier) and os.path.splitext(chemin_fichier)[1].lower() in FORMATS_PROCESSUS
+
+
+def lister_fichiers(source: str) -> list[str]:
+    """
+    Liste les fichiers de données désignés par un dossier, un motif glob ou un chemin de fichier.
+
+    Args:
+        source (str): Un dossier (tous ses fichiers de format supporté, dont les CSV compressés .csv.gz et .csv.zst),
+                      un motif glob (ex: 'extraits/*.csv.gz') ou le chemin d'un fichier.
+
+    Returns:
+        list[str]: Les chemins des fichiers de format supporté, triés par nom.
+
+    Raises:
+        FileNotFoundError: Si aucun fichier de format supporté ne correspond à la source.
+    """
+    if os.path.isdir(source):
+        chemins = [os.path.join(source, nom) for nom in os.listdir(source)]
+    else:
+        chemins = glob.glob(source)
+    fichiers = sorted(chemin for chemin in chemins if os.path.isfile(chemin) and _format_supporte(chemin))
+    if not fichiers:
+        formats = ', '.join(dict.fromkeys(EXTENSIONS_CSV + FORMATS_SUPPORTES))
+        raise FileNotFoundError(f"Aucun fichier de format supporté ({formats}) ne correspond à '{source}'.")
+    return fichiers
+
+
+def _lire_et_nettoyer(chemin_fichier: str) -> pd.DataFrame:
+    """Lit puis nettoie un fichier (exécuté dans un thread ou un processus worker)."""
+    return nettoyer_si_necessaire(importer_donnees_dataframe(chemin_fichier), chemin_fichier)
+
+
+def iterer_fichiers_nettoyes(source: str, nb_threads: int = NB_THREADS_PAR_DEFAUT, nb_processus: int = None,
+                             rapport_erreurs: dict = None):
+    """
+    Lit et nettoie en parallèle les fichiers d'un dossier ou d'un motif glob.
+
+    Les fichiers CSV (éventuellement compressés), TXT, Parquet et Feather sont lus par un pool de threads, les fichiers XLSX par un pool
+    de processus. Les DataFrames sont restitués dans l'ordre des fichiers ; au plus deux lectures par worker
+    sont en attente à la fois, ce qui borne la mémoire. Un fichier illisible est signalé puis ignoré :
+    il n'interrompt pas la lecture des autres.
+
+    Args:
+        source (str): Un dossier, un motif glob ou un chemin de fichier (voir lister_fichiers).
+        nb_threads (int, optional): Nombre de threads pour les formats limités par les entrées/sorties.
+        nb_processus (int, optional): Nombre de processus pour les fichiers XLSX. Par défaut, le nombre de cœurs.
+        rapport_erreurs (dict, optional): Si fourni, reçoit pour chaque fichier en échec son chemin et le message d'erreur.
+
+    Yields:
+        tuple[str, pd.DataFrame]: Le chemin de chaque fichier lu avec succès et ses données nettoyées.
+
+    Raises:
+        FileNotFoundError: Si aucun fichier de format supporté ne correspond à la source.
+    """
+    fichiers = lister_fichiers(source)
+    nb_processus = nb_processus or os.cpu_count() or 1
+    logging.info(f"Début de l'ingestion de {len(fichiers)} fichiers depuis '{source}'.")
+
+    avec_processus = any(_lu_par_processus(f) for f in fichiers)
+    limite_en_attente = 2 * (nb_threads + (nb_processus if avec_processus else 0))
+    nb_erreurs = 0
+
+    with ExitStack() as pools:
+        threads = pools.enter_context(ThreadPoolExecutor(max_workers=nb_threads))
+        processus = pools.enter_context(ProcessPoolExecutor(max_workers=nb_processus)) if avec_processus else None
+        en_attente = deque()
+
+        def _recuperer():
+            nonlocal nb_erreurs
+            chemin, future = en_attente.popleft()
+            try:
+                return chemin, future.result()
+            except Exception as e:
+                nb_erreurs += 1
+                logging.error(f"Échec de l'ingestion du fichier '{chemin}' : {e}")
+                if rapport_erreurs is not None:
+                    rapport_erreurs[chemin] = str(e)
+                return chemin, None
+
+        for chemin in fichiers:
+            executeur = processus if _lu_par_processus(chemin) else threads
+            en_attente.append((chemin, executeur.submit(_lire_et_nettoyer, chemin)))
+            if len(en_attente) >= limite_en_attente:
+                chemin_lu, df = _recuperer()
+                if df is not None:
+                    yield chemin_lu, df
+        while en_attente:
+            chemin_lu, df = _recuperer()
+            if df is not None:
+                yield chemin_lu, df
+
+    logging.info(f"Ingestion terminée : {len(fichiers) - nb_erreurs} fichiers lus, {nb_erreurs} en échec.")
+
+
+def importer_fichiers_dataframe(source: str, nb_threads: int = NB_THREADS_PAR_DEFAUT, nb_processus: int = None,
+                                rapport_erreurs: dict = None, colonne_source: str = None) -> pd.DataFrame:
+    """
+    Lit, nettoie et concatène en un seul DataFrame les fichiers d'un dossier ou d'un motif glob.
+
+    Args:
+        source (str): Un dossier, un motif glob ou un chemin de fichier (voir lister_fichiers).
+        nb_threads (int, optional): Nombre de threads pour les formats limités par les entrées/sorties.
+        nb_processus (int, optional): Nombre de processus pour les fichiers XLSX.
+        rapport_erreurs (dict, optional): Si fourni, reçoit les fichiers en échec et leur message d'erreur.
+        colonne_source (str, optional): Si fourni, nom d'une colonne ajoutée avec le chemin du fichier de chaque ligne.
+
+    Returns:
+        pd.DataFrame: Les données nettoyées de tous les fichiers lus avec succès, dans l'ordre des fichiers
+        (DataFrame vide si aucun fichier n'a pu être lu).
+
+    Raises:
+        FileNotFoundError: Si aucun fichier de format supporté ne correspond à la source.
+    """
+    blocs = []
+    for chemin, df in iterer_fichiers_nettoyes(source, nb_threads, nb_processus, rapport_erreurs):
+        if colonne_source is not None:
+            df = df.assign(**{colonne_source: chemin})
+        blocs.append(df)
+    return pd.concat(blocs, ignore_index=True) if blocs else pd.DataFrame()
+
+
+def import_personnes_fichiers(source: str, nb_threads: int = NB_THREADS_PAR_DEFAUT, nb_processus: int = None,
+                              rapport_erreurs: dict = None) -> list[Personne]:
+    """
+    Importe les personnes de tous les fichiers d'un dossier ou d'un motif glob, lus et nettoyés en parallèle.
+
+    Args:
+        source (str): Un dossier, un motif glob ou un chemin de fichier (voir lister_fichiers).
+        nb_threads (int, optional): Nombre de threads pour les formats limités par les entrées/sorties.
+        nb_processus (int, optional): Nombre de processus pour les fichiers XLSX.
+        rapport_erreurs (dict, optional): Si fourni, reçoit les fichiers en échec et leur message d'erreur.
+
+    Returns:
+        list[Personne]: Les personnes de tous les fichiers valides, dans l'ordre des fichiers.
+
+    Raises:
+        FileNotFoundError: Si aucun fichier de format supporté ne correspond à la source.
+    """
+    personnes = []
+    for chemin, df in iterer_fichiers_nettoyes(source, nb_threads, nb_processus, rapport_erreurs):
+        try:
+            personnes.extend(creer_personnes(df))
+        except ValueError as e:
+            # Un fichier aux lignes invalides est écarté en entier, comme un fichier illisible
+            logging.error(f"Échec de la création des personnes du fichier '{chemin}' : {e}")
+            if rapport_erreurs is not None:
+                rapport_erreurs[chemin] = str(e)
+    logging.info(f"{len(personnes)} personnes importées depuis '{source}'.")
+    return personnes
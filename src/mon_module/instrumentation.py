@@ -0,0 +1,101 @@
+import time
+import random
+import logging
+import numpy as np
+
+# Compteurs suivis pendant une simulation
+COMPTEURS = (
+    'personnes_simulees',
+    'personnes_sans_capacite',
+    'scenarios_evalues',
+    'produits_ignores_duree_min',
+    'versements_plafonnes',
+    'erreurs_calcul',
+)
+
+
+class Instrumentation:
+    """
+    Compteurs agrégés et traces échantillonnées pour le chemin critique de la simulation.
+
+    Remplace la journalisation ligne à ligne de chaque produit et scénario : les fonctions de
+    simulation incrémentent des compteurs, et seul un résumé est journalisé en fin d'exécution.
+    La trace par scénario est optionnelle et échantillonnée ; désactivée, elle ne coûte que le test
+    de l'attribut trace_active.
+    """
+    def __init__(self, taux_echantillonnage: float = 0.0, graine: int = None):
+        self.compteurs = dict.fromkeys(COMPTEURS, 0)
+        self.debut = time.perf_counter()
+        self.trace_active = False
+        self.taux_echantillonnage = 0.0
+        self._aleatoire = random.Random(graine)
+        if taux_echantillonnage > 0:
+            self.activer_trace(taux_echantillonnage, graine)
+
+    def activer_trace(self, taux_echantillonnage: float = 1.0, graine: int = None):
+        """
+        Active la trace des scénarios pour une fraction d'entre eux.
+
+        Args:
+            taux_echantillonnage (float, optional): Fraction des scénarios tracés (entre 0 et 1). Défaut à 1.0.
+            graine (int, optional): Graine du tirage, pour un échantillon reproductible.
+
+        Raises:
+            ValueError: Si le taux n'est pas compris entre 0 et 1.
+        """
+        if not 0 <= taux_echantillonnage <= 1:
+            raise ValueError(f"Le taux d'échantillonnage doit être compris entre 0 et 1 : {taux_echantillonnage}")
+        self.taux_echantillonnage = taux_echantillonnage
+        self.trace_active = taux_echantillonnage > 0
+        if graine is not None:
+            self._aleatoire.seed(graine)
+
+    def desactiver_trace(self):
+        """Désactive la trace des scénarios."""
+        self.trace_active = False
+        self.taux_echantillonnage = 0.0
+
+    def echantillonner(self) -> bool:
+        """Indique si le scénario courant fait partie de l'échantillon tracé."""
+        return self._aleatoire.random() < self.taux_echantillonnage
+
+    def echantillonner_indices(self, nombre: int) -> np.ndarray:
+        """Tire les indices tracés parmi nombre scénarios d'un bloc vectorisé."""
+        generateur = np.random.default_rng(self._aleatoire.getrandbits(32))
+        return np.flatnonzero(generateur.random(nombre) < self.taux_echantillonnage)
+
+    def tracer(self, message: str, *args):
+        """Journalise un scénario tracé (formatage %-style différé par le module logging)."""
+        logging.info("[trace] " + message, *args)
+
+    def incrementer(self, nom: str, valeur: int = 1):
+        """Ajoute une valeur à un compteur."""
+        self.compteurs[nom] = self.compteurs.get(nom, 0) + int(valeur)
+
+    def fusionner(self, compteurs: dict):
+        """Ajoute les compteurs d'une autre instrumentation (par exemple celle d'un processus worker)."""
+        for nom, valeur in compteurs.items():
+            self.incrementer(nom, valeur)
+
+    def reinitialiser(self):
+        """Remet les compteurs et le chronomètre à zéro (début d'une nouvelle exécution)."""
+        self.compteurs = dict.fromkeys(COMPTEURS, 0)
+        self.debut = time.perf_counter()
+
+    def resume(self) -> dict:
+        """
+        Retourne le résumé de l'exécution : les compteurs, la durée écoulée et le débit de scénarios.
+        """
+        duree = time.perf_counter() - self.debut
+        resume = dict(self.compteurs)
+        resume['duree_secondes'] = round(duree, 3)
+        resume['scenarios_par_seconde'] = round(self.compteurs['scenarios_evalues'] / duree, 1) if duree > 0 else 0.0
+        return resume
+
+    def journaliser_resume(self):
+        """Journalise le résumé de l'exécution sur une seule ligne."""
+        logging.info("Résumé de la simulation : " + ", ".join(f"{nom}={valeur}" for nom, valeur in self.resume().items()))
+
+
+# Instrumentation par défaut du processus, utilisée par les fonctions de simulation
+instrumentation = Instrumentation()
@@ -0,0 +1,105 @@
+import bisect
+import numpy as np
+
+from src.mon_module.models.epargne import Epargne
+
+
+def _en_float(valeur) -> float:
+    """Convertit une valeur en float, None devenant np.nan."""
+    return np.nan if valeur is None else float(valeur)
+
+
+class CatalogueEpargne:
+    """
+    Index des produits d'épargne, construit une seule fois et partagé par toutes les simulations.
+
+    Les produits sont triés par duree_min : les produits accessibles pour une durée d'épargne donnée
+    forment un préfixe de cet ordre, obtenu par bisect au lieu d'un parcours de tout le catalogue.
+    Les colonnes utiles à la simulation (taux, fiscalité, plafond...) sont précalculées en tableaux NumPy.
+    Pour chaque palier de duree_min, les produits, indices et colonnes accessibles sont préparés une fois :
+    une requête se limite à un bisect suivi d'une lecture, sans tri ni liste construits par personne.
+    Le catalogue ne contient que des listes et des tableaux : il se transmet tel quel aux processus workers.
+    L'itération et l'indexation restituent les produits dans leur ordre d'origine.
+    """
+    def __init__(self, epargnes: list[Epargne]):
+        self.epargnes = list(epargnes)
+        versement_max = np.array([_en_float(e.versement_max) for e in self.epargnes], dtype=float)
+        duree_min = np.array([_en_float(e.duree_min) for e in self.epargnes], dtype=float)
+
+        # Colonnes dans l'ordre d'origine des produits (voir core.tableaux_epargnes)
+        self.tableaux = {
+            'nom': np.array([e.nom for e in self.epargnes], dtype=object),
+            'taux': np.array([_en_float(e.taux_interet_annuel) for e in self.epargnes], dtype=float),
+            'frais': np.array([_en_float(e.frais_gestion_annuels) for e in self.epargnes], dtype=float),
+            'inflation': np.array([_en_float(e.inflation_annuelle) for e in self.epargnes], dtype=float),
+            'fiscalite': np.array([_en_float(e.fiscalite) for e in self.epargnes], dtype=float),
+            'duree_min': duree_min,
+            'versement_max': versement_max,
+            # Message identique à celui de suggestion_epargne pour les versements plafonnés
+            'message_plafond': np.array([f"Versement ajusté au plafond ({v:.2f} €/an)." for v in versement_max], dtype=object),
+        }
+
+        # Une duree_min manquante ne restreint pas l'accès au produit : elle est rangée en tête
+        cles_tri = np.where(np.isnan(duree_min), -np.inf, duree_min)
+        self.ordre = np.argsort(cles_tri, kind='stable') # Indices d'origine des produits, par duree_min croissante
+        self.duree_min_triee = cles_tri[self.ordre].tolist() # Liste Python pour bisect
+
+        # Un palier par nombre de produits éligibles possible (0 et un par valeur distincte de duree_min) :
+        # indices, produits et colonnes y sont préparés une fois, dans l'ordre d'origine, et partagés
+        # ensuite par toutes les personnes dont la durée d'épargne tombe sur ce palier
+        paliers = {0} | {bisect.bisect_right(self.duree_min_triee, d) for d in self.duree_min_triee}
+        self._indices_par_palier = {}
+        self._produits_par_palier = {}
+        self._tableaux_par_palier = {}
+        for palier in sorted(paliers):
+            indices = np.sort(self.ordre[:palier])
+            indices.flags.writeable = False
+            self._indices_par_palier[palier] = indices
+            self._produits_par_palier[palier] = tuple(self.epargnes[i] for i in indices)
+            self._tableaux_par_palier[palier] = self.tableaux if palier == len(self.epargnes) else {
+                nom: colonne[indices] for nom, colonne in self.tableaux.items()
+            }
+
+    def nombre_eligibles(self, duree_epargne: int) -> int:
+        """Nombre de produits dont la duree_min est inférieure ou égale à duree_epargne."""
+        return bisect.bisect_right(self.duree_min_triee, duree_epargne)
+
+    def indices_eligibles(self, duree_epargne: int) -> np.ndarray:
+        """
+        Indices (dans l'ordre d'origine) des produits accessibles pour une durée d'épargne.
+
+        Args:
+            duree_epargne (int): La durée d'épargne en mois.
+
+        Returns:
+            np.ndarray: Les indices triés des produits éligibles (tableau précalculé, en lecture seule).
+        """
+        return self._indices_par_palier[self.nombre_eligibles(duree_epargne)]
+
+    def produits_eligibles(self, duree_epargne: int) -> tuple[Epargne, ...]:
+        """Produits accessibles pour une durée d'épargne, dans l'ordre d'origine du catalogue (tuple précalculé)."""
+        return self._produits_par_palier[self.nombre_eligibles(duree_epargne)]
+
+    def tableaux_eligibles(self, duree_epargne: int) -> dict[str, np.ndarray]:
+        """
+        Colonnes (voir tableaux) restreintes aux produits accessibles pour une durée d'épargne.
+
+        Args:
+            duree_epargne (int): La durée d'épargne en mois.
+
+        Returns:
+            dict[str, np.ndarray]: Les colonnes précalculées, alignées sur indices_eligibles(duree_epargne).
+        """
+        return self._tableaux_par_palier[self.nombre_eligibles(duree_epargne)]
+
+    def __len__(self):
+        return len(self.epargnes)
+
+    def __iter__(self):
+        return iter(self.epargnes)
+
+    def __getitem__(self, index):
+        return self.epargnes[index]
+
+    def __repr__(self):
+        return f"CatalogueEpargne({len(self)} produits)"
@@ -1,6 +1,9 @@
-import math
+# NumPy et les noyaux de calcul (src.mon_module.utils) sont importés à la première utilisation :
+# importer Epargne ne charge aucune dépendance lourde.
 
 class Epargne:
+    __slots__ = ('nom', 'taux_interet_annuel', 'frais_gestion_annuels', 'inflation_annuelle', 'fiscalite', 'duree_min', 'versement_max')
+
     def __init__(self, nom: str, taux_interet_annuel: float, frais_gestion_annuels: float, inflation_annuelle: float,
                  fiscalite: float, duree_min: int, versement_max: float = None):
         self.nom = nom
@@ -16,6 +19,9 @@ class Epargne:
         Calcule le montant final d'une épargne avec intérêts composés,
         en tenant compte des frais et de l'inflation.
 
+        Le calcul est en forme fermée (capital initial capitalisé + annuité de versements en fin de mois)
+        et accepte des scalaires ou des tableaux NumPy pour les versements et les durées.
+
         Args:
             montant_initial (float): Le capital de départ.
             versement_mensuel (float): Le montant versé chaque mois.
@@ -24,14 +30,15 @@ class Epargne:
         Returns:
             float: Le montant final après intérêts et frais (avant fiscalité).
         """
-        taux_mensuel_net = (self.taux_interet_annuel - self.frais_gestion_annuels) / 12
-        montant_courant = montant_initial
+        import numpy as np
+        from src.mon_module.utils import facteur_annuite, facteur_capitalisation
 
-        for _ in range(duree_mois):
-            montant_courant *= (1 + taux_mensuel_net)
-            montant_courant += versement_mensuel
+        taux_mensuel_net = (self.taux_interet_annuel - self.frais_gestion_annuels) / 12
+        duree_mois = np.maximum(np.asarray(duree_mois), 0) # Une durée négative ne capitalise rien
 
-        return montant_courant
+        montant_final = (np.asarray(montant_initial, dtype=float) * np.asarray(facteur_capitalisation(taux_mensuel_net, duree_mois))
+                         + np.asarray(versement_mensuel, dtype=float) * np.asarray(facteur_annuite(taux_mensuel_net, duree_mois)))
+        return montant_final if montant_final.ndim else float(montant_final)
 
     def appliquer_fiscalite(self, montant_brut: float, montant_verse: float) -> float:
         """Applique la fiscalité sur les gains (montant_brut - montant_verse)."""
@@ -42,5 +49,7 @@ class Epargne:
 
     def ajuster_inflation(self, montant_nominal: float, duree_mois: int) -> float:
         """Ajuste un montant pour l'inflation sur une durée donnée."""
+        from src.mon_module.utils import facteur_capitalisation
+
         taux_inflation_mensuel = self.inflation_annuelle / 12
-        return montant_nominal / ((1 + taux_inflation_mensuel) ** duree_mois)
\ No newline at end of file
+        return montant_nominal / facteur_capitalisation(taux_inflation_mensuel, duree_mois)
\ No newline at end of file
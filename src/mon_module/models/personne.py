@@ -1,9 +1,15 @@
-import numpy as np 
+import math
+
+# Attributs d'une Personne, dans l'ordre du constructeur ; la capacité d'épargne est calculée
+ATTRIBUTS_PERSONNE = ('nom', 'age', 'revenu_annuel', 'loyer', 'depenses_mensuelles', 'objectif', 'duree_epargne',
+                      'versement_mensuel_utilisateur', 'capacite_epargne_mensuelle')
 
 class Personne:
+    __slots__ = ATTRIBUTS_PERSONNE # Pas de __dict__ par instance : plusieurs centaines d'octets économisés par personne
+
     def __init__(self, nom: str, age: int, revenu_annuel: float, loyer: float,
                  depenses_mensuelles: float, objectif: float = 0.0, duree_epargne: int = 0, # <-- Ajout de valeurs par défaut pour objectif et duree_epargne
-                 versement_mensuel_utilisateur: float = np.nan): # <-- Changement du type par défaut à np.nan
+                 versement_mensuel_utilisateur: float = float('nan')): # <-- NaN par défaut, sans dépendre de NumPy
         """
         Initialise une nouvelle instance de la classe Personne.
 
@@ -16,7 +22,7 @@ class Personne:
             objectif (float, optional): Objectif financier à atteindre. Défaut à 0.0.
             duree_epargne (int, optional): Durée d'épargne souhaitée en mois. Défaut à 0.
             versement_mensuel_utilisateur (float, optional): Versement mensuel défini par l'utilisateur.
-                                                              Utilise np.nan si non spécifié ou vide.
+                                                              Utilise NaN si non spécifié ou vide.
         """
         self.nom = nom
         self.age = age
@@ -48,7 +54,7 @@ class Personne:
         Fournit une représentation textuelle conviviale de l'objet Personne.
         """
         capacite_str = f"{self.capacite_epargne_mensuelle:.2f} €/mois"
-        if self.versement_mensuel_utilisateur is not None and not np.isnan(self.versement_mensuel_utilisateur):
+        if self.versement_mensuel_utilisateur is not None and not math.isnan(self.versement_mensuel_utilisateur):
             capacite_str = f"{self.versement_mensuel_utilisateur:.2f} €/mois (défini par l'utilisateur)"
         return (f"Personne: {self.nom} (âge: {self.age} ans)\n"
                 f"  Revenu annuel: {self.revenu_annuel:.2f} €, Loyer: {self.loyer:.2f} €, Dépenses: {self.depenses_mensuelles:.2f} €\n"
@@ -59,4 +65,4 @@ class Personne:
             """
             Affiche les informations détaillées de la personne sur la console.
             """
-            print(self.__str__())
\ No newline at end of file
+            print(self.__str__())
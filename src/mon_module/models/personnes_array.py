@@ -0,0 +1,151 @@
+import numpy as np
+
+from src.mon_module.models.personne import Personne, ATTRIBUTS_PERSONNE
+
+
+def _propriete_colonne(nom: str) -> property:
+    """Propriété qui lit et écrit un attribut dans la colonne correspondante du PersonnesArray."""
+    def lire(vue):
+        valeur = vue._tableau.colonnes[nom][vue._index]
+        return valeur.item() if isinstance(valeur, np.generic) else valeur
+    def ecrire(vue, valeur):
+        vue._tableau.colonnes[nom][vue._index] = valeur
+    return property(lire, ecrire)
+
+
+class PersonneVue(Personne):
+    """
+    Vue légère sur une ligne d'un PersonnesArray, utilisable partout où une Personne est attendue.
+
+    Les attributs sont lus (et écrits) directement dans les colonnes du tableau : la vue ne copie aucune donnée.
+    """
+    __slots__ = ('_tableau', '_index')
+
+    def __init__(self, tableau: "PersonnesArray", index: int):
+        self._tableau = tableau
+        self._index = index
+
+    def __repr__(self):
+        return f"PersonneVue({self.nom!r}, index={self._index})"
+
+for _nom in ATTRIBUTS_PERSONNE:
+    setattr(PersonneVue, _nom, _propriete_colonne(_nom))
+
+
+class PersonnesArray:
+    """
+    Ensemble de personnes stocké en colonnes (un tableau NumPy par attribut).
+
+    Remplace une liste de Personne pour les gros volumes : la capacité d'épargne est calculée pour toutes
+    les lignes en une seule opération vectorisée, et le moteur de simulation lit directement les colonnes
+    (voir core.tableaux_personnes). L'indexation par un entier renvoie une PersonneVue, par une tranche
+    ou un masque un nouveau PersonnesArray.
+    """
+    __slots__ = ('colonnes',)
+
+    def __init__(self, nom, age, revenu_annuel, loyer, depenses_mensuelles, objectif=None, duree_epargne=None,
+                 versement_mensuel_utilisateur=None):
+        """
+        Construit le tableau à partir d'une séquence de valeurs par attribut (mêmes conventions que Personne).
+
+        Args:
+            nom, age, revenu_annuel, loyer, depenses_mensuelles: Les colonnes obligatoires, toutes de même longueur.
+            objectif (optional): Les objectifs financiers. Défaut à 0.0 pour toutes les personnes.
+            duree_epargne (optional): Les durées d'épargne en mois. Défaut à 0 pour toutes les personnes.
+            versement_mensuel_utilisateur (optional): Les versements définis par l'utilisateur. Une valeur non None
+                                                      (même np.nan) remplace la capacité calculée, comme dans Personne.
+
+        Raises:
+            ValueError: Si les colonnes n'ont pas toutes la même longueur.
+        """
+        nombre = len(nom)
+        revenu_annuel = np.asarray(revenu_annuel, dtype=float)
+        loyer = np.asarray(loyer, dtype=float)
+        depenses_mensuelles = np.asarray(depenses_mensuelles, dtype=float)
+        objectif = np.zeros(nombre) if objectif is None else np.asarray(objectif, dtype=float)
+        duree_epargne = np.zeros(nombre, dtype=np.int64) if duree_epargne is None else np.asarray(duree_epargne, dtype=np.int64)
+
+        # fmax reproduit max(0.0, capacite) de Personne, y compris pour une capacité NaN (ramenée à 0)
+        capacite = np.fmax((revenu_annuel / 12) - (loyer + depenses_mensuelles), 0.0)
+        if versement_mensuel_utilisateur is None:
+            versement, defini = np.full(nombre, np.nan), np.zeros(nombre, dtype=bool)
+        else:
+            versement = np.asarray(versement_mensuel_utilisateur)
+            if versement.dtype == object:
+                defini = np.array([v is not None for v in versement], dtype=bool)
+                versement = np.where(defini, versement, np.nan).astype(float)
+            else:
+                versement, defini = versement.astype(float), np.ones(nombre, dtype=bool)
+        capacite = np.where(defini, versement, capacite)
+
+        self.colonnes = {
+            'nom': np.asarray(nom, dtype=object),
+            'age': np.asarray(age),
+            'revenu_annuel': revenu_annuel,
+            'loyer': loyer,
+            'depenses_mensuelles': depenses_mensuelles,
+            'objectif': objectif,
+            'duree_epargne': duree_epargne,
+            'versement_mensuel_utilisateur': versement,
+            'capacite_epargne_mensuelle': capacite,
+        }
+        if len({len(valeurs) for valeurs in self.colonnes.values()}) > 1:
+            raise ValueError("Les colonnes de personnes doivent toutes avoir la même longueur.")
+
+    @classmethod
+    def _depuis_colonnes(cls, colonnes: dict) -> "PersonnesArray":
+        """Construit un PersonnesArray à partir de colonnes déjà calculées (sans recalcul de la capacité)."""
+        tableau = cls.__new__(cls)
+        tableau.colonnes = colonnes
+        return tableau
+
+    @classmethod
+    def depuis_personnes(cls, personnes: list[Personne]) -> "PersonnesArray":
+        """Construit un PersonnesArray à partir d'objets Personne (capacités reprises telles quelles)."""
+        colonnes = {nom: [getattr(p, nom) for p in personnes] for nom in ATTRIBUTS_PERSONNE}
+        tableau = cls(**{nom: colonnes[nom] for nom in ATTRIBUTS_PERSONNE[:-1]})
+        tableau.colonnes['capacite_epargne_mensuelle'] = np.array(colonnes['capacite_epargne_mensuelle'], dtype=float)
+        return tableau
+
+    def vers_personnes(self) -> list[Personne]:
+        """
+        Matérialise les lignes en objets Personne indépendants du tableau.
+
+        Les capacités déjà calculées sont reprises : le constructeur de Personne n'est pas rappelé.
+        """
+        personnes = []
+        for valeurs in zip(*(self.colonnes[nom].tolist() for nom in ATTRIBUTS_PERSONNE)):
+            personne = Personne.__new__(Personne)
+            for nom, valeur in zip(ATTRIBUTS_PERSONNE, valeurs):
+                setattr(personne, nom, valeur)
+            personnes.append(personne)
+        return personnes
+
+    def tableaux(self) -> dict[str, np.ndarray]:
+        """Colonnes utiles à la simulation, sous les noms de core.tableaux_personnes."""
+        return {
+            'nom': self.colonnes['nom'],
+            'capacite': self.colonnes['capacite_epargne_mensuelle'],
+            'versement_utilisateur': self.colonnes['versement_mensuel_utilisateur'],
+            'objectif': self.colonnes['objectif'],
+            'duree_epargne': self.colonnes['duree_epargne'],
+        }
+
+    def __len__(self):
+        return len(self.colonnes['nom'])
+
+    def __getitem__(self, index):
+        """Retourne une PersonneVue pour un entier, un PersonnesArray pour une tranche, des indices ou un masque."""
+        if isinstance(index, (int, np.integer)):
+            if not -len(self) <= index < len(self):
+                raise IndexError(f"Indice de personne hors limites : {index}.")
+            return PersonneVue(self, int(index) % len(self))
+        return PersonnesArray._depuis_colonnes({nom: valeurs[index] for nom, valeurs in self.colonnes.items()})
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield PersonneVue(self, index)
+
+    def __repr__(self):
+        return f"PersonnesArray({len(self)} personnes)"
+
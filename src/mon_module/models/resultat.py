@@ -1,5 +1,7 @@
-import pandas as pd
-import numpy as np
+import math
+
+# pandas (to_dataframe) et NumPy (ResultatsBatch) sont importés à la première utilisation :
+# importer ResultatEpargne ne charge aucune dépendance lourde.
 
 class ResultatEpargne:
     """
@@ -15,7 +17,8 @@ class ResultatEpargne:
                  capital_brut: float,
                  capital_net: float,
                  atteint_objectif: bool = False,
-                 message: str = ""):
+                 message: str = "",
+                 capital_net_reel: float = None):
         self.personne_nom = personne_nom
         self.produit_nom = produit_nom
         self.taux_interet = taux_interet
@@ -26,6 +29,7 @@ class ResultatEpargne:
         self.capital_net = capital_net
         self.atteint_objectif = atteint_objectif
         self.message = message
+        self.capital_net_reel = capital_net_reel # Capital net actualisé de l'inflation (None si non calculé)
 
     def afficher(self):
         """
@@ -61,10 +65,12 @@ class ResultatEpargne:
                 f"taux_interet={self.taux_interet}, fiscalite={self.fiscalite}, "
                 f"versement_mensuel={self.versement_mensuel}, duree_mois={self.duree_mois}, "
                 f"capital_brut={self.capital_brut}, capital_net={self.capital_net}, "
-                f"atteint_objectif={self.atteint_objectif}, message={repr(self.message)})")
+                f"atteint_objectif={self.atteint_objectif}, message={repr(self.message)}, "
+                f"capital_net_reel={self.capital_net_reel})")
 
-    def to_dataframe(self) -> pd.DataFrame:
-        """Convertit le résultat en un DataFrame Pandas."""
+    def to_dataframe(self) -> "pd.DataFrame":
+        """Convertit le résultat en un DataFrame Pandas ('Capital Net Reel' seulement si le capital réel est calculé)."""
+        import pandas as pd
         data = {
             'Personne': [self.personne_nom],
             'Produit': [self.produit_nom],
@@ -77,4 +83,143 @@ class ResultatEpargne:
             'Objectif Atteint': [self.atteint_objectif],
             'Message': [self.message]
         }
-        return pd.DataFrame(data)
\ No newline at end of file
+        if self.capital_net_reel is not None:
+            data['Capital Net Reel'] = [self.capital_net_reel]
+        return pd.DataFrame(data)
+
+# Colonnes d'un ResultatEpargne : attribut -> (libellé dans les DataFrames exportés, nom du dtype NumPy)
+# Les exports (CSV, Excel, Parquet, Feather) gardent les 10 colonnes historiques : 'Capital Net Reel' n'y est
+# ajoutée que si le capital réel est calculé, c'est-à-dire en mode 'mensuel' (ResultatsBatch.avec_capital_reel,
+# fixé par le mode et non par les valeurs, pour que tous les blocs d'un export aient les mêmes colonnes).
+# Les formats internes (SQLite, binaire, cache persistant) stockent toujours les 11 attributs, NaN pour un
+# capital réel non calculé.
+COLONNES_RESULTATS = {
+    'personne_nom': ('Personne', 'object'),
+    'produit_nom': ('Produit', 'object'),
+    'taux_interet': ('Taux Interet', 'float64'),
+    'fiscalite': ('Fiscalite', 'float64'),
+    'versement_mensuel': ('Versement Mensuel', 'float64'),
+    'duree_mois': ('Duree Mois', 'int64'),
+    'capital_brut': ('Capital Brut', 'float64'),
+    'capital_net': ('Capital Net', 'float64'),
+    'atteint_objectif': ('Objectif Atteint', 'bool'),
+    'message': ('Message', 'object'),
+    'capital_net_reel': ('Capital Net Reel', 'float64'),
+}
+
+
+class ResultatsBatch:
+    """
+    Conteneur colonnaire (un tableau NumPy par attribut) d'un ensemble de résultats de simulation.
+
+    Remplace une liste de ResultatEpargne pour les gros volumes : la simulation y ajoute des blocs
+    de colonnes, et l'export vers un DataFrame ou un fichier se fait sans allocation par ligne.
+    Les objets ResultatEpargne ne sont construits qu'à la demande (indexation, itération).
+    L'attribut avec_capital_reel (vrai pour les résultats du mode 'mensuel') décide seul de la présence
+    de la colonne 'Capital Net Reel' dans to_dataframe, même si toutes ses valeurs d'un bloc sont NaN.
+    """
+    def __init__(self, colonnes: dict = None, avec_capital_reel: bool = False):
+        import numpy as np
+        self._blocs = [] # Blocs ajoutés, consolidés à la première lecture
+        self._colonnes = {nom: np.empty(0, dtype=dtype) for nom, (_, dtype) in COLONNES_RESULTATS.items()}
+        self.avec_capital_reel = avec_capital_reel
+        if colonnes is not None:
+            self.ajouter(colonnes)
+
+    @classmethod
+    def depuis_resultats(cls, resultats: list[ResultatEpargne]) -> "ResultatsBatch":
+        """Construit un ResultatsBatch à partir d'une liste de ResultatEpargne (capital réel None hors mode 'mensuel')."""
+        return cls({nom: [getattr(r, nom) for r in resultats] for nom in COLONNES_RESULTATS},
+                   avec_capital_reel=any(r.capital_net_reel is not None for r in resultats))
+
+    @classmethod
+    def depuis_dataframe(cls, df: "pd.DataFrame") -> "ResultatsBatch":
+        """
+        Construit un ResultatsBatch à partir d'un DataFrame aux colonnes de to_dataframe (ex: un CSV de résultats relu).
+
+        Un message vide relu comme NaN redevient une chaîne vide ; la colonne 'Capital Net Reel' est facultative
+        et sa présence fixe avec_capital_reel.
+
+        Raises:
+            ValueError: Si une autre colonne de résultats est manquante.
+        """
+        colonnes = {}
+        for nom, (libelle, _) in COLONNES_RESULTATS.items():
+            if libelle in df.columns:
+                colonnes[nom] = df[libelle].to_numpy()
+            elif nom == 'capital_net_reel':
+                colonnes[nom] = [float('nan')] * len(df)
+        if 'message' in colonnes:
+            colonnes['message'] = ['' if m is None or m != m else m for m in colonnes['message'].tolist()] # m != m : NaN
+        return cls(colonnes, avec_capital_reel=COLONNES_RESULTATS['capital_net_reel'][0] in df.columns)
+
+    @classmethod
+    def concatener(cls, lots: list["ResultatsBatch"]) -> "ResultatsBatch":
+        """Concatène plusieurs ResultatsBatch en un seul."""
+        batch = cls(avec_capital_reel=any(lot.avec_capital_reel for lot in lots))
+        for lot in lots:
+            batch.ajouter(lot.colonnes)
+        return batch
+
+    def ajouter(self, colonnes: dict):
+        """
+        Ajoute un bloc de résultats en fin de conteneur.
+
+        Args:
+            colonnes (dict): Un tableau (ou une liste) par attribut de COLONNES_RESULTATS,
+                             toutes de même longueur. Les clés supplémentaires sont ignorées.
+
+        Raises:
+            ValueError: Si une colonne est manquante ou si les longueurs diffèrent.
+        """
+        import numpy as np
+        try:
+            bloc = {nom: np.asarray(colonnes[nom], dtype=dtype) for nom, (_, dtype) in COLONNES_RESULTATS.items()}
+        except KeyError as e:
+            raise ValueError(f"Colonne de résultats manquante : {e}")
+        if len({len(valeurs) for valeurs in bloc.values()}) > 1:
+            raise ValueError("Les colonnes de résultats doivent toutes avoir la même longueur.")
+        self._blocs.append(bloc)
+
+    @property
+    def colonnes(self) -> "dict[str, np.ndarray]":
+        """Les colonnes consolidées du conteneur (un tableau NumPy par attribut)."""
+        import numpy as np
+        if self._blocs:
+            self._colonnes = {nom: np.concatenate([self._colonnes[nom]] + [bloc[nom] for bloc in self._blocs])
+                              for nom in COLONNES_RESULTATS}
+            self._blocs = []
+        return self._colonnes
+
+    def __len__(self):
+        return len(self._colonnes['personne_nom']) + sum(len(bloc['personne_nom']) for bloc in self._blocs)
+
+    def __getitem__(self, index):
+        """Retourne un ResultatEpargne pour un entier, un ResultatsBatch pour une tranche ou un masque."""
+        import numpy as np
+        colonnes = self.colonnes
+        if isinstance(index, (int, np.integer)):
+            # .item() restitue des types Python (float, int, bool) comme les résultats construits un à un
+            attributs = {nom: valeurs[index] if valeurs.dtype == object else valeurs[index].item()
+                         for nom, valeurs in colonnes.items()}
+            if math.isnan(attributs['capital_net_reel']):
+                attributs['capital_net_reel'] = None # Capital réel non calculé
+            return ResultatEpargne(**attributs)
+        return ResultatsBatch({nom: valeurs[index] for nom, valeurs in colonnes.items()}, self.avec_capital_reel)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self):
+        return f"ResultatsBatch({len(self)} résultats)"
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """
+        Convertit l'ensemble des résultats en un DataFrame Pandas (mêmes colonnes que ResultatEpargne.to_dataframe),
+        avec 'Capital Net Reel' si et seulement si avec_capital_reel.
+        """
+        import pandas as pd
+        colonnes = self.colonnes
+        return pd.DataFrame({libelle: colonnes[nom] for nom, (libelle, _) in COLONNES_RESULTATS.items()
+                             if nom != 'capital_net_reel' or self.avec_capital_reel})
@@ -0,0 +1,294 @@
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.mon_module.models.personne import Personne
+from src.mon_module.models.epargne import Epargne
+from src.mon_module.core import tableaux_personnes, tableaux_epargnes
+
+DISTRIBUTIONS = ('normale', 'lognormale', 'student')
+DEGRES_LIBERTE_STUDENT = 5
+TAUX_MINIMUM = -0.99 # Un rendement annuel ne peut pas faire perdre plus que le capital
+QUANTILES_PAR_DEFAUT = (0.05, 0.50, 0.95)
+TAILLE_BLOC_TRAJECTOIRES = 10_000
+
+# Quantiles estimés par un histogramme à classes géométriques, fusionnable entre blocs de trajectoires :
+# erreur relative au plus RESOLUTION_QUANTILES entre les bornes (en multiples du versement annuel)
+RESOLUTION_QUANTILES = 1e-3
+BORNE_MIN_QUANTILES = 1e-4
+BORNE_MAX_QUANTILES = 1e6
+NB_CLASSES_QUANTILES = int(np.ceil(np.log(BORNE_MAX_QUANTILES / BORNE_MIN_QUANTILES) / np.log1p(RESOLUTION_QUANTILES)))
+
+
+def tirer_taux(generateur: np.random.Generator, moyenne: float, volatilite: float, forme: tuple, distribution: str = 'normale') -> np.ndarray:
+    """
+    Tire des taux annuels aléatoires d'espérance moyenne et d'écart-type volatilite.
+
+    Args:
+        generateur (np.random.Generator): Le générateur aléatoire.
+        moyenne (float): Le taux moyen (le taux_interet_annuel du produit).
+        volatilite (float): L'écart-type annuel du taux.
+        forme (tuple): La forme du tableau tiré (trajectoires × années).
+        distribution (str, optional): 'normale', 'lognormale' (sur 1 + taux) ou 'student' (queues épaisses).
+
+    Returns:
+        np.ndarray: Les taux tirés, bornés à TAUX_MINIMUM.
+
+    Raises:
+        ValueError: Si la distribution n'est pas supportée.
+    """
+    if distribution == 'normale':
+        taux = moyenne + volatilite * generateur.standard_normal(forme)
+    elif distribution == 'lognormale':
+        variance_log = np.log1p((volatilite / (1 + moyenne)) ** 2)
+        taux = np.expm1(np.log1p(moyenne) - variance_log / 2 + np.sqrt(variance_log) * generateur.standard_normal(forme))
+    elif distribution == 'student':
+        echelle = np.sqrt((DEGRES_LIBERTE_STUDENT - 2) / DEGRES_LIBERTE_STUDENT) # Ramène l'écart-type à volatilite
+        taux = moyenne + volatilite * echelle * generateur.standard_t(DEGRES_LIBERTE_STUDENT, forme)
+    else:
+        raise ValueError(f"Distribution non supportée : '{distribution}'. Distributions supportées : {', '.join(DISTRIBUTIONS)}.")
+    return np.maximum(taux, TAUX_MINIMUM)
+
+
+def _classes_quantiles(valeurs: np.ndarray) -> np.ndarray:
+    """Indices des classes géométriques de l'histogramme des quantiles (valeurs hors bornes ramenées aux classes extrêmes)."""
+    with np.errstate(divide='ignore'):
+        classes = np.floor(np.log(valeurs / BORNE_MIN_QUANTILES) / np.log1p(RESOLUTION_QUANTILES))
+    return np.clip(classes, 0, NB_CLASSES_QUANTILES - 1).astype(np.int64)
+
+
+def _statistiques_bloc(graine: np.random.SeedSequence, taux: float, fiscalite: float, volatilite: float, distribution: str,
+                       nb_trajectoires: int, annees: np.ndarray, seuil: np.ndarray, indice_annee: np.ndarray) -> dict:
+    """
+    Simule un bloc de trajectoires d'un produit et en retourne des statistiques fusionnables entre blocs.
+
+    Les facteurs de capitalisation F_n = (F_{n-1} + 1) * (1 + r_n) d'un versement annuel unitaire sont calculés
+    année par année ; aux années demandées, le capital net unitaire g(F) = F - fiscalite * max(F - n, 0) est résumé
+    par sa moyenne et la somme des carrés de ses écarts, ses extrêmes, un histogramme creux (voir _classes_quantiles)
+    et, pour chaque personne, le nombre de trajectoires où g atteint son seuil. Seule une matrice
+    (trajectoires du bloc × années) de taux existe à la fois.
+
+    Args:
+        graine (np.random.SeedSequence): La graine du bloc.
+        taux (float), fiscalite (float), volatilite (float), distribution (str): Les paramètres du produit (voir tirer_taux).
+        nb_trajectoires (int): Nombre de trajectoires du bloc.
+        annees (np.ndarray): Les durées distinctes en années, triées.
+        seuil (np.ndarray): Par personne, le capital net unitaire à atteindre (objectif / versement annuel).
+        indice_annee (np.ndarray): Par personne, l'indice de sa durée dans annees.
+
+    Returns:
+        dict: 'nombre', puis par durée 'moyenne', 'm2', 'minimum', 'maximum' et 'classes' (indices et effectifs
+        des classes non vides), et par personne 'nb_atteints'.
+    """
+    nb_annees = int(annees.max())
+    taux_tires = tirer_taux(np.random.default_rng(graine), taux, volatilite, (nb_trajectoires, nb_annees), distribution)
+    colonne_annee = np.full(nb_annees + 1, -1)
+    colonne_annee[annees] = np.arange(len(annees))
+
+    statistiques = {
+        'nombre': nb_trajectoires,
+        'moyenne': np.empty(len(annees)),
+        'm2': np.empty(len(annees)),
+        'minimum': np.empty(len(annees)),
+        'maximum': np.empty(len(annees)),
+        'classes': [],
+        'nb_atteints': np.empty(len(seuil), dtype=np.int64),
+    }
+    facteur = np.zeros(nb_trajectoires)
+    for annee in range(1, nb_annees + 1):
+        facteur = (facteur + 1) * (1 + taux_tires[:, annee - 1])
+        colonne = colonne_annee[annee]
+        if colonne < 0:
+            continue
+        net_unitaire = facteur - fiscalite * np.maximum(facteur - annee, 0)
+        moyenne = net_unitaire.mean()
+        statistiques['moyenne'][colonne] = moyenne
+        statistiques['m2'][colonne] = np.square(net_unitaire - moyenne).sum()
+        statistiques['classes'].append(np.unique(_classes_quantiles(net_unitaire), return_counts=True))
+
+        net_unitaire.sort() # g croissante : objectif atteint si g(F) >= seuil
+        statistiques['minimum'][colonne], statistiques['maximum'][colonne] = net_unitaire[0], net_unitaire[-1]
+        personnes_colonne = indice_annee == colonne
+        statistiques['nb_atteints'][personnes_colonne] = nb_trajectoires - np.searchsorted(net_unitaire, seuil[personnes_colonne], side='left')
+    return statistiques
+
+
+class _AgregatProduit:
+    """
+    Fusionne, dans l'ordre des blocs, les statistiques des blocs de trajectoires d'un produit.
+
+    Les moyennes et les sommes des carrés des écarts sont combinées par la formule de Chan et al.,
+    les histogrammes et les comptes d'objectif atteint sont additionnés.
+    """
+    def __init__(self, nb_annees: int, nb_personnes: int):
+        self.nombre = 0
+        self.moyenne = np.zeros(nb_annees)
+        self.m2 = np.zeros(nb_annees)
+        self.minimum = np.full(nb_annees, np.inf)
+        self.maximum = np.full(nb_annees, -np.inf)
+        self.comptes = np.zeros((nb_annees, NB_CLASSES_QUANTILES), dtype=np.int64)
+        self.nb_atteints = np.zeros(nb_personnes, dtype=np.int64)
+
+    def fusionner(self, bloc: dict):
+        """Ajoute les statistiques d'un bloc (voir _statistiques_bloc)."""
+        nombre = self.nombre + bloc['nombre']
+        ecart = bloc['moyenne'] - self.moyenne
+        self.m2 += bloc['m2'] + ecart ** 2 * self.nombre * bloc['nombre'] / nombre
+        self.moyenne += ecart * bloc['nombre'] / nombre
+        self.nombre = nombre
+        np.minimum(self.minimum, bloc['minimum'], out=self.minimum)
+        np.maximum(self.maximum, bloc['maximum'], out=self.maximum)
+        for colonne, (classes, effectifs) in enumerate(bloc['classes']):
+            self.comptes[colonne, classes] += effectifs
+        self.nb_atteints += bloc['nb_atteints']
+
+    def quantiles(self, quantiles: tuple) -> np.ndarray:
+        """
+        Estime les quantiles du capital net unitaire par durée : centre géométrique de la classe du rang
+        du quantile, borné par les valeurs extrêmes observées (exact pour une distribution dégénérée).
+
+        Returns:
+            np.ndarray: Tableau (quantiles × durées).
+        """
+        cumuls = np.cumsum(self.comptes, axis=1)
+        valeurs = np.empty((len(quantiles), len(self.moyenne)))
+        for i, quantile in enumerate(quantiles):
+            rang = np.floor(quantile * (self.nombre - 1))
+            classes = np.array([np.searchsorted(cumul, rang, side='right') for cumul in cumuls])
+            centres = BORNE_MIN_QUANTILES * np.exp((classes + 0.5) * np.log1p(RESOLUTION_QUANTILES))
+            valeurs[i] = np.clip(centres, self.minimum, self.maximum)
+        return valeurs
+
+
+def _executer_blocs(taches, nb_workers: int):
+    """
+    Calcule les statistiques des blocs de trajectoires, dans l'ordre des tâches, dans le processus courant
+    ou dans un pool de processus. Au plus deux blocs par worker sont en attente à la fois, ce qui borne la mémoire.
+
+    Yields:
+        tuple: Le numéro du produit de chaque tâche et les statistiques de son bloc.
+    """
+    if nb_workers <= 1:
+        for numero, arguments in taches:
+            yield numero, _statistiques_bloc(*arguments)
+        return
+
+    with ProcessPoolExecutor(max_workers=nb_workers) as executeur:
+        en_attente = deque()
+        for numero, arguments in taches:
+            en_attente.append((numero, executeur.submit(_statistiques_bloc, *arguments)))
+            if len(en_attente) >= 2 * nb_workers:
+                numero_lu, future = en_attente.popleft()
+                yield numero_lu, future.result()
+        while en_attente:
+            numero_lu, future = en_attente.popleft()
+            yield numero_lu, future.result()
+
+
+def simuler_monte_carlo(personnes: list[Personne], epargnes: list[Epargne], volatilites: float | dict = 0.0,
+                        nb_trajectoires: int = 10_000, distribution: str = 'normale', graine: int = 0,
+                        taille_bloc: int = TAILLE_BLOC_TRAJECTOIRES, nb_workers: int = 1,
+                        quantiles: tuple = QUANTILES_PAR_DEFAUT, effort: float = 1.0) -> pd.DataFrame:
+    """
+    Simule des rendements aléatoires année par année et estime la distribution du capital net
+    et la probabilité d'atteindre l'objectif, pour chaque couple (personne, produit) éligible.
+
+    Chaque personne verse effort × sa capacité d'épargne mensuelle (plafonnée au versement_max),
+    sur sa durée d'épargne arrondie en années, comme dans suggestion_epargne. Les trajectoires de taux
+    sont partagées par toutes les personnes d'un même produit et générées par blocs de taille_bloc.
+
+    Chaque bloc est résumé par des statistiques fusionnables (voir _statistiques_bloc) : la mémoire dépend
+    de taille_bloc et du nombre de durées distinctes, pas du nombre de trajectoires, et les blocs de tous
+    les produits sont répartis sur les processus. L'espérance, l'écart-type et la probabilité d'atteindre
+    l'objectif sont exacts ; les quantiles sont estimés à RESOLUTION_QUANTILES près (en relatif). Les résultats
+    sont reproductibles pour une graine et une taille de bloc données, quel que soit le nombre de processus.
+
+    Args:
+        personnes (list[Personne]): Les personnes à simuler.
+        epargnes (list[Epargne]): Les produits d'épargne disponibles.
+        volatilites (float | dict, optional): Écart-type annuel des taux, commun ou par nom de produit (0 si absent).
+        nb_trajectoires (int, optional): Nombre de trajectoires de taux par produit.
+        distribution (str, optional): Loi des taux annuels (voir tirer_taux).
+        graine (int, optional): Graine du générateur aléatoire.
+        taille_bloc (int, optional): Nombre de trajectoires générées à la fois.
+        nb_workers (int, optional): Nombre de processus entre lesquels les blocs sont répartis (1 : processus courant).
+        quantiles (tuple, optional): Quantiles du capital net à calculer.
+        effort (float, optional): Part de la capacité d'épargne versée chaque mois. Défaut à 1.0.
+
+    Returns:
+        pd.DataFrame: Une ligne par couple éligible, avec l'espérance, l'écart-type et les quantiles
+        du capital net, et la probabilité d'atteindre l'objectif.
+
+    Raises:
+        ValueError: Si la distribution n'est pas supportée.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Distribution non supportée : '{distribution}'. Distributions supportées : {', '.join(DISTRIBUTIONS)}.")
+    logging.info(f"Début de la simulation Monte Carlo : {len(personnes)} personnes, {len(epargnes)} produits, {nb_trajectoires} trajectoires.")
+
+    colonnes_personnes, colonnes_epargnes = tableaux_personnes(personnes), tableaux_epargnes(epargnes)
+    versement_mensuel = colonnes_personnes['capacite'] * effort
+    duree_annees = np.maximum(1, np.round(colonnes_personnes['duree_epargne'] / 12)).astype(np.int64)
+    graines = np.random.SeedSequence(graine).spawn(len(epargnes))
+
+    produits = []
+    for j, epargne in enumerate(epargnes):
+        volatilite = volatilites.get(epargne.nom, 0.0) if isinstance(volatilites, dict) else volatilites
+        versement_max = colonnes_epargnes['versement_max'][j]
+        versement_annuel = versement_mensuel * 12
+        if not np.isnan(versement_max):
+            versement_annuel = np.minimum(versement_annuel, versement_max)
+        eligible = (
+            (colonnes_personnes['capacite'] > 0)
+            & ~(colonnes_personnes['duree_epargne'] < colonnes_epargnes['duree_min'][j])
+            & (versement_annuel > 0)
+            & ~(colonnes_epargnes['taux'][j] < 0)
+        )
+        indices = np.flatnonzero(eligible)
+        if len(indices):
+            annees, indice_annee = np.unique(duree_annees[indices], return_inverse=True)
+            produits.append((j, indices, volatilite, versement_annuel[indices], annees, indice_annee))
+
+    def _taches():
+        """Une tâche par bloc de trajectoires, produit par produit."""
+        nb_blocs = -(-nb_trajectoires // taille_bloc)
+        for numero, (j, indices, volatilite, versement_annuel, annees, indice_annee) in enumerate(produits):
+            seuil = colonnes_personnes['objectif'][indices] / versement_annuel
+            for numero_bloc, graine_bloc in enumerate(graines[j].spawn(nb_blocs)):
+                taille = min(taille_bloc, nb_trajectoires - numero_bloc * taille_bloc)
+                yield numero, (graine_bloc, colonnes_epargnes['taux'][j], colonnes_epargnes['fiscalite'][j], volatilite,
+                               distribution, taille, annees, seuil, indice_annee)
+
+    blocs = []
+    agregat, numero_agregat = None, None
+    for numero, statistiques_bloc in _executer_blocs(_taches(), nb_workers):
+        if numero != numero_agregat:
+            agregat, numero_agregat = _AgregatProduit(len(produits[numero][4]), len(produits[numero][1])), numero
+        agregat.fusionner(statistiques_bloc)
+        if agregat.nombre < nb_trajectoires:
+            continue
+
+        # Tous les blocs du produit sont fusionnés : statistiques par personne, proportionnelles au versement annuel
+        j, indices, _, versement_annuel, _, indice_annee = produits[numero]
+        bloc = pd.DataFrame({
+            'Personne': colonnes_personnes['nom'][indices],
+            'Produit': colonnes_epargnes['nom'][j],
+            'Versement Mensuel': versement_annuel / 12,
+            'Duree Mois': colonnes_personnes['duree_epargne'][indices],
+            'Capital Net Moyen': versement_annuel * agregat.moyenne[indice_annee],
+            'Capital Net Ecart Type': versement_annuel * np.sqrt(agregat.m2 / agregat.nombre)[indice_annee],
+        })
+        for quantile, valeurs in zip(quantiles, agregat.quantiles(quantiles)):
+            bloc[f'Capital Net Q{round(quantile * 100):02d}'] = versement_annuel * valeurs[indice_annee]
+        bloc['Probabilite Objectif'] = agregat.nb_atteints / agregat.nombre
+        bloc['_ordre'] = indices * len(epargnes) + j
+        blocs.append(bloc)
+
+    if not blocs:
+        return pd.DataFrame()
+    resultats = pd.concat(blocs, ignore_index=True).sort_values('_ordre', kind='stable').drop(columns='_ordre')
+    logging.info(f"Simulation Monte Carlo terminée : {len(resultats)} couples (personne, produit) simulés.")
+    return resultats.reset_index(drop=True)
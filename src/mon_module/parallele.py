@@ -0,0 +1,201 @@
+import os
+import time
+import shutil
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import pandas as pd
+
+from src.mon_module.models.personne import Personne
+from src.mon_module.models.epargne import Epargne
+from src.mon_module.data_manager import importer_donnees_par_blocs, creer_personnes_array, nettoyer_si_necessaire, EcrivainResultatsCSV
+from src.mon_module.models.resultat import ResultatsBatch
+from src.mon_module.core import simuler_resultats_batch, verifier_mode, verifier_critere, MODE_PAR_DEFAUT, CRITERE_PAR_DEFAUT
+from src.mon_module.instrumentation import instrumentation
+from src.mon_module.profilage import profileur
+
+TAILLE_SHARD_PAR_DEFAUT = 50_000
+
+# Catalogue de produits, options de simulation et fichier source propres à chaque processus worker,
+# transmis une seule fois à son démarrage
+_epargnes_worker = None
+_options_worker = {}
+_fichier_worker = None
+
+
+def _initialiser_worker(epargnes: list[Epargne], taux_echantillonnage: float, options: dict = None, fichier_source: str = None,
+                        profilage: bool = False):
+    """
+    Initialise un processus worker avec le catalogue de produits d'épargne, les options de simulation,
+    le fichier d'origine des blocs bruts (dont le format décide de leur nettoyage), la configuration de trace
+    et l'activation du profileur (celle du processus principal).
+    """
+    global _epargnes_worker, _options_worker, _fichier_worker
+    _epargnes_worker = epargnes
+    _options_worker = options or {}
+    _fichier_worker = fichier_source
+    profileur.actif = profilage
+    if taux_echantillonnage > 0:
+        instrumentation.activer_trace(taux_echantillonnage)
+
+
+def _simuler_shard(numero_shard: int, donnees: pd.DataFrame | list[Personne], dossier_shards: str) -> tuple[int, str, int, dict, dict]:
+    """
+    Simule un shard dans un processus worker et écrit ses résultats dans son propre fichier CSV.
+
+    Le fichier est toujours créé, avec son en-tête même si le shard n'a aucun résultat. Une erreur
+    d'écriture remonte au processus principal au lieu d'être seulement journalisée.
+
+    Args:
+        numero_shard (int): Numéro d'ordre du shard, utilisé pour le nom du fichier et la fusion.
+        donnees (pd.DataFrame | list[Personne]): Un bloc de données brutes, nettoyé si son format l'exige
+                                                 (voir nettoyer_si_necessaire), ou des personnes.
+        dossier_shards (str): Dossier où écrire le fichier de résultats du shard.
+
+    Returns:
+        tuple[int, str, int, dict, dict]: Le numéro du shard, le chemin de son fichier, son nombre de résultats,
+        les compteurs d'instrumentation du shard et ses mesures de profilage (vides si le profileur est inactif).
+    """
+    instrumentation.reinitialiser()
+    profileur.reinitialiser()
+    personnes = creer_personnes_array(nettoyer_si_necessaire(donnees, _fichier_worker)) if isinstance(donnees, pd.DataFrame) else donnees
+    resultats = simuler_resultats_batch(personnes, _epargnes_worker, **_options_worker)
+    chemin_shard = os.path.join(dossier_shards, f"resultats_{numero_shard:06d}.csv")
+    with EcrivainResultatsCSV(chemin_shard, avec_capital_reel=_options_worker.get('mode') == 'mensuel') as ecrivain:
+        ecrivain.ajouter(resultats)
+    return numero_shard, chemin_shard, len(resultats), dict(instrumentation.compteurs), profileur.statistiques
+
+
+def fusionner_shards(chemins_shards: list[str], fichier_resultats: str, avec_capital_reel: bool = False):
+    """
+    Concatène des fichiers CSV de résultats (mêmes colonnes) en un seul fichier, en gardant un seul en-tête.
+
+    Les fichiers sont copiés octet par octet, sans être rechargés dans pandas. L'en-tête est celui du premier
+    shard contenant des résultats, et les shards sans résultat sont ignorés. Sans aucun résultat, le fichier
+    produit ne contient que l'en-tête des résultats (voir COLONNES_RESULTATS).
+
+    Args:
+        chemins_shards (list[str]): Les fichiers à fusionner, dans l'ordre voulu.
+        fichier_resultats (str): Le fichier CSV produit.
+        avec_capital_reel (bool, optional): Résultats du mode 'mensuel' : l'en-tête écrit sans aucun résultat
+                                            contient 'Capital Net Reel'.
+
+    Raises:
+        FileNotFoundError: Si un fichier de shard est absent : la fusion échoue plutôt que de produire un fichier incomplet.
+    """
+    manquants = [chemin for chemin in chemins_shards if not os.path.exists(chemin)]
+    if manquants:
+        raise FileNotFoundError(f"{len(manquants)} fichier(s) de shard absent(s), fusion impossible : {', '.join(manquants)}")
+
+    entete_ecrite = False
+    with open(fichier_resultats, 'wb') as sortie:
+        for chemin in chemins_shards:
+            with open(chemin, 'rb') as shard:
+                entete = shard.readline()
+                premiere_ligne = shard.readline()
+                if not premiere_ligne:
+                    continue # Shard sans résultat : seul son en-tête serait copié
+                if not entete_ecrite:
+                    sortie.write(entete)
+                    entete_ecrite = True
+                sortie.write(premiere_ligne)
+                shutil.copyfileobj(shard, sortie)
+        if not entete_ecrite:
+            sortie.write(ResultatsBatch(avec_capital_reel=avec_capital_reel).to_dataframe().to_csv(index=False).encode('utf-8'))
+    logging.info(f"{len(chemins_shards)} shards fusionnés dans '{fichier_resultats}'.")
+
+
+def _decouper_en_shards(source: str | list[Personne], taille_shard: int):
+    """Découpe un fichier de personnes (blocs bruts) ou une liste de Personne en shards."""
+    if isinstance(source, str):
+        yield from importer_donnees_par_blocs(source, taille_shard)
+    else:
+        for debut in range(0, len(source), taille_shard):
+            yield source[debut:debut + taille_shard]
+
+
+def simuler_en_parallele(source: str | list[Personne], epargnes: list[Epargne], fichier_resultats: str,
+                         nb_workers: int = None, taille_shard: int = TAILLE_SHARD_PAR_DEFAUT,
+                         conserver_shards: bool = False, mode: str = MODE_PAR_DEFAUT,
+                         top_k: int = None, critere: str = CRITERE_PAR_DEFAUT,
+                         chronometres: dict = None, progression=None) -> int:
+    """
+    Répartit la simulation sur plusieurs processus et fusionne les résultats dans un seul CSV.
+
+    Chaque worker reçoit le catalogue de produits une seule fois, nettoie (si nécessaire) et simule ses shards,
+    puis écrit ses résultats dans son propre fichier. Le fichier final a le même format et le même
+    ordre que l'export séquentiel. Au plus deux shards par worker sont en attente à la fois, ce qui
+    borne la mémoire du processus principal. Les compteurs d'instrumentation et, si le profileur par défaut
+    est actif, les mesures de profilage de chaque shard sont fusionnés dans ceux du processus principal.
+
+    Args:
+        source (str | list[Personne]): Chemin du fichier de personnes (CSV, TXT, XLSX) ou liste de Personne.
+        epargnes (list[Epargne]): Les produits d'épargne disponibles.
+        fichier_resultats (str): Chemin du fichier CSV de résultats (écrasé s'il existe).
+        nb_workers (int, optional): Nombre de processus. Par défaut, le nombre de cœurs disponibles.
+        taille_shard (int, optional): Nombre de personnes par shard.
+        conserver_shards (bool, optional): Conserve les fichiers de shards après la fusion.
+        mode (str, optional): Mode de calcul, 'annuel' ou 'mensuel' (voir suggestion_epargne).
+        top_k (int, optional): Ne conserve que les top_k meilleurs scénarios de chaque personne.
+        critere (str, optional): Critère de classement du mode top_k (voir CRITERES_CLASSEMENT).
+        chronometres (dict, optional): Si fourni, cumule les secondes passées dans les étapes 'simulation'
+                                       (lecture, simulation et écriture des shards par les workers) et 'fusion'.
+        progression (callable, optional): Appelée après chaque shard terminé avec le nombre total de résultats écrits.
+
+    Returns:
+        int: Le nombre total de résultats écrits.
+
+    Raises:
+        ValueError: Si le mode de calcul ou le critère n'est pas supporté.
+    """
+    verifier_mode(mode)
+    verifier_critere(critere, mode)
+    nb_workers = nb_workers or os.cpu_count() or 1
+    dossier_shards = tempfile.mkdtemp(prefix="shards_", dir=os.path.dirname(os.path.abspath(fichier_resultats)))
+    logging.info(f"Début de la simulation parallèle sur {nb_workers} processus (shards de {taille_shard} personnes).")
+
+    chemins_shards = {}
+    total_resultats = 0
+    instrumentation.reinitialiser()
+
+    def _recuperer(future):
+        nonlocal total_resultats
+        numero, chemin, nombre, compteurs, mesures = future.result()
+        chemins_shards[numero] = chemin
+        total_resultats += nombre
+        instrumentation.fusionner(compteurs)
+        profileur.fusionner(mesures)
+        if progression is not None:
+            progression(total_resultats)
+
+    debut = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=nb_workers, initializer=_initialiser_worker,
+                                 initargs=(epargnes, instrumentation.taux_echantillonnage,
+                                           {'mode': mode, 'top_k': top_k, 'critere': critere},
+                                           source if isinstance(source, str) else None, profileur.actif)) as executeur:
+            en_cours = set()
+            for numero_shard, donnees in enumerate(_decouper_en_shards(source, taille_shard)):
+                if len(en_cours) >= 2 * nb_workers:
+                    termines, en_cours = wait(en_cours, return_when=FIRST_COMPLETED)
+                    for future in termines:
+                        _recuperer(future)
+                en_cours.add(executeur.submit(_simuler_shard, numero_shard, donnees, dossier_shards))
+
+            for future in en_cours:
+                _recuperer(future)
+
+        if chronometres is not None:
+            chronometres['simulation'] = chronometres.get('simulation', 0.0) + time.perf_counter() - debut
+        debut = time.perf_counter()
+        fusionner_shards([chemins_shards[numero] for numero in sorted(chemins_shards)], fichier_resultats, mode == 'mensuel')
+        if chronometres is not None:
+            chronometres['fusion'] = chronometres.get('fusion', 0.0) + time.perf_counter() - debut
+    finally:
+        if not conserver_shards:
+            shutil.rmtree(dossier_shards, ignore_errors=True)
+
+    logging.info(f"Simulation parallèle terminée : {total_resultats} résultats écrits dans '{fichier_resultats}'.")
+    instrumentation.journaliser_resume()
+    return total_resultats
@@ -0,0 +1,158 @@
+import time
+import logging
+
+from src.mon_module.models.epargne import Epargne
+from src.mon_module.data_manager import iterer_personnes_par_blocs, save_resultats_sqlite, FORMATS_SQLITE
+from src.mon_module.data_manager import EcrivainResultatsCSV, est_fichier_csv, EXTENSIONS_CSV
+from src.mon_module.models.resultat import ResultatsBatch
+from src.mon_module.stockage_binaire import EcrivainResultatsBinaire, EXTENSION_BINAIRE
+from src.mon_module.core import simuler_resultats_batch, verifier_mode, verifier_critere, MODE_PAR_DEFAUT, CRITERE_PAR_DEFAUT
+from src.mon_module.instrumentation import instrumentation
+from src.mon_module.cache_persistant import CacheResultatsPersistant
+
+TAILLE_BLOC_PAR_DEFAUT = 100_000
+
+
+def _chronometrer(chronometres: dict, etape: str, debut: float):
+    """Ajoute à chronometres[etape] le temps écoulé depuis debut (si un dictionnaire de chronomètres est fourni)."""
+    if chronometres is not None:
+        chronometres[etape] = chronometres.get(etape, 0.0) + time.perf_counter() - debut
+
+
+def iterer_resultats_par_blocs(fichier_personnes: str, epargnes: list[Epargne], taille_bloc: int = TAILLE_BLOC_PAR_DEFAUT,
+                               mode: str = MODE_PAR_DEFAUT, top_k: int = None, critere: str = CRITERE_PAR_DEFAUT,
+                               chronometres: dict = None, cache: CacheResultatsPersistant = None):
+    """
+    Enchaîne import, nettoyage et simulation bloc par bloc.
+
+    Seul le bloc courant (personnes et résultats) est conservé en mémoire. Avec un cache persistant, seuls
+    les couples (personne, produit) absents du cache sont simulés ; les autres en sont relus.
+
+    Args:
+        fichier_personnes (str): Chemin du fichier CSV, TXT ou XLSX contenant les personnes.
+        epargnes (list[Epargne]): Les produits d'épargne disponibles.
+        taille_bloc (int, optional): Nombre de personnes lues et simulées par bloc.
+        mode (str, optional): Mode de calcul, 'annuel' ou 'mensuel' (voir suggestion_epargne).
+        top_k (int, optional): Ne conserve que les top_k meilleurs scénarios de chaque personne.
+        critere (str, optional): Critère de classement du mode top_k (voir CRITERES_CLASSEMENT).
+        chronometres (dict, optional): Si fourni, cumule les secondes passées dans les étapes 'lecture' et 'simulation'.
+        cache (CacheResultatsPersistant, optional): Cache persistant des résultats, ouvert dans le même mode de calcul.
+
+    Yields:
+        ResultatsBatch: Les résultats de simulation de chaque bloc (complets, qu'ils soient relus ou simulés).
+
+    Raises:
+        ValueError: Si le cache a été ouvert dans un autre mode de calcul.
+    """
+    if cache is not None and cache.mode != mode:
+        raise ValueError(f"Le cache de résultats '{cache.chemin}' est ouvert en mode '{cache.mode}', la simulation est en mode '{mode}'.")
+    blocs_personnes = iterer_personnes_par_blocs(fichier_personnes, taille_bloc, compact=True)
+    while True:
+        debut = time.perf_counter()
+        personnes = next(blocs_personnes, None)
+        _chronometrer(chronometres, 'lecture', debut)
+        if personnes is None:
+            return
+        debut = time.perf_counter()
+        if cache is None:
+            resultats = simuler_resultats_batch(personnes, epargnes, mode=mode, top_k=top_k, critere=critere)
+        else:
+            resultats = cache.simuler(personnes, epargnes, top_k=top_k, critere=critere)
+        _chronometrer(chronometres, 'simulation', debut)
+        yield resultats
+
+
+def ecrire_resultats_par_blocs(blocs_resultats, fichier_resultats: str, chronometres: dict = None, progression=None,
+                               avec_capital_reel: bool = False) -> int:
+    """
+    Écrit des blocs de résultats au fil de l'eau dans un CSV (éventuellement compressé), une base SQLite ou un fichier binaire.
+
+    Le fichier CSV ou binaire reste ouvert pendant toute l'écriture : chaque bloc y est ajouté sans le rouvrir.
+
+    Args:
+        blocs_resultats (iterable[ResultatsBatch]): Les blocs à écrire, consommés un par un.
+        fichier_resultats (str): Chemin du fichier CSV (.csv, .csv.gz, .csv.zst), de la base SQLite (.db, .sqlite, .sqlite3)
+                                 ou du fichier binaire (.bin) de résultats. Le fichier, ou la table 'resultats' de la base, est écrasé s'il existe.
+        chronometres (dict, optional): Si fourni, cumule les secondes passées dans l'étape 'ecriture'.
+        progression (callable, optional): Appelée après chaque bloc avec le nombre total de résultats écrits.
+        avec_capital_reel (bool, optional): Résultats du mode 'mensuel' : un CSV sans aucun résultat garde
+                                            la colonne 'Capital Net Reel' dans son en-tête.
+
+    Returns:
+        int: Le nombre total de résultats écrits.
+
+    Raises:
+        ValueError: Si le fichier de résultats n'est ni un CSV, ni une base SQLite, ni un fichier binaire.
+        sqlite3.Error: Si l'écriture d'un bloc dans la base échoue (base verrouillée, disque plein, schéma incompatible).
+    """
+    # Les écrivains CSV et binaire recréent le fichier à l'ouverture
+    if fichier_resultats.endswith(EXTENSION_BINAIRE):
+        ecrivain = EcrivainResultatsBinaire(fichier_resultats)
+    elif est_fichier_csv(fichier_resultats):
+        ecrivain = EcrivainResultatsCSV(fichier_resultats, avec_capital_reel=avec_capital_reel)
+    elif fichier_resultats.endswith(FORMATS_SQLITE):
+        ecrivain = None
+        save_resultats_sqlite(ResultatsBatch(), fichier_resultats) # Table vidée : les blocs y sont ensuite ajoutés
+    else:
+        raise ValueError(f"L'export par blocs ne supporte que les formats {', '.join(EXTENSIONS_CSV)}, {EXTENSION_BINAIRE} "
+                         f"et {', '.join(FORMATS_SQLITE)} : '{fichier_resultats}'.")
+
+    total_resultats = 0
+    try:
+        for numero_bloc, resultats in enumerate(blocs_resultats, start=1):
+            debut = time.perf_counter()
+            if ecrivain is not None:
+                ecrivain.ajouter(resultats)
+            else:
+                save_resultats_sqlite(resultats, fichier_resultats, ajout=True) # Les erreurs SQLite remontent à l'appelant
+            _chronometrer(chronometres, 'ecriture', debut)
+            total_resultats += len(resultats)
+            logging.info(f"Bloc {numero_bloc} traité : {total_resultats} résultats écrits au total.")
+            if progression is not None:
+                progression(total_resultats)
+    finally:
+        if ecrivain is not None:
+            ecrivain.fermer()
+    return total_resultats
+
+
+def simuler_fichier_par_blocs(fichier_personnes: str, epargnes: list[Epargne], fichier_resultats: str,
+                              taille_bloc: int = TAILLE_BLOC_PAR_DEFAUT, mode: str = MODE_PAR_DEFAUT,
+                              top_k: int = None, critere: str = CRITERE_PAR_DEFAUT,
+                              chronometres: dict = None, progression=None, cache: CacheResultatsPersistant = None) -> int:
+    """
+    Simule toutes les personnes d'un fichier et écrit les résultats au fil de l'eau dans un CSV (éventuellement compressé),
+    une base SQLite ou un fichier binaire projeté en mémoire (voir stockage_binaire).
+
+    La mémoire utilisée est bornée par la taille d'un bloc, quelle que soit la taille du fichier d'entrée.
+    En mode top_k, seuls les meilleurs scénarios de chaque personne sont écrits.
+
+    Args:
+        fichier_personnes (str): Chemin du fichier CSV, TXT ou XLSX contenant les personnes.
+        epargnes (list[Epargne]): Les produits d'épargne disponibles.
+        fichier_resultats (str): Chemin du fichier CSV (.csv, .csv.gz, .csv.zst), de la base SQLite (.db, .sqlite, .sqlite3)
+                                 ou du fichier binaire (.bin) de résultats. Le fichier, ou la table 'resultats' de la base, est écrasé s'il existe.
+        taille_bloc (int, optional): Nombre de personnes lues et simulées par bloc.
+        mode (str, optional): Mode de calcul, 'annuel' ou 'mensuel' (voir suggestion_epargne).
+        top_k (int, optional): Ne conserve que les top_k meilleurs scénarios de chaque personne.
+        critere (str, optional): Critère de classement du mode top_k (voir CRITERES_CLASSEMENT).
+        chronometres (dict, optional): Si fourni, cumule les secondes passées dans les étapes 'lecture',
+                                       'simulation' et 'ecriture'.
+        progression (callable, optional): Appelée après chaque bloc avec le nombre total de résultats écrits.
+        cache (CacheResultatsPersistant, optional): Cache persistant : seuls les couples (personne, produit) nouveaux
+                                                    ou modifiés sont simulés, et l'ensemble complet des résultats est écrit.
+
+    Returns:
+        int: Le nombre total de résultats écrits.
+
+    Raises:
+        ValueError: Si le fichier de résultats n'est ni un CSV, ni une base SQLite, ni un fichier binaire, si le mode ou le critère
+                    n'est pas supporté, ou si le cache a été ouvert dans un autre mode.
+    """
+    verifier_mode(mode)
+    verifier_critere(critere, mode)
+    instrumentation.reinitialiser()
+    blocs_resultats = iterer_resultats_par_blocs(fichier_personnes, epargnes, taille_bloc, mode, top_k, critere, chronometres, cache)
+    total_resultats = ecrire_resultats_par_blocs(blocs_resultats, fichier_resultats, chronometres, progression, mode == 'mensuel')
+    instrumentation.journaliser_resume()
+    return total_resultats
@@ -0,0 +1,344 @@
+import os
+import json
+import math
+import time
+import bisect
+import random
+import logging
+import threading
+from functools import wraps
+from contextlib import contextmanager
+
+# Histogramme des latences : classes géométriques de 1 µs à environ 1 000 s, quatre classes par doublement
+# (erreur relative des percentiles inférieure à 10 %). Une observation ne coûte qu'une recherche dichotomique.
+BORNE_MIN_SECONDES = 1e-6
+CLASSES_PAR_DOUBLEMENT = 4
+NB_CLASSES = 30 * CLASSES_PAR_DOUBLEMENT
+BORNES_CLASSES = [BORNE_MIN_SECONDES * 2 ** (i / CLASSES_PAR_DOUBLEMENT) for i in range(NB_CLASSES)]
+
+QUANTILES_EXPORTES = (0.5, 0.9, 0.99)
+PREFIXE_PROMETHEUS = 'mon_module'
+
+# Variable d'environnement activant le profileur par défaut du processus (toute valeur autre que vide ou '0')
+VARIABLE_ACTIVATION = 'MON_MODULE_PROFILAGE'
+
+
+class HistogrammeLatences:
+    """
+    Histogramme à classes géométriques fixes des durées d'appel, pour les percentiles sans conserver chaque mesure.
+    """
+    __slots__ = ('comptes', 'nombre', 'somme', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.comptes = [0] * (NB_CLASSES + 1) # Dernière classe : durées au-delà de la borne supérieure
+        self.nombre = 0
+        self.somme = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+
+    def ajouter(self, duree: float):
+        """Enregistre une durée en secondes."""
+        self.comptes[bisect.bisect_left(BORNES_CLASSES, duree)] += 1
+        self.nombre += 1
+        self.somme += duree
+        if duree < self.minimum:
+            self.minimum = duree
+        if duree > self.maximum:
+            self.maximum = duree
+
+    def fusionner(self, autre: "HistogrammeLatences"):
+        """Ajoute les durées d'un autre histogramme (mêmes classes), par exemple celui d'un processus worker."""
+        self.comptes = [compte + autre_compte for compte, autre_compte in zip(self.comptes, autre.comptes)]
+        self.nombre += autre.nombre
+        self.somme += autre.somme
+        self.minimum = min(self.minimum, autre.minimum)
+        self.maximum = max(self.maximum, autre.maximum)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estime le quantile q (entre 0 et 1) des durées enregistrées.
+
+        Retourne le milieu géométrique de la classe qui contient le quantile, borné par les durées
+        minimale et maximale observées (0.0 si aucune durée n'a été enregistrée).
+        """
+        if self.nombre == 0:
+            return 0.0
+        if q <= 0:
+            return self.minimum
+        if q >= 1:
+            return self.maximum
+        rang = q * self.nombre
+        cumul = 0
+        for indice, compte in enumerate(self.comptes):
+            cumul += compte
+            if compte and cumul >= rang:
+                break
+        basse = BORNES_CLASSES[indice - 1] if indice > 0 else 0.0
+        haute = BORNES_CLASSES[indice] if indice < NB_CLASSES else self.maximum
+        estimation = math.sqrt(basse * haute) if basse > 0 else haute
+        return min(max(estimation, self.minimum), self.maximum)
+
+
+class StatistiquesFonction:
+    """Compteurs d'appels, d'erreurs et histogramme des latences d'une fonction ou d'un bloc instrumenté."""
+    __slots__ = ('nom', 'appels', 'erreurs', 'histogramme')
+
+    def __init__(self, nom: str):
+        self.nom = nom
+        self.appels = 0
+        self.erreurs = 0
+        self.histogramme = HistogrammeLatences()
+
+    def fusionner(self, autre: "StatistiquesFonction"):
+        """Ajoute les appels, les erreurs et les durées d'autres statistiques du même nom."""
+        self.appels += autre.appels
+        self.erreurs += autre.erreurs
+        self.histogramme.fusionner(autre.histogramme)
+
+    def resume(self) -> dict:
+        """Retourne les compteurs, les durées cumulée, moyenne, minimale et maximale, et les percentiles exportés."""
+        histogramme = self.histogramme
+        resume = {
+            'appels': self.appels,
+            'erreurs': self.erreurs,
+            'duree_cumulee_secondes': histogramme.somme,
+            'duree_moyenne_secondes': histogramme.somme / histogramme.nombre if histogramme.nombre else 0.0,
+            'duree_min_secondes': histogramme.minimum if histogramme.nombre else 0.0,
+            'duree_max_secondes': histogramme.maximum,
+        }
+        for q in QUANTILES_EXPORTES:
+            resume[f"p{q * 100:g}_secondes"] = histogramme.quantile(q)
+        return resume
+
+
+class Profileur:
+    """
+    Registre des mesures de latence des fonctions et des blocs instrumentés du chemin critique.
+
+    Les décorateurs (profiler) et les gestionnaires de contexte (mesurer) comptent les appels et les erreurs,
+    cumulent les durées et alimentent un histogramme par nom. Une fraction des appels d'une fonction peut en
+    plus être exécutée sous cProfile : les profils échantillonnés sont agrégés par fonction.
+    Désactivé (actif=False), un appel instrumenté ne coûte que le test de l'attribut actif.
+    """
+    def __init__(self, actif: bool = True, graine: int = None):
+        self.actif = actif
+        self.statistiques = {}
+        self.profils = {} # nom -> pstats.Stats des appels échantillonnés
+        self._verrou = threading.Lock()
+        self._aleatoire = random.Random(graine)
+        self._cprofile_en_cours = threading.local()
+
+    def enregistrer(self, nom: str, duree: float, erreur: bool = False):
+        """Enregistre un appel de durée donnée (en secondes) sous un nom."""
+        with self._verrou:
+            statistiques = self.statistiques.get(nom)
+            if statistiques is None:
+                statistiques = self.statistiques[nom] = StatistiquesFonction(nom)
+            statistiques.appels += 1
+            statistiques.erreurs += erreur
+            statistiques.histogramme.ajouter(duree)
+
+    def fusionner(self, statistiques: dict[str, StatistiquesFonction]):
+        """
+        Ajoute les mesures d'un autre profileur (son attribut statistiques), par exemple celui d'un processus worker.
+
+        Les histogrammes sont additionnés classe par classe : les percentiles du résumé portent sur l'ensemble
+        des appels, et non sur une moyenne de percentiles. Les profils cProfile échantillonnés ne sont pas transmis.
+        """
+        with self._verrou:
+            for nom, autres in statistiques.items():
+                courantes = self.statistiques.get(nom)
+                if courantes is None:
+                    courantes = self.statistiques[nom] = StatistiquesFonction(nom)
+                courantes.fusionner(autres)
+
+    @contextmanager
+    def mesurer(self, nom: str):
+        """
+        Gestionnaire de contexte qui mesure la durée d'un bloc de code.
+
+        Exemple :
+            with profileur.mesurer('export_resultats'):
+                save_resultats_simulation(resultats, fichier)
+        """
+        if not self.actif:
+            yield
+            return
+        debut = time.perf_counter()
+        erreur = False
+        try:
+            yield
+        except BaseException:
+            erreur = True
+            raise
+        finally:
+            self.enregistrer(nom, time.perf_counter() - debut, erreur)
+
+    def profiler(self, fonction=None, *, nom: str = None, echantillonnage_cprofile: float = 0.0):
+        """
+        Décorateur qui mesure chaque appel d'une fonction, utilisable avec ou sans arguments.
+
+        Args:
+            fonction (callable, optional): La fonction décorée (forme @profileur.profiler).
+            nom (str, optional): Nom des mesures. Par défaut, le nom qualifié de la fonction.
+            echantillonnage_cprofile (float, optional): Fraction des appels exécutés sous cProfile (entre 0 et 1).
+
+        Raises:
+            ValueError: Si la fraction échantillonnée n'est pas comprise entre 0 et 1.
+        """
+        if not 0 <= echantillonnage_cprofile <= 1:
+            raise ValueError(f"La fraction échantillonnée doit être comprise entre 0 et 1 : {echantillonnage_cprofile}")
+
+        def decorateur(func):
+            nom_mesures = nom or f"{func.__module__}.{func.__qualname__}"
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.actif:
+                    return func(*args, **kwargs)
+                echantillonne = echantillonnage_cprofile and self._aleatoire.random() < echantillonnage_cprofile
+                debut = time.perf_counter()
+                erreur = False
+                try:
+                    if echantillonne and not getattr(self._cprofile_en_cours, 'actif', False):
+                        return self._executer_sous_cprofile(nom_mesures, func, args, kwargs)
+                    return func(*args, **kwargs)
+                except BaseException:
+                    erreur = True
+                    raise
+                finally:
+                    self.enregistrer(nom_mesures, time.perf_counter() - debut, erreur)
+
+            wrapper.nom_mesures = nom_mesures
+            return wrapper
+
+        return decorateur(fonction) if fonction is not None else decorateur
+
+    def _executer_sous_cprofile(self, nom: str, func, args, kwargs):
+        """Exécute un appel sous cProfile et agrège son profil à ceux déjà échantillonnés pour ce nom."""
+        import cProfile
+        import pstats
+
+        profil = cProfile.Profile()
+        self._cprofile_en_cours.actif = True # Un seul profil actif à la fois : les appels imbriqués ne sont pas échantillonnés
+        try:
+            return profil.runcall(func, *args, **kwargs)
+        finally:
+            self._cprofile_en_cours.actif = False
+            with self._verrou:
+                if nom in self.profils:
+                    self.profils[nom].add(profil)
+                else:
+                    self.profils[nom] = pstats.Stats(profil)
+
+    def rapport_cprofile(self, nom: str, tri: str = 'cumulative', limite: int = 20) -> str:
+        """
+        Retourne le rapport texte (pstats) des appels échantillonnés sous cProfile pour un nom de mesures.
+
+        Raises:
+            KeyError: Si aucun appel n'a été échantillonné sous ce nom.
+        """
+        import io
+
+        sortie = io.StringIO()
+        with self._verrou:
+            statistiques = self.profils[nom]
+            statistiques.stream = sortie
+            statistiques.sort_stats(tri).print_stats(limite)
+        return sortie.getvalue()
+
+    def reinitialiser(self):
+        """Efface toutes les mesures et tous les profils échantillonnés."""
+        with self._verrou:
+            self.statistiques = {}
+            self.profils = {}
+
+    def resume(self) -> dict[str, dict]:
+        """Retourne le résumé des mesures de chaque nom (voir StatistiquesFonction.resume)."""
+        with self._verrou:
+            return {nom: statistiques.resume() for nom, statistiques in sorted(self.statistiques.items())}
+
+    def vers_json(self) -> str:
+        """Sérialise le résumé des mesures en JSON."""
+        return json.dumps(self.resume(), indent=2, ensure_ascii=False)
+
+    def vers_prometheus(self) -> str:
+        """Sérialise les mesures au format texte d'exposition Prometheus (compteurs et résumés avec quantiles)."""
+        resume = self.resume()
+        lignes = [
+            f"# HELP {PREFIXE_PROMETHEUS}_appels_total Nombre d'appels par fonction instrumentée.",
+            f"# TYPE {PREFIXE_PROMETHEUS}_appels_total counter",
+        ]
+        lignes += [f'{PREFIXE_PROMETHEUS}_appels_total{{fonction="{nom}"}} {mesures["appels"]}' for nom, mesures in resume.items()]
+        lignes += [
+            f"# HELP {PREFIXE_PROMETHEUS}_erreurs_total Nombre d'appels terminés par une exception.",
+            f"# TYPE {PREFIXE_PROMETHEUS}_erreurs_total counter",
+        ]
+        lignes += [f'{PREFIXE_PROMETHEUS}_erreurs_total{{fonction="{nom}"}} {mesures["erreurs"]}' for nom, mesures in resume.items()]
+        lignes += [
+            f"# HELP {PREFIXE_PROMETHEUS}_duree_secondes Durée des appels par fonction instrumentée.",
+            f"# TYPE {PREFIXE_PROMETHEUS}_duree_secondes summary",
+        ]
+        for nom, mesures in resume.items():
+            for q in QUANTILES_EXPORTES:
+                lignes.append(f'{PREFIXE_PROMETHEUS}_duree_secondes{{fonction="{nom}",quantile="{q:g}"}} {mesures[f"p{q * 100:g}_secondes"]:.9g}')
+            lignes.append(f'{PREFIXE_PROMETHEUS}_duree_secondes_sum{{fonction="{nom}"}} {mesures["duree_cumulee_secondes"]:.9g}')
+            lignes.append(f'{PREFIXE_PROMETHEUS}_duree_secondes_count{{fonction="{nom}"}} {mesures["appels"]}')
+        return "\n".join(lignes) + "\n"
+
+    def exporter(self, chemin_fichier: str):
+        """
+        Écrit les mesures dans un fichier : JSON pour l'extension .json, format texte Prometheus sinon (.prom, .txt).
+        """
+        contenu = self.vers_json() if chemin_fichier.endswith('.json') else self.vers_prometheus()
+        with open(chemin_fichier, 'w', encoding='utf-8') as fichier:
+            fichier.write(contenu)
+        logging.info(f"Mesures de profilage exportées vers '{chemin_fichier}'.")
+
+    def servir(self, hote: str = '127.0.0.1', port: int = 0):
+        """
+        Expose les mesures sur un serveur HTTP local, dans un thread démon.
+
+        Les chemins '/metrics' (format Prometheus) et '/metrics.json' (JSON) sont servis.
+
+        Args:
+            hote (str, optional): Adresse d'écoute. Par défaut, la boucle locale uniquement.
+            port (int, optional): Port d'écoute. Par défaut, un port libre choisi par le système.
+
+        Returns:
+            ThreadingHTTPServer: Le serveur démarré (server_address donne le port, shutdown() l'arrête).
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        profileur = self
+
+        class _GestionnaireMesures(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    contenu, type_contenu = profileur.vers_prometheus(), 'text/plain; version=0.0.4; charset=utf-8'
+                elif self.path == '/metrics.json':
+                    contenu, type_contenu = profileur.vers_json(), 'application/json; charset=utf-8'
+                else:
+                    self.send_error(404)
+                    return
+                corps = contenu.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', type_contenu)
+                self.send_header('Content-Length', str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def log_message(self, format, *args):
+                logging.debug("Serveur de mesures : " + format, *args)
+
+        serveur = ThreadingHTTPServer((hote, port), _GestionnaireMesures)
+        threading.Thread(target=serveur.serve_forever, name='serveur-mesures', daemon=True).start()
+        logging.info(f"Mesures de profilage servies sur http://{hote}:{serveur.server_address[1]}/metrics")
+        return serveur
+
+
+# Profileur par défaut du processus, utilisé par les fonctions instrumentées du paquet. Inactif sauf si
+# VARIABLE_ACTIVATION est définie (héritée par les processus workers) ou si la ligne de commande l'active (--mesures).
+profileur = Profileur(actif=os.environ.get(VARIABLE_ACTIVATION, '') not in ('', '0'))
+profiler = profileur.profiler
+mesurer = profileur.mesurer
@@ -0,0 +1,179 @@
+import logging
+import numpy as np
+import pandas as pd
+
+from src.mon_module.models.personne import Personne
+from src.mon_module.models.epargne import Epargne
+from src.mon_module.utils import calcul_interets_composes
+from src.mon_module.core import tableaux_personnes, tableaux_epargnes
+
+DUREE_MAX_ANNEES = 100 # Horizon de recherche de la durée minimale
+ITERATIONS_AJUSTEMENT = 4 # Corrections d'arrondi du versement minimal, au dernier ulp près
+
+# Raisons d'infaisabilité
+RAISON_DUREE_MIN = 'duree_min'
+RAISON_TAUX_NEGATIF = 'taux_negatif'
+RAISON_PLAFOND = 'plafond'
+RAISON_VERSEMENT_NUL = 'versement_nul'
+RAISON_DUREE_MAX = 'duree_max'
+
+
+def _capital_net(versement_annuel: np.ndarray, taux: np.ndarray, duree_annees: np.ndarray, fiscalite: np.ndarray) -> np.ndarray:
+    """Capital net calculé exactement comme dans suggestion_epargne (fiscalité sur les gains positifs)."""
+    capital_brut = calcul_interets_composes(versement_annuel, taux, duree_annees)
+    gains_bruts = capital_brut - versement_annuel * duree_annees
+    return np.where(gains_bruts > 0, capital_brut - gains_bruts * fiscalite, capital_brut)
+
+
+def _duree_annees(duree_mois: np.ndarray) -> np.ndarray:
+    """Durée en années utilisée par la simulation : au moins 1 an, arrondie à l'année la plus proche."""
+    return np.maximum(1, np.round(duree_mois / 12)).astype(np.int64)
+
+
+def _duree_mois_minimale(duree_annees: np.ndarray) -> np.ndarray:
+    """
+    Plus petite durée en mois que la simulation arrondit à duree_annees.
+
+    round() arrondit les demis au pair : 12n - 6 mois donne n années si n est pair, sinon il en faut 12n - 5.
+    """
+    return np.where(duree_annees <= 1, 0, np.where(duree_annees % 2 == 0, 12 * duree_annees - 6, 12 * duree_annees - 5))
+
+
+def versement_minimum(personnes: list[Personne], epargnes: list[Epargne]) -> dict[str, np.ndarray]:
+    """
+    Calcule, pour chaque couple (personne, produit), le versement mensuel minimal qui atteint l'objectif.
+
+    Le capital net est linéaire en le versement : versement_annuel * (k - fiscalite * max(k - n, 0)),
+    avec k = (1 + taux) * facteur_annuite(taux, n). L'objectif est donc inversé en forme fermée,
+    sur la durée d'épargne de chaque personne, pour toutes les personnes et tous les produits à la fois.
+
+    Args:
+        personnes (list[Personne]): Les personnes, avec leur objectif et leur durée d'épargne.
+        epargnes (list[Epargne]): Les produits d'épargne disponibles.
+
+    Returns:
+        dict[str, np.ndarray]: Des tableaux (personnes × produits) :
+            'versement_mensuel' (minimal, np.nan si infaisable), 'realisable' (bool),
+            'raison' (vide si réalisable, sinon 'duree_min', 'taux_negatif' ou 'plafond')
+            et 'dans_capacite' (le versement ne dépasse pas la capacité d'épargne).
+    """
+    colonnes_personnes, colonnes_epargnes = tableaux_personnes(personnes), tableaux_epargnes(epargnes)
+    objectif = colonnes_personnes['objectif'][:, None]
+    duree_epargne = colonnes_personnes['duree_epargne'][:, None]
+    duree_annees = _duree_annees(duree_epargne)
+    taux, fiscalite = colonnes_epargnes['taux'][None, :], colonnes_epargnes['fiscalite'][None, :]
+    versement_max = colonnes_epargnes['versement_max'][None, :]
+
+    eligible = ~(duree_epargne < colonnes_epargnes['duree_min'][None, :])
+    taux_valide = ~(taux < 0)
+    taux_calcul = np.where(taux_valide, taux, 0.0)
+
+    # Capital net d'un versement annuel unitaire, puis inversion de l'objectif
+    coefficient = _capital_net(np.ones(1), taux_calcul, duree_annees, fiscalite)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        versement_mensuel = np.where(objectif > 0, objectif / (12 * coefficient), 0.0)
+
+    # L'inversion peut manquer l'objectif d'un ulp : on remonte le versement jusqu'à l'atteindre
+    for _ in range(ITERATIONS_AJUSTEMENT):
+        manque = (objectif > 0) & (_capital_net(versement_mensuel * 12, taux_calcul, duree_annees, fiscalite) < objectif)
+        if not manque.any():
+            break
+        versement_mensuel = np.where(manque, np.nextafter(versement_mensuel, np.inf), versement_mensuel)
+
+    sous_plafond = np.isnan(versement_max) | (versement_mensuel * 12 <= versement_max)
+    realisable = eligible & taux_valide & sous_plafond
+    raison = np.select([~eligible, ~taux_valide, ~sous_plafond], [RAISON_DUREE_MIN, RAISON_TAUX_NEGATIF, RAISON_PLAFOND], '')
+    return {
+        'versement_mensuel': np.where(realisable, versement_mensuel, np.nan),
+        'realisable': realisable,
+        'raison': raison.astype(object),
+        'dans_capacite': realisable & (versement_mensuel <= colonnes_personnes['capacite'][:, None]),
+    }
+
+
+def duree_minimum(personnes: list[Personne], epargnes: list[Epargne], versement_mensuel: np.ndarray = None,
+                  duree_max_annees: int = DUREE_MAX_ANNEES) -> dict[str, np.ndarray]:
+    """
+    Calcule, pour chaque couple (personne, produit), la durée minimale qui atteint l'objectif avec un versement donné.
+
+    Le versement est plafonné au versement_max du produit, et la durée retenue respecte sa duree_min.
+    La recherche est une dichotomie vectorisée sur le nombre d'années (le capital net croît avec la durée).
+
+    Args:
+        personnes (list[Personne]): Les personnes, avec leur objectif.
+        epargnes (list[Epargne]): Les produits d'épargne disponibles.
+        versement_mensuel (np.ndarray, optional): Le versement mensuel de chaque personne.
+                                                  Par défaut, sa capacité d'épargne mensuelle.
+        duree_max_annees (int, optional): Horizon de recherche en années. Défaut à 100.
+
+    Returns:
+        dict[str, np.ndarray]: Des tableaux (personnes × produits) :
+            'duree_mois' (minimale, -1 si infaisable), 'duree_annees' (durée retenue par la simulation),
+            'realisable' (bool) et 'raison' (vide si réalisable, sinon 'versement_nul', 'taux_negatif' ou 'duree_max').
+    """
+    colonnes_personnes, colonnes_epargnes = tableaux_personnes(personnes), tableaux_epargnes(epargnes)
+    if versement_mensuel is None:
+        versement_mensuel = colonnes_personnes['capacite']
+    versement_mensuel = np.asarray(versement_mensuel, dtype=float)[:, None]
+    objectif = colonnes_personnes['objectif'][:, None]
+    taux, fiscalite = colonnes_epargnes['taux'][None, :], colonnes_epargnes['fiscalite'][None, :]
+    versement_max = colonnes_epargnes['versement_max'][None, :]
+
+    versement_annuel = versement_mensuel * 12
+    versement_annuel = np.where(~np.isnan(versement_max) & (versement_annuel > versement_max), versement_max, versement_annuel)
+    versement_valide = versement_annuel > 0
+    taux_valide = ~(taux < 0)
+    versement_calcul = np.where(versement_valide, versement_annuel, 0.0)
+    taux_calcul = np.where(taux_valide, taux, 0.0)
+
+    def atteint(duree_annees):
+        return _capital_net(versement_calcul, taux_calcul, duree_annees, fiscalite) >= objectif
+
+    forme = np.broadcast_shapes(versement_annuel.shape, taux.shape)
+    borne_basse = np.ones(forme, dtype=np.int64)
+    borne_haute = np.full(forme, duree_max_annees, dtype=np.int64)
+    atteignable = atteint(borne_haute)
+    while np.any(borne_basse < borne_haute):
+        milieu = (borne_basse + borne_haute) // 2
+        suffisant = atteint(milieu)
+        borne_haute = np.where(suffisant, milieu, borne_haute)
+        borne_basse = np.where(suffisant, borne_basse, milieu + 1)
+
+    duree_min_produit = np.nan_to_num(colonnes_epargnes['duree_min'][None, :], nan=0.0)
+    duree_mois = np.maximum(_duree_mois_minimale(borne_haute), duree_min_produit).astype(np.int64)
+
+    realisable = versement_valide & taux_valide & atteignable
+    raison = np.select([~versement_valide, ~taux_valide, ~atteignable], [RAISON_VERSEMENT_NUL, RAISON_TAUX_NEGATIF, RAISON_DUREE_MAX], '')
+    return {
+        'duree_mois': np.where(realisable, duree_mois, -1),
+        'duree_annees': np.where(realisable, _duree_annees(duree_mois), -1),
+        'realisable': realisable,
+        'raison': raison.astype(object),
+    }
+
+
+def resoudre_objectifs(personnes: list[Personne], epargnes: list[Epargne]) -> pd.DataFrame:
+    """
+    Rassemble versement minimal et durée minimale (à capacité d'épargne) dans un tableau, une ligne par couple.
+
+    Args:
+        personnes (list[Personne]): Les personnes à analyser.
+        epargnes (list[Epargne]): Les produits d'épargne disponibles.
+
+    Returns:
+        pd.DataFrame: Une ligne par couple (personne, produit).
+    """
+    logging.info(f"Résolution des objectifs pour {len(personnes)} personnes et {len(epargnes)} produits.")
+    versements, durees = versement_minimum(personnes, epargnes), duree_minimum(personnes, epargnes)
+    nb_personnes, nb_produits = len(personnes), len(epargnes)
+    return pd.DataFrame({
+        'Personne': np.repeat([p.nom for p in personnes], nb_produits),
+        'Produit': np.tile([e.nom for e in epargnes], nb_personnes),
+        'Versement Mensuel Minimum': versements['versement_mensuel'].ravel(),
+        'Versement Realisable': versements['realisable'].ravel(),
+        'Versement Raison': versements['raison'].ravel(),
+        'Dans Capacite': versements['dans_capacite'].ravel(),
+        'Duree Mois Minimum': durees['duree_mois'].ravel(),
+        'Duree Realisable': durees['realisable'].ravel(),
+        'Duree Raison': durees['raison'].ravel(),
+    })
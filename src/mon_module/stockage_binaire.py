@@ -0,0 +1,221 @@
+import os
+import json
+import logging
+
+import numpy as np
+
+from src.mon_module.models.resultat import ResultatEpargne, ResultatsBatch, COLONNES_RESULTATS
+
+# Format binaire des résultats : un fichier de lignes à taille fixe (tableau structuré NumPy, projeté en mémoire
+# par np.memmap) et un fichier annexe JSON '<chemin>.json' contenant le nombre de lignes et les dictionnaires
+# des colonnes texte. Les colonnes texte sont stockées sous forme de codes entiers dans le fichier binaire.
+EXTENSION_BINAIRE = '.bin'
+VERSION_FORMAT = 1
+COLONNES_CHAINES = ('personne_nom', 'produit_nom', 'message')
+CODE_ABSENT = -1 # Code renvoyé pour une chaîne absente du dictionnaire : aucune ligne ne le porte
+
+STRUCTURE_RESULTAT = np.dtype([
+    ('personne_nom', '<i4'), ('produit_nom', '<i4'), ('taux_interet', '<f8'), ('fiscalite', '<f8'),
+    ('versement_mensuel', '<f8'), ('duree_mois', '<i8'), ('capital_brut', '<f8'), ('capital_net', '<f8'),
+    ('atteint_objectif', '?'), ('message', '<i4'), ('capital_net_reel', '<f8'),
+])
+
+TAILLE_BLOC_ALLOCATION = 100_000 # Lignes préallouées à l'ouverture ; la capacité double ensuite à chaque dépassement
+
+
+def chemin_annexe(chemin: str) -> str:
+    """Chemin du fichier JSON qui accompagne un fichier de résultats binaire."""
+    return chemin + '.json'
+
+
+class EcrivainResultatsBinaire:
+    """
+    Écrit des blocs de résultats dans un fichier binaire projeté en mémoire.
+
+    Le fichier est préalloué puis agrandi par doublement de sa capacité : chaque bloc est copié colonne
+    par colonne directement dans la projection, sans conversion en texte. Les chaînes (personne, produit,
+    message) sont remplacées par leur code dans un dictionnaire, écrit dans le fichier annexe à la fermeture.
+    À utiliser comme gestionnaire de contexte : le fichier n'est lisible qu'une fois l'écrivain fermé.
+    """
+    def __init__(self, chemin: str, capacite_initiale: int = TAILLE_BLOC_ALLOCATION):
+        self.chemin = chemin
+        self.nombre = 0
+        self._capacite = 0
+        self._donnees = None
+        self._dictionnaires = {colonne: {} for colonne in COLONNES_CHAINES}
+        self.avec_capital_reel = False # Vrai dès qu'un bloc du mode 'mensuel' est écrit
+        if os.path.exists(chemin_annexe(chemin)):
+            os.remove(chemin_annexe(chemin)) # Un fichier en cours d'écriture n'a pas d'annexe valide
+        open(chemin, 'wb').close()
+        self._agrandir(max(1, capacite_initiale))
+
+    def _agrandir(self, capacite: int):
+        """Redimensionne le fichier à capacite lignes et le projette à nouveau en mémoire."""
+        if self._donnees is not None:
+            self._donnees.flush()
+            self._donnees = None # Libère la projection avant de redimensionner le fichier
+        with open(self.chemin, 'r+b') as fichier:
+            fichier.truncate(capacite * STRUCTURE_RESULTAT.itemsize)
+        self._donnees = np.memmap(self.chemin, dtype=STRUCTURE_RESULTAT, mode='r+', shape=(capacite,))
+        self._capacite = capacite
+
+    def _encoder(self, colonne: str, valeurs: np.ndarray) -> np.ndarray:
+        """Remplace des chaînes par leur code, en complétant le dictionnaire de la colonne."""
+        if len(valeurs) == 0:
+            return np.empty(0, dtype='<i4')
+        dictionnaire = self._dictionnaires[colonne]
+        uniques, inverse = np.unique(valeurs.astype(str), return_inverse=True)
+        codes = np.array([dictionnaire.setdefault(chaine, len(dictionnaire)) for chaine in uniques.tolist()], dtype='<i4')
+        return codes[inverse]
+
+    def ajouter(self, resultats: list[ResultatEpargne] | ResultatsBatch):
+        """
+        Ajoute un bloc de résultats en fin de fichier.
+
+        Args:
+            resultats (list[ResultatEpargne] | ResultatsBatch): Les résultats à écrire.
+
+        Raises:
+            ValueError: Si l'écrivain est déjà fermé.
+        """
+        if self._donnees is None:
+            raise ValueError(f"L'écrivain du fichier '{self.chemin}' est fermé.")
+        if not isinstance(resultats, ResultatsBatch):
+            resultats = ResultatsBatch.depuis_resultats(resultats)
+        nombre = len(resultats)
+        self.avec_capital_reel |= resultats.avec_capital_reel
+        if self.nombre + nombre > self._capacite:
+            self._agrandir(max(2 * self._capacite, self.nombre + nombre))
+
+        tranche = self._donnees[self.nombre:self.nombre + nombre]
+        for nom, valeurs in resultats.colonnes.items():
+            tranche[nom] = self._encoder(nom, valeurs) if nom in COLONNES_CHAINES else valeurs
+        self.nombre += nombre
+
+    def fermer(self):
+        """Tronque le fichier au nombre de lignes écrites et écrit le fichier annexe."""
+        if self._donnees is None:
+            return
+        self._donnees.flush()
+        self._donnees = None
+        with open(self.chemin, 'r+b') as fichier:
+            fichier.truncate(self.nombre * STRUCTURE_RESULTAT.itemsize)
+        annexe = {
+            'version': VERSION_FORMAT,
+            'structure': STRUCTURE_RESULTAT.descr,
+            'nombre': self.nombre,
+            'avec_capital_reel': self.avec_capital_reel,
+            'chaines': {colonne: list(dictionnaire) for colonne, dictionnaire in self._dictionnaires.items()},
+        }
+        with open(chemin_annexe(self.chemin), 'w', encoding='utf-8') as fichier:
+            json.dump(annexe, fichier, ensure_ascii=False)
+        logging.info(f"{self.nombre} résultats de simulation écrits dans le fichier binaire '{self.chemin}'.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+class ResultatsBinaires:
+    """
+    Lecture d'un fichier de résultats binaire, projeté en mémoire par np.memmap.
+
+    L'ouverture ne lit que le fichier annexe : les lignes ne sont chargées par le système qu'au moment
+    où elles sont lues. L'attribut donnees donne accès au tableau structuré brut (tranches et filtres
+    sans copie du fichier) ; lire et filtrer décodent les chaînes et restituent des ResultatsBatch.
+    """
+    def __init__(self, chemin: str):
+        if not os.path.exists(chemin) or not os.path.exists(chemin_annexe(chemin)):
+            raise FileNotFoundError(f"Le fichier de résultats binaire '{chemin}' (ou son annexe) n'existe pas.")
+        with open(chemin_annexe(chemin), encoding='utf-8') as fichier:
+            annexe = json.load(fichier)
+        if annexe.get('version') != VERSION_FORMAT or np.dtype([tuple(champ) for champ in annexe['structure']]) != STRUCTURE_RESULTAT:
+            raise ValueError(f"Format de résultats binaire non supporté pour '{chemin}'.")
+        nombre = annexe['nombre']
+        if os.path.getsize(chemin) != nombre * STRUCTURE_RESULTAT.itemsize:
+            raise ValueError(f"Le fichier de résultats binaire '{chemin}' est incomplet ou corrompu.")
+
+        self.chemin = chemin
+        self.avec_capital_reel = annexe.get('avec_capital_reel', False) # Colonnes des ResultatsBatch relus
+        self.chaines = {colonne: np.array(annexe['chaines'][colonne], dtype=object) for colonne in COLONNES_CHAINES}
+        self._codes = {colonne: {chaine: code for code, chaine in enumerate(chaines)} for colonne, chaines in self.chaines.items()}
+        # np.memmap refuse les fichiers vides
+        self.donnees = (np.memmap(chemin, dtype=STRUCTURE_RESULTAT, mode='r', shape=(nombre,)) if nombre
+                        else np.empty(0, dtype=STRUCTURE_RESULTAT))
+
+    def __len__(self):
+        return len(self.donnees)
+
+    def __repr__(self):
+        return f"ResultatsBinaires('{self.chemin}', {len(self)} résultats)"
+
+    def code(self, colonne: str, chaine: str) -> int:
+        """Code d'une chaîne dans le dictionnaire d'une colonne texte (CODE_ABSENT si elle n'y figure pas)."""
+        return self._codes[colonne].get(chaine, CODE_ABSENT)
+
+    def masque(self, personne_nom: str = None, produit_nom: str = None, atteint_objectif: bool = None) -> np.ndarray:
+        """
+        Masque booléen des lignes qui satisfont tous les filtres fournis.
+
+        Les filtres texte sont traduits en codes : la comparaison porte sur des entiers, champ par champ.
+        """
+        masque = np.ones(len(self), dtype=bool)
+        for colonne, chaine in (('personne_nom', personne_nom), ('produit_nom', produit_nom)):
+            if chaine is not None:
+                masque &= self.donnees[colonne] == self.code(colonne, chaine)
+        if atteint_objectif is not None:
+            masque &= self.donnees['atteint_objectif'] == atteint_objectif
+        return masque
+
+    def lire(self, index=slice(None)) -> ResultatsBatch:
+        """
+        Décode une sélection de lignes en ResultatsBatch.
+
+        Args:
+            index (slice | np.ndarray, optional): Une tranche, des indices ou un masque booléen. Par défaut, tout le fichier.
+
+        Returns:
+            ResultatsBatch: Les résultats sélectionnés.
+        """
+        lignes = self.donnees[index]
+        return ResultatsBatch({nom: self.chaines[nom][lignes[nom]] if nom in COLONNES_CHAINES else lignes[nom]
+                               for nom in COLONNES_RESULTATS}, self.avec_capital_reel)
+
+    def filtrer(self, personne_nom: str = None, produit_nom: str = None, atteint_objectif: bool = None) -> ResultatsBatch:
+        """Résultats qui satisfont tous les filtres fournis (voir masque), dans l'ordre du fichier."""
+        return self.lire(np.flatnonzero(self.masque(personne_nom, produit_nom, atteint_objectif)))
+
+    def iterer_blocs(self, taille_bloc: int = TAILLE_BLOC_ALLOCATION):
+        """
+        Parcourt le fichier par blocs, sans le charger en entier.
+
+        Yields:
+            ResultatsBatch: Les résultats de chaque bloc de taille_bloc lignes.
+        """
+        for debut in range(0, len(self), taille_bloc):
+            yield self.lire(slice(debut, debut + taille_bloc))
+
+
+def save_resultats_binaire(resultats: list[ResultatEpargne] | ResultatsBatch, chemin: str):
+    """
+    Exporte des résultats de simulation dans un fichier binaire (et son annexe JSON), écrasé s'il existe.
+
+    Args:
+        resultats (list[ResultatEpargne] | ResultatsBatch): Les résultats à exporter.
+        chemin (str): Chemin du fichier binaire.
+    """
+    with EcrivainResultatsBinaire(chemin, capacite_initiale=len(resultats)) as ecrivain:
+        ecrivain.ajouter(resultats)
+
+
+def ouvrir_resultats_binaire(chemin: str) -> ResultatsBinaires:
+    """
+    Ouvre un fichier de résultats binaire en lecture, projeté en mémoire.
+
+    Raises:
+        FileNotFoundError: Si le fichier ou son annexe n'existe pas.
+        ValueError: Si le format n'est pas supporté ou si le fichier est incomplet.
+    """
+    return ResultatsBinaires(chemin)
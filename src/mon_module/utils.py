@@ -1,45 +1,163 @@
-import datetime
+import math
+import logging
+import numpy as np
 from functools import wraps # Important pour préserver les métadonnées de la fonction décorée
 
-def calcul_interets_composes(versement_annuel: float, taux_annuel: float, duree_annees: int) -> float:
+# Types traités sans passer par NumPy dans les noyaux de calcul (np.float64 hérite de float)
+_SCALAIRES = (int, float, np.integer, np.floating)
+
+def facteur_annuite(taux: float | np.ndarray, duree: int | np.ndarray) -> float | np.ndarray:
+    """
+    Calcule la somme géométrique 1 + (1 + taux) + ... + (1 + taux) ** (duree - 1) en O(1).
+
+    C'est la valeur acquise par une suite de versements unitaires en fin de période.
+    Accepte des scalaires ou des tableaux NumPy (diffusés entre eux) ; le cas du taux nul vaut duree.
+
+    Args:
+        taux (float | np.ndarray): Le taux par période (ex: 0.03 pour 3%).
+        duree (int | np.ndarray): Le nombre de périodes.
+
+    Returns:
+        float | np.ndarray: Le facteur d'annuité, de la forme diffusée des arguments.
+    """
+    if isinstance(taux, _SCALAIRES) and isinstance(duree, _SCALAIRES) and taux > -1:
+        # Chemin rapide pour les appels unitaires : math évite le coût de conversion en tableaux NumPy
+        return float(duree) if taux == 0 else math.expm1(duree * math.log1p(taux)) / taux
+
+    taux = np.asarray(taux, dtype=float)
+    duree = np.asarray(duree, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # expm1/log1p conservent la précision pour les petits taux
+        facteur = np.where(taux == 0, duree, np.expm1(duree * np.log1p(taux)) / taux)
+    return facteur if facteur.ndim else float(facteur)
+
+
+def calcul_interets_composes(versement_annuel: float | np.ndarray, taux_annuel: float | np.ndarray,
+                             duree_annees: int | np.ndarray) -> float | np.ndarray:
     """
     Calcule le montant final d'un placement avec intérêts composés.
 
+    Chaque versement annuel est effectué en début d'année puis capitalisé, soit en forme fermée
+    versement_annuel * (1 + taux_annuel) * facteur_annuite(taux_annuel, duree_annees).
+    Accepte des scalaires ou des tableaux NumPy (diffusés entre eux).
+
     Args:
-        versement_annuel (float): Le montant total versé par an.
-        taux_annuel (float): Le taux d'intérêt annuel (ex: 0.03 pour 3%).
-        duree_annees (int): La durée du placement en années.
+        versement_annuel (float | np.ndarray): Le montant total versé par an.
+        taux_annuel (float | np.ndarray): Le taux d'intérêt annuel (ex: 0.03 pour 3%).
+        duree_annees (int | np.ndarray): La durée du placement en années.
 
     Returns:
-        float: Le montant total accumulé après la durée spécifiée.
+        float | np.ndarray: Le montant total accumulé après la durée spécifiée.
+
+    Raises:
+        ValueError: Si une durée, un taux ou un versement est négatif.
     """
-    if duree_annees < 0:
+    if isinstance(versement_annuel, _SCALAIRES) and isinstance(taux_annuel, _SCALAIRES) and isinstance(duree_annees, _SCALAIRES):
+        if duree_annees < 0:
+            raise ValueError("La durée en années ne peut pas être négative.")
+        if taux_annuel < 0:
+            raise ValueError("Le taux d'intérêt annuel ne peut pas être négatif.")
+        if versement_annuel < 0:
+            raise ValueError("Le versement annuel ne peut pas être négatif.")
+        return float(versement_annuel * (1 + taux_annuel) * facteur_annuite(taux_annuel, duree_annees))
+
+    versement_annuel = np.asarray(versement_annuel, dtype=float)
+    taux_annuel = np.asarray(taux_annuel, dtype=float)
+    duree_annees = np.asarray(duree_annees)
+
+    if np.any(duree_annees < 0):
         raise ValueError("La durée en années ne peut pas être négative.")
-    if taux_annuel < 0:
+    if np.any(taux_annuel < 0):
         raise ValueError("Le taux d'intérêt annuel ne peut pas être négatif.")
-    if versement_annuel < 0:
+    if np.any(versement_annuel < 0):
         raise ValueError("Le versement annuel ne peut pas être négatif.")
 
-    montant_final = 0.0
-    for annee in range(duree_annees):
-        # Le montant_final est le capital de l'année précédente + le versement de cette année
-        montant_final += versement_annuel
-        # On applique les intérêts sur le nouveau capital
-        montant_final *= (1 + taux_annuel)
-    return montant_final
+    montant_final = versement_annuel * (1 + taux_annuel) * np.asarray(facteur_annuite(taux_annuel, duree_annees))
+    return montant_final if montant_final.ndim else float(montant_final)
+
+def facteur_capitalisation(taux: float | np.ndarray, duree: int | np.ndarray) -> float | np.ndarray:
+    """
+    Calcule (1 + taux) ** duree par exp(duree * log1p(taux)), en scalaire ou diffusé sur des tableaux NumPy.
+
+    Args:
+        taux (float | np.ndarray): Le taux par période.
+        duree (int | np.ndarray): Le nombre de périodes.
+
+    Returns:
+        float | np.ndarray: Le facteur de capitalisation.
+    """
+    if isinstance(taux, _SCALAIRES) and isinstance(duree, _SCALAIRES) and taux > -1:
+        return math.exp(duree * math.log1p(taux))
+    facteur = np.exp(np.asarray(duree, dtype=float) * np.log1p(np.asarray(taux, dtype=float)))
+    return facteur if facteur.ndim else float(facteur)
+
+
+def calcul_capitaux_mensuels(versement_mensuel: float | np.ndarray, taux_annuel: float | np.ndarray,
+                             frais_annuels: float | np.ndarray, inflation_annuelle: float | np.ndarray,
+                             fiscalite: float | np.ndarray, duree_mois: int | np.ndarray) -> tuple:
+    """
+    Moteur mensuel : capitalise des versements mensuels en fin de mois au taux (taux_annuel - frais_annuels) / 12,
+    applique la fiscalité sur les gains puis actualise le capital net de l'inflation mensuelle.
+
+    Les trois capitaux sont obtenus en une passe, en forme fermée. Accepte des scalaires
+    ou des tableaux NumPy (diffusés entre eux).
+
+    Args:
+        versement_mensuel (float | np.ndarray): Le montant versé chaque mois.
+        taux_annuel (float | np.ndarray): Le taux d'intérêt annuel (ex: 0.03 pour 3%).
+        frais_annuels (float | np.ndarray): Les frais de gestion annuels, déduits du taux.
+        inflation_annuelle (float | np.ndarray): L'inflation annuelle utilisée pour le capital réel.
+        fiscalite (float | np.ndarray): Le taux d'imposition des gains.
+        duree_mois (int | np.ndarray): La durée du placement en mois.
+
+    Returns:
+        tuple: Le capital brut, le capital net nominal et le capital net réel (en euros d'aujourd'hui).
+
+    Raises:
+        ValueError: Si une durée, un taux ou un versement est négatif.
+    """
+    scalaires = all(isinstance(v, _SCALAIRES) for v in (versement_mensuel, taux_annuel, frais_annuels,
+                                                        inflation_annuelle, fiscalite, duree_mois))
+    if not scalaires:
+        versement_mensuel = np.asarray(versement_mensuel, dtype=float)
+        taux_annuel = np.asarray(taux_annuel, dtype=float)
+        duree_mois = np.asarray(duree_mois)
+
+    if np.any(duree_mois < 0):
+        raise ValueError("La durée en mois ne peut pas être négative.")
+    if np.any(taux_annuel < 0):
+        raise ValueError("Le taux d'intérêt annuel ne peut pas être négatif.")
+    if np.any(versement_mensuel < 0):
+        raise ValueError("Le versement mensuel ne peut pas être négatif.")
+
+    taux_mensuel_net = (taux_annuel - frais_annuels) / 12
+    capital_brut = versement_mensuel * facteur_annuite(taux_mensuel_net, duree_mois)
+    gains = capital_brut - versement_mensuel * duree_mois
+    if scalaires:
+        capital_net = capital_brut - gains * fiscalite if gains > 0 else capital_brut
+    else:
+        capital_net = np.where(gains > 0, capital_brut - gains * fiscalite, capital_brut)
+    capital_net_reel = capital_net / facteur_capitalisation(inflation_annuelle / 12, duree_mois)
+    return capital_brut, capital_net, capital_net_reel
 
 def log_suggestion_process(func):
     """
-    Décorateur qui affiche un message clair avant l'exécution
-    de la fonction de suggestion d'épargne.
+    Décorateur qui journalise un message clair (niveau DEBUG) avant l'exécution
+    de la fonction de suggestion d'épargne suggestion_epargne(personne, epargnes, ...).
+
+    Le message n'est construit que si le niveau DEBUG est actif. Les mesures de durée des appels
+    sont faites par src.mon_module.profilage.
     """
     @wraps(func) # Permet de préserver le nom, le module, et le docstring de 'func'
-    def wrapper(nombre_placements: int, nom_personne: str, *args, **kwargs):
+    def wrapper(*args, **kwargs):
         """
-        La fonction wrapper qui ajoute la logique d'affichage.
+        La fonction wrapper qui ajoute la logique de journalisation.
         """
-        current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"{current_time} - Nous allons faire une comparaison de {nombre_placements} placements selon la situation de {nom_personne}.")
-        return func(nombre_placements, nom_personne, *args, **kwargs) # Exécute la fonction originale
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            personne = args[0] if args else kwargs.get('personne')
+            epargnes = args[1] if len(args) > 1 else kwargs.get('epargnes', ())
+            logging.debug(f"Nous allons faire une comparaison de {len(epargnes)} placements "
+                          f"selon la situation de {getattr(personne, 'nom', personne)}.")
+        return func(*args, **kwargs) # Exécute la fonction originale
 
     return wrapper
\ No newline at end of file
@@ -0,0 +1,44 @@
+import pytest
+import numpy as np
+from src.mon_module.models.personne import Personne
+from src.mon_module.models.epargne import Epargne
+
+
+@pytest.fixture
+def personnes():
+    """
+    Personnes de référence des tests de simulation, recréées pour chaque test (modifiables sans effet de bord).
+    Pierre n'a pas de versement utilisateur et Sophie une durée d'épargne nulle.
+    """
+    return [
+        Personne("Jean", 30, 35000, 700, 400, objectif=15000, duree_epargne=60, versement_mensuel_utilisateur=200),
+        Personne("Marie", 45, 50000, 900, 600, objectif=25000, duree_epargne=120, versement_mensuel_utilisateur=1000),
+        Personne("Pierre", 25, 25000, 500, 300, objectif=5000, duree_epargne=36, versement_mensuel_utilisateur=np.nan),
+        Personne("Sophie", 35, 40000, 800, 500, objectif=0, duree_epargne=0, versement_mensuel_utilisateur=1200),
+        Personne("Luc", 52, 90000, 1500, 900, objectif=80000, duree_epargne=150, versement_mensuel_utilisateur=3000),
+    ]
+
+
+@pytest.fixture
+def epargnes():
+    """
+    Produits d'épargne de référence des tests de simulation, recréés pour chaque test.
+    """
+    return [
+        Epargne("Livret A", 0.03, 0.0, 0.0, 0.0, 0, 22950),
+        Epargne("LDDS", 0.03, 0.0, 0.0, 0.0, 0, 12000),
+        Epargne("PEL", 0.025, 0.0, 0.0, 0.30, 48, 61200),
+        Epargne("Assurance Vie", 0.045, 0.0, 0.0, 0.172, 96, np.nan),
+        Epargne("Crypto Risquee", 0.15, 0.0, 0.0, 0.30, 12, np.nan),
+    ]
+
+
+@pytest.fixture
+def selectionner():
+    """
+    Fonction qui extrait d'une liste de personnes ou de produits ceux nommés, dans l'ordre des noms donnés.
+    """
+    def _selectionner(objets, *noms):
+        par_nom = {objet.nom: objet for objet in objets}
+        return [par_nom[nom] for nom in noms]
+    return _selectionner
@@ -0,0 +1,96 @@
+import pytest
+import numpy as np
+from src.mon_module.core import calculer_capitaux, suggestion_epargne
+from src.mon_module.cache import CacheScenarios
+from src.mon_module.balayage import balayer_parametres
+
+
+@pytest.fixture
+def donnees(personnes, epargnes, selectionner):
+    """
+    Jean, avec le Livret A et un PEL plafonné à 6000 €/an.
+    """
+    epargnes = selectionner(epargnes, "Livret A", "PEL")
+    epargnes[1].versement_max = 6000
+    return selectionner(personnes, "Jean")[0], epargnes
+
+
+def test_balayage_identique_au_calcul_scalaire(donnees):
+    """
+    Chaque combinaison du balayage vaut le calcul scalaire de suggestion_epargne (plafond, durée minimale, fiscalité).
+    """
+    personne, epargnes = donnees
+    taux, durees, versements, fiscalites = [0.025, 0.04, 0.05], range(36, 181, 36), [100, 400, 600], [0.0, 0.172]
+    balayage = balayer_parametres(personne, epargnes, taux, durees, versements, fiscalites, cache=None)
+    assert balayage.forme == (2, 3, 5, 3, 2)
+
+    for e, epargne in enumerate(epargnes):
+        for t, taux_annuel in enumerate(taux):
+            for d, duree in enumerate(durees):
+                for v, versement in enumerate(versements):
+                    for f, fiscalite in enumerate(fiscalites):
+                        cellule = (e, t, d, v, f)
+                        if duree < epargne.duree_min:
+                            assert not balayage.eligible[cellule] and np.isnan(balayage.capital_net[cellule])
+                            continue
+                        versement_annuel = min(versement * 12, epargne.versement_max)
+                        _, capital_net = calculer_capitaux(versement_annuel, taux_annuel, max(1, round(duree / 12)), fiscalite)
+                        assert balayage.capital_net[cellule] == pytest.approx(capital_net, rel=1e-12)
+                        assert balayage.atteint_objectif[cellule] == (capital_net >= personne.objectif)
+
+
+def test_balayage_axes_libres_et_moteur(donnees):
+    """
+    Sans axe fourni, le balayage reprend le scénario à 100 % de la capacité calculé par suggestion_epargne.
+    """
+    personne, epargnes = donnees
+    for mode in ('annuel', 'mensuel'):
+        balayage = balayer_parametres(personne, epargnes, mode=mode, cache=None)
+        assert balayage.forme == (2, 1, 1, 1, 1)
+        # Scénarios triés par versement croissant : le dernier de chaque produit est celui à 100 % de la capacité
+        attendus = {r.produit_nom: r.capital_net for r in suggestion_epargne(personne, epargnes, mode=mode)}
+        for produit, capital_net in attendus.items():
+            assert balayage.selectionner(produit=produit).item() == pytest.approx(capital_net)
+        # Comme suggestion_epargne, le capital réel n'est calculé qu'en mode mensuel
+        balayage = balayer_parametres(personne, epargnes, versement_mensuel=[300], mode=mode, cache=None)
+        assert np.isnan(balayage.capital_net_reel).all() == (mode == 'annuel')
+        assert ('Capital Net Reel' in balayage.to_dataframe().columns) == (mode == 'mensuel')
+
+
+def test_balayage_dataframe_selection_et_cache(donnees):
+    """
+    Le balayage se convertit en DataFrame long, se sélectionne par étiquettes et est mis en cache.
+    """
+    personne, epargnes = donnees
+    cache = CacheScenarios(taille_max=4)
+    balayage = balayer_parametres(personne, epargnes, taux_interet=np.linspace(0.025, 0.05, 6), duree_mois=[36, 120], cache=cache)
+
+    df = balayage.to_dataframe()
+    assert len(df) == len(balayage) == 2 * 6 * 2
+    assert df.loc[df['Produit'] == 'PEL', 'Fiscalite'].eq(0.30).all()
+    assert df['Capital Net'].to_numpy() == pytest.approx(balayage.capital_net.ravel(), nan_ok=True)
+    assert balayage.selectionner('capital_net', produit='Livret A', taux_interet=0.03).shape == (2, 1, 1)
+
+    assert balayer_parametres(personne, epargnes, taux_interet=np.linspace(0.025, 0.05, 6), duree_mois=[36, 120], cache=cache) is balayage
+    assert cache.succes == 1
+    balayer_parametres(personne, epargnes, taux_interet=[0.03], cache=cache)
+    assert cache.echecs == 2
+    with pytest.raises(ValueError):
+        balayage.capital_net[0] = 0.0 # Tableaux partagés par le cache : lecture seule
+
+
+def test_balayage_arguments_invalides(donnees):
+    """
+    Les axes vides ou négatifs, l'absence de produit, un mode inconnu et une étiquette absente sont refusés.
+    """
+    personne, epargnes = donnees
+    with pytest.raises(ValueError):
+        balayer_parametres(personne, epargnes, taux_interet=[], cache=None)
+    with pytest.raises(ValueError):
+        balayer_parametres(personne, epargnes, duree_mois=[-12], cache=None)
+    with pytest.raises(ValueError):
+        balayer_parametres(personne, [], cache=None)
+    with pytest.raises(ValueError):
+        balayer_parametres(personne, epargnes, mode='hebdomadaire', cache=None)
+    with pytest.raises(ValueError):
+        balayer_parametres(personne, epargnes, cache=None).selectionner(produit='Inconnu')
@@ -0,0 +1,48 @@
+import json
+import pandas as pd
+from benchmarks.generateurs import generer_personnes, generer_epargnes
+from benchmarks.bench_etapes import main, comparer
+from benchmarks.bench_demarrage import mesurer_import, verifier, MODULES_LEGERS
+from src.mon_module.data_cleaning import nettoyer_dataframe
+
+
+def test_generateurs_reproductibles_et_nettoyables():
+    """
+    Les générateurs sont reproductibles pour une graine donnée et leurs valeurs « sales » sont nettoyables.
+    """
+    personnes = generer_personnes(500, graine=3, taux_sale=0.2)
+    pd.testing.assert_frame_equal(personnes, generer_personnes(500, graine=3, taux_sale=0.2))
+    assert (personnes['revenu_annuel'] == 'None').any()
+    assert personnes['revenu_annuel'].str.contains(',').any()
+
+    epargnes = generer_epargnes(200, graine=3, taux_sale=0.2)
+    assert epargnes['taux_interet'].str.endswith('%').any()
+
+    assert nettoyer_dataframe(personnes)['revenu_annuel'].notna().sum() > 400
+    assert nettoyer_dataframe(epargnes)['taux_interet'].max() < 0.11
+
+
+def test_bench_etapes_rapport_json(tmp_path):
+    """
+    Le benchmark écrit une mesure par étape dans un fichier JSON et détecte les régressions.
+    """
+    sortie = tmp_path / "bench.json"
+    assert main(['--tailles', '200', '--produits', '5', '--max-sequentiel', '20', '--sortie', str(sortie)]) == 0
+
+    mesures = json.loads(sortie.read_text(encoding='utf-8'))['mesures']
+    assert [m['etape'] for m in mesures] == ['importer_donnees_dataframe', 'nettoyer_dataframe', 'construction_objets',
+                                             'suggestion_epargne', 'simuler_resultats_batch', 'save_resultats_simulation']
+
+    reference = [dict(m, lignes_par_seconde=m['lignes_par_seconde'] * 10) for m in mesures]
+    assert len(comparer(mesures, reference, seuil=1.2)) == len(mesures)
+    assert comparer(mesures, mesures, seuil=1.2) == []
+
+
+def test_demarrage_sans_dependances_lourdes():
+    """
+    Les modèles s'importent sans NumPy ni pandas, et le moteur de simulation sans pandas, en peu de temps.
+    """
+    mesures = [mesurer_import(module, repetitions=2) for module in MODULES_LEGERS]
+    assert verifier(mesures) == []
+    for mesure in mesures[:3]: # Modèles : seuil large pour les machines d'intégration chargées
+        assert mesure['minimum_millisecondes'] < 50
@@ -0,0 +1,44 @@
+import pytest
+import numpy as np
+from src.mon_module.cache import CacheScenarios
+from src.mon_module.models.personne import Personne
+from src.mon_module.models.epargne import Epargne
+from src.mon_module.core import suggestion_epargne
+
+
+def test_cache_lru_eviction_et_compteurs():
+    """
+    L'entrée la moins récemment utilisée est évincée, et les compteurs suivent chaque accès.
+    """
+    cache = CacheScenarios(taille_max=2)
+    cache.ajouter('a', 1)
+    cache.ajouter('b', 2)
+    assert cache.obtenir('a') == 1 # 'a' devient la plus récente
+    cache.ajouter('c', 3) # évince 'b'
+
+    assert 'b' not in cache and 'a' in cache and 'c' in cache
+    assert cache.obtenir('b') is None
+    assert cache.obtenir_ou_calculer('d', lambda: 4) == 4
+    assert cache.statistiques() == {'taille': 2, 'taille_max': 2, 'succes': 1, 'echecs': 2, 'evictions': 2, 'taux_succes': 1 / 3}
+
+    with pytest.raises(ValueError):
+        CacheScenarios(taille_max=0)
+
+
+def test_suggestion_epargne_avec_cache(capsys):
+    """
+    Les clients partageant versement effectif, taux, durée et fiscalité réutilisent le calcul en cache.
+    """
+    epargnes = [Epargne("Livret A", 0.03, 0.0, 0.0, 0.0, 0, 1200), Epargne("PEL", 0.025, 0.0, 0.0, 0.30, 0, np.nan)]
+    jean = Personne("Jean", 30, 35000, 700, 400, objectif=15000, duree_epargne=60, versement_mensuel_utilisateur=400)
+    marie = Personne("Marie", 45, 50000, 900, 600, objectif=25000, duree_epargne=62, versement_mensuel_utilisateur=400)
+    cache = CacheScenarios()
+
+    sans_cache = suggestion_epargne(jean, epargnes)
+    avec_cache = suggestion_epargne(jean, epargnes, cache=cache)
+    assert [vars(r) for r in avec_cache] == [vars(r) for r in sans_cache]
+    assert cache.succes == 3 # Les 4 versements sont plafonnés à 1200 €/an sur le Livret A
+
+    suggestion_epargne(marie, epargnes, cache=cache) # Même durée arrondie en années : tout est en cache
+    assert cache.statistiques()['echecs'] == 5
+    assert cache.succes == 3 + 8
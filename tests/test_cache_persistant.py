@@ -0,0 +1,50 @@
+import pytest
+from src.mon_module.models.epargne import Epargne
+from src.mon_module.core import simuler_resultats_batch
+from src.mon_module.cache_persistant import CacheResultatsPersistant
+
+
+@pytest.fixture
+def donnees(personnes, epargnes, selectionner):
+    """
+    Quatre personnes de référence (Sophie exclue) et trois produits : 12 couples (personne, produit).
+    """
+    return (selectionner(personnes, "Jean", "Marie", "Pierre", "Luc"),
+            selectionner(epargnes, "Livret A", "PEL", "Assurance Vie"))
+
+
+def test_resimulation_incrementale(tmp_path, donnees):
+    """
+    Une réexécution ne simule que les couples dont la personne ou le produit a changé,
+    et restitue le même ensemble complet qu'une simulation intégrale.
+    """
+    chemin = str(tmp_path / "cache.sqlite")
+    personnes, epargnes = donnees
+    with CacheResultatsPersistant(chemin) as cache:
+        premiere = cache.simuler(personnes, epargnes)
+        assert cache.statistiques()['paires_simulees'] == 12
+
+    personnes[1].objectif = 30000 # Une personne modifiée
+    epargnes.append(Epargne("LDDS", 0.03, 0.0, 0.0, 0.0, 0, 12000)) # Un nouveau produit
+    with CacheResultatsPersistant(chemin) as cache:
+        seconde = cache.simuler(personnes, epargnes)
+        statistiques = cache.statistiques()
+
+    assert statistiques['paires_simulees'] == 3 + 4 # Marie × 3 produits + LDDS × 4 personnes
+    assert statistiques['paires_reutilisees'] == 9
+    assert len(premiere) > 0
+    attendu = simuler_resultats_batch(personnes, epargnes).to_dataframe()
+    assert seconde.to_dataframe().equals(attendu)
+
+
+def test_cache_invalide_si_le_mode_change(tmp_path, donnees):
+    """
+    Un changement de mode de calcul invalide les résultats en cache.
+    """
+    chemin = str(tmp_path / "cache.sqlite")
+    with CacheResultatsPersistant(chemin) as cache:
+        cache.simuler(*donnees)
+    with CacheResultatsPersistant(chemin, mode='mensuel') as cache:
+        resultats = cache.simuler(*donnees)
+        assert cache.statistiques()['paires_reutilisees'] == 0
+    assert resultats.to_dataframe().equals(simuler_resultats_batch(*donnees, mode='mensuel').to_dataframe())
@@ -0,0 +1,81 @@
+import pickle
+import pytest
+import numpy as np
+from src.mon_module.models.epargne import Epargne
+from src.mon_module.models.catalogue import CatalogueEpargne
+from src.mon_module.core import suggestion_epargne, suggestion_epargne_batch
+from src.mon_module.data_manager import import_catalogue
+from src.mon_module.instrumentation import instrumentation
+
+
+@pytest.fixture
+def produits(epargnes, selectionner):
+    """
+    Produits dans un ordre non trié par duree_min, dont un sans durée minimale et deux à 48 mois.
+    """
+    return selectionner(epargnes, "PEL", "Livret A", "Assurance Vie") + [
+        Epargne("Sans Duree", 0.02, 0.0, 0.0, 0.0, np.nan, np.nan),
+        Epargne("CAT", 0.035, 0.0, 0.0, 0.30, 48, np.nan),
+    ]
+
+
+def test_catalogue_eligibilite_par_bisect(produits):
+    """
+    Les produits accessibles sont ceux dont la duree_min est atteinte, restitués dans l'ordre d'origine.
+    """
+    catalogue = CatalogueEpargne(produits)
+
+    assert [e.nom for e in catalogue] == [e.nom for e in produits]
+    assert [e.nom for e in catalogue.produits_eligibles(12)] == ["Livret A", "Sans Duree"]
+    assert [e.nom for e in catalogue.produits_eligibles(48)] == ["PEL", "Livret A", "Sans Duree", "CAT"]
+    assert catalogue.indices_eligibles(200).tolist() == [0, 1, 2, 3, 4]
+
+    assert catalogue.produits_eligibles(50) is catalogue.produits_eligibles(60) # Palier précalculé, sans copie
+    assert [e.nom for e in catalogue.produits_eligibles(50)] == list(catalogue.tableaux_eligibles(50)['nom'])
+
+    copie = pickle.loads(pickle.dumps(catalogue)) # Transmissible aux processus workers
+    assert copie.indices_eligibles(60).tolist() == catalogue.indices_eligibles(60).tolist()
+
+
+def test_suggestion_epargne_avec_catalogue_identique_a_la_liste(capsys, personnes, produits, selectionner):
+    """
+    Simuler avec un catalogue donne les mêmes résultats et les mêmes compteurs qu'avec une liste de produits.
+    """
+    personnes = selectionner(personnes, "Jean", "Luc", "Sophie")
+    catalogue = CatalogueEpargne(produits)
+
+    instrumentation.reinitialiser()
+    avec_liste = [vars(r) for p in personnes for r in suggestion_epargne(p, produits)]
+    ignores_liste = instrumentation.compteurs['produits_ignores_duree_min']
+    instrumentation.reinitialiser()
+    avec_catalogue = [vars(r) for p in personnes for r in suggestion_epargne(p, catalogue)]
+
+    assert avec_catalogue == avec_liste
+    assert instrumentation.compteurs['produits_ignores_duree_min'] == ignores_liste == 4
+    assert [vars(r) for r in suggestion_epargne_batch(personnes, catalogue)] == \
+           [vars(r) for r in suggestion_epargne_batch(personnes, produits)]
+
+
+def test_moteur_vectorise_restreint_aux_produits_du_bloc(capsys, personnes, produits, selectionner):
+    """
+    Par blocs d'une personne, la grille ne contient que les produits éligibles : résultats et compteurs inchangés.
+    """
+    personnes = selectionner(personnes, "Sophie", "Luc") # Durées de 0 et 150 mois
+    catalogue = CatalogueEpargne(produits)
+
+    instrumentation.reinitialiser()
+    attendus = [vars(r) for p in personnes for r in suggestion_epargne(p, catalogue)]
+    ignores = instrumentation.compteurs['produits_ignores_duree_min']
+    instrumentation.reinitialiser()
+
+    assert [vars(r) for r in suggestion_epargne_batch(personnes, catalogue, taille_bloc=1)] == attendus
+    assert instrumentation.compteurs['produits_ignores_duree_min'] == ignores == 3
+
+
+def test_import_catalogue():
+    """
+    Le catalogue importé contient les produits du fichier, dans le même ordre.
+    """
+    catalogue = import_catalogue("tests/epargnes.csv")
+    assert len(catalogue) > 0
+    assert list(catalogue.tableaux['nom']) == [e.nom for e in catalogue]
@@ -0,0 +1,105 @@
+import json
+import pandas as pd
+import pytest
+from src.mon_module.cli import main
+from src.mon_module.data_manager import import_personnes, import_epargnes, import_personnes_sqlite
+from src.mon_module.pipeline import simuler_fichier_par_blocs
+
+
+def test_simulate_identique_au_pipeline(tmp_path, capsys):
+    """
+    La commande simulate écrit le même fichier que le pipeline par blocs, puis affiche la progression et le résumé.
+    """
+    sortie, reference = str(tmp_path / "resultats.csv"), str(tmp_path / "reference.csv")
+    assert main(['simulate', '--personnes', 'personnes.csv', '--epargnes', 'epargnes.csv', '--sortie', sortie,
+                 '--top-k', '2', '--taille-bloc', '3']) == 0
+    simuler_fichier_par_blocs("personnes.csv", import_epargnes("epargnes.csv"), reference, taille_bloc=3, top_k=2)
+    pd.testing.assert_frame_equal(pd.read_csv(sortie), pd.read_csv(reference))
+
+    sorties = capsys.readouterr()
+    assert "lignes/s" in sorties.err # Ligne de progression
+    for etape in ('catalogue', 'lecture', 'simulation', 'ecriture', 'total'):
+        assert etape in sorties.out
+
+
+def test_simulate_parallele_silencieux(tmp_path, capsys):
+    """
+    En mode silencieux, rien n'est affiché ; la simulation parallèle n'accepte qu'une sortie CSV.
+    """
+    sortie = str(tmp_path / "resultats.csv")
+    assert main(['simulate', '--personnes', 'personnes.csv', '--epargnes', 'epargnes.csv', '--sortie', sortie,
+                 '--workers', '2', '--taille-bloc', '2', '-q']) == 0
+    assert capsys.readouterr() == ("", "")
+    assert len(pd.read_csv(sortie)) > 0
+
+    with pytest.raises(SystemExit):
+        main(['simulate', '--personnes', 'personnes.csv', '--epargnes', 'epargnes.csv', '--sortie', str(tmp_path / "r.db"),
+              '--workers', '2'])
+
+
+def test_import_et_export(tmp_path):
+    """
+    import convertit les personnes vers SQLite ; export convertit les résultats d'un format à l'autre sans perte.
+    """
+    base = str(tmp_path / "personnes.db")
+    assert main(['import', '--personnes', 'personnes.csv', '--epargnes', 'epargnes.csv', '--sortie-personnes', base, '-q']) == 0
+    assert [p.nom for p in import_personnes_sqlite(base)] == [p.nom for p in import_personnes("personnes.csv")]
+
+    csv = str(tmp_path / "resultats.csv")
+    main(['simulate', '--personnes', 'personnes.csv', '--epargnes', 'epargnes.csv', '--sortie', csv, '-q'])
+    binaire, parquet = str(tmp_path / "resultats.bin"), str(tmp_path / "resultats.parquet")
+    assert main(['export', '--resultats', csv, '--sortie', binaire, '--taille-bloc', '7', '-q']) == 0
+    assert main(['export', '--resultats', binaire, '--sortie', parquet, '-q']) == 0
+    pd.testing.assert_frame_equal(pd.read_parquet(parquet), pd.read_csv(csv).fillna({'Message': ''}))
+
+    assert main(['export', '--resultats', str(tmp_path / "absent.csv"), '--sortie', parquet, '-q']) == 2
+
+
+def test_mesures_de_profilage(tmp_path, monkeypatch):
+    """
+    --mesures active le profileur par défaut, inactif sinon, et exporte ses mesures en fin de commande.
+    """
+    from src.mon_module.profilage import profileur
+    monkeypatch.setattr(profileur, 'actif', False)
+    profileur.reinitialiser()
+    assert main(['import', '--epargnes', 'epargnes.csv', '-q']) == 0
+    assert profileur.resume() == {}
+
+    mesures = tmp_path / "mesures.json"
+    assert main(['import', '--epargnes', 'epargnes.csv', '-q', '--mesures', str(mesures)]) == 0
+    assert json.loads(mesures.read_text(encoding='utf-8'))['nettoyer_dataframe']['appels'] == 1
+
+    # Avec plusieurs processus, les mesures des workers (un nettoyage par shard de 2 personnes) sont fusionnées
+    profileur.reinitialiser()
+    assert main(['simulate', '--personnes', 'personnes.csv', '--epargnes', 'epargnes.csv', '--sortie', str(tmp_path / "resultats.csv"),
+                 '--workers', '2', '--taille-bloc', '2', '-q', '--mesures', str(mesures)]) == 0
+    assert json.loads(mesures.read_text(encoding='utf-8'))['nettoyer_dataframe']['appels'] == 1 + 2 # Produits, puis 2 shards
+    profileur.reinitialiser()
+
+
+def test_simulate_avec_cache_ne_resimule_que_les_couples_modifies(tmp_path, capsys):
+    """
+    Avec --cache, une deuxième exécution ne simule que les couples du produit modifié
+    et écrit les mêmes résultats qu'une simulation complète.
+    """
+    epargnes, cache = tmp_path / "epargnes.csv", str(tmp_path / "cache.sqlite")
+    sortie, reference = str(tmp_path / "resultats.csv"), str(tmp_path / "reference.csv")
+    df_epargnes = pd.read_csv("epargnes.csv")
+    df_epargnes.to_csv(epargnes, index=False)
+    arguments = ['simulate', '--personnes', 'personnes.csv', '--epargnes', str(epargnes), '--sortie', sortie, '--cache', cache]
+    nb_personnes = len(import_personnes("personnes.csv"))
+
+    assert main(arguments) == 0
+    assert f"{nb_personnes * len(df_epargnes)} couples (personne, produit) simulés, 0 relus" in capsys.readouterr().out
+
+    df_epargnes.loc[df_epargnes['nom'] == 'PEL', 'taux_interet'] = 0.035
+    df_epargnes.to_csv(epargnes, index=False)
+    assert main(arguments) == 0
+    assert f"{nb_personnes} couples (personne, produit) simulés, {nb_personnes * (len(df_epargnes) - 1)} relus" in capsys.readouterr().out
+
+    simuler_fichier_par_blocs("personnes.csv", import_epargnes(str(epargnes)), reference)
+    pd.testing.assert_frame_equal(pd.read_csv(sortie), pd.read_csv(reference))
+    assert (pd.read_csv(sortie).loc[lambda df: df['Produit'] == 'PEL', 'Taux Interet'] == 0.035).all()
+
+    with pytest.raises(SystemExit):
+        main(arguments + ['--workers', '2'])
@@ -0,0 +1,111 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.mon_module.models.personnes_array import PersonnesArray
+from src.mon_module.models.epargne import Epargne
+from src.mon_module.core import suggestion_epargne, suggestion_epargne_batch, simuler_resultats_batch
+
+
+def test_suggestion_epargne_batch_identique_a_suggestion_epargne(personnes, epargnes):
+    """
+    Le moteur vectorisé doit produire les mêmes scénarios, dans le même ordre, que la version par personne.
+    """
+    attendus = [r for p in personnes for r in suggestion_epargne(p, epargnes)]
+    obtenus = suggestion_epargne_batch(personnes, epargnes, taille_bloc=2)
+
+    assert len(obtenus) == len(attendus)
+    for obtenu, attendu in zip(obtenus, attendus):
+        assert obtenu.personne_nom == attendu.personne_nom
+        assert obtenu.produit_nom == attendu.produit_nom
+        assert obtenu.versement_mensuel == pytest.approx(attendu.versement_mensuel)
+        assert obtenu.duree_mois == attendu.duree_mois
+        assert obtenu.capital_brut == pytest.approx(attendu.capital_brut)
+        assert obtenu.capital_net == pytest.approx(attendu.capital_net)
+        assert obtenu.atteint_objectif == attendu.atteint_objectif
+        assert obtenu.message == attendu.message
+
+
+def test_suggestion_epargne_batch_ignore_capacite_invalide_et_duree_min(personnes, epargnes):
+    """
+    Une capacité d'épargne invalide ne génère aucun scénario, et les produits dont la durée
+    minimale n'est pas atteinte sont écartés.
+    """
+    resultats = suggestion_epargne_batch(personnes[2:4], epargnes)
+
+    assert {r.personne_nom for r in resultats} == {"Sophie"}
+    assert {r.produit_nom for r in resultats} == {"Livret A", "LDDS"}
+
+
+def test_mode_mensuel_frais_inflation_et_identique_au_batch(personnes):
+    """
+    En mode mensuel, les capitaux correspondent aux méthodes mois par mois d'Epargne (frais, fiscalité,
+    inflation), et le moteur vectorisé reste identique à la version par personne.
+    """
+    epargnes = [
+        Epargne("Assurance Vie", 0.045, 0.008, 0.02, 0.172, 96, np.nan),
+        Epargne("Livret A", 0.03, 0.0, 0.02, 0.0, 0, 22950),
+    ]
+    attendus = [r for p in personnes for r in suggestion_epargne(p, epargnes, mode='mensuel')]
+    obtenus = suggestion_epargne_batch(personnes, epargnes, taille_bloc=2, mode='mensuel')
+
+    assert len(obtenus) == len(attendus) > 0
+    for obtenu, attendu in zip(obtenus, attendus):
+        assert obtenu.capital_net == pytest.approx(attendu.capital_net, rel=1e-12)
+        assert obtenu.capital_net_reel == pytest.approx(attendu.capital_net_reel, rel=1e-12)
+
+    luc_av = next(r for r in attendus if r.personne_nom == "Luc" and r.produit_nom == "Assurance Vie")
+    produit = epargnes[0]
+    brut = produit.calcul_interets_composes(0, luc_av.versement_mensuel, 150)
+    net = produit.appliquer_fiscalite(brut, luc_av.versement_mensuel * 150)
+    assert luc_av.capital_brut == pytest.approx(brut, rel=1e-12)
+    assert luc_av.capital_net == pytest.approx(net, rel=1e-12)
+    assert luc_av.capital_net_reel == pytest.approx(produit.ajuster_inflation(net, 150), rel=1e-12)
+
+    with pytest.raises(ValueError):
+        suggestion_epargne_batch(personnes, epargnes, mode='trimestriel')
+
+
+def test_colonnes_exportees_selon_le_mode(personnes, epargnes):
+    """
+    Le mode annuel garde les 10 colonnes historiques (capital réel non calculé) ; le mode mensuel ajoute
+    'Capital Net Reel', seul mode où le critère capital_net_reel est accepté.
+    """
+    annuel = simuler_resultats_batch(personnes, epargnes)
+    assert all(r.capital_net_reel is None for r in suggestion_epargne(personnes[0], epargnes))
+    assert 'Capital Net Reel' not in annuel.to_dataframe().columns
+    assert len(annuel.to_dataframe().columns) == len(annuel[0].to_dataframe().columns) == 10
+
+    mensuel = simuler_resultats_batch(personnes, epargnes, mode='mensuel', top_k=2, critere='capital_net_reel')
+    assert list(mensuel.to_dataframe().columns)[-1] == 'Capital Net Reel'
+    assert not mensuel.to_dataframe()['Capital Net Reel'].isna().any()
+
+    with pytest.raises(ValueError):
+        simuler_resultats_batch(personnes, epargnes, mode='annuel', critere='capital_net_reel')
+    with pytest.raises(ValueError):
+        suggestion_epargne(personnes[0], epargnes, critere='capital_net_reel')
+
+
+@pytest.mark.parametrize("critere", ["capital_net", "objectif_puis_versement"])
+def test_top_k_identique_a_suggestion_epargne(critere, personnes, epargnes):
+    """
+    La sélection partielle du moteur vectorisé retient les mêmes scénarios, dans le même ordre,
+    que le tas borné de suggestion_epargne.
+    """
+    attendus = [r for p in personnes for r in suggestion_epargne(p, epargnes, top_k=3, critere=critere)]
+    obtenus = suggestion_epargne_batch(personnes, epargnes, taille_bloc=2, top_k=3, critere=critere)
+
+    assert [(r.personne_nom, r.produit_nom, r.versement_mensuel) for r in obtenus] == \
+           [(r.personne_nom, r.produit_nom, pytest.approx(r.versement_mensuel)) for r in attendus]
+    assert max(sum(r.personne_nom == p.nom for r in obtenus) for p in personnes) == 3
+    if critere == "capital_net":
+        luc = [r.capital_net for r in obtenus if r.personne_nom == "Luc"]
+        assert luc == sorted(luc, reverse=True)
+
+
+def test_simulation_personnes_array_identique(personnes, epargnes):
+    """
+    Un PersonnesArray se simule comme la liste de Personne dont il est issu.
+    """
+    attendu = simuler_resultats_batch(personnes, epargnes).to_dataframe()
+    obtenu = simuler_resultats_batch(PersonnesArray.depuis_personnes(personnes), epargnes, taille_bloc=2).to_dataframe()
+    pd.testing.assert_frame_equal(obtenu, attendu)
@@ -0,0 +1,53 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.mon_module.data_cleaning import nettoyer_dataframe, ErreurNettoyage
+
+
+def test_nettoyer_dataframe_valeurs_mixtes():
+    """
+    Teste le nettoyage vectorisé : virgules décimales, pourcentages, 'None' et valeurs vides.
+    """
+    df = pd.DataFrame({
+        'nom': ['A', 'B', 'C', 'D'],
+        'taux_interet': ['3,5%', '0.02', 'None', ' 4 %'],
+        'versement_max': ['1200,50', '', None, ' 300 '],
+        'duree_min': ['12', '24,0', '0', '48'],
+    })
+    df_nettoye = nettoyer_dataframe(df)
+
+    assert df_nettoye['taux_interet'].tolist()[:2] == pytest.approx([0.035, 0.02])
+    assert np.isnan(df_nettoye['taux_interet'][2])
+    assert df_nettoye['taux_interet'][3] == pytest.approx(0.04)
+    assert df_nettoye['versement_max'][0] == pytest.approx(1200.5)
+    assert df_nettoye['versement_max'][1:3].isna().all()
+    assert df_nettoye['duree_min'].dtype == np.int64
+    assert df_nettoye['duree_min'].tolist() == [12, 24, 0, 48]
+    assert df_nettoye['nom'].tolist() == ['A', 'B', 'C', 'D']
+
+
+def test_nettoyer_dataframe_entiers_avec_valeurs_manquantes():
+    """
+    Une colonne entière contenant des valeurs manquantes reste en float (valeurs tronquées).
+    """
+    df_nettoye = nettoyer_dataframe(pd.DataFrame({'age': ['30', 'None', '41,7']}))
+
+    assert df_nettoye['age'].dtype == float
+    assert df_nettoye['age'][0] == 30 and df_nettoye['age'][2] == 41
+    assert np.isnan(df_nettoye['age'][1])
+
+
+def test_nettoyer_dataframe_rapport_erreurs():
+    """
+    Toutes les lignes invalides sont signalées, par exception ou dans le rapport fourni.
+    """
+    df = pd.DataFrame({'age': ['30', 'trente', '40'], 'fiscalite': ['x', '0.3', 'y']})
+
+    with pytest.raises(ErreurNettoyage) as exc_info:
+        nettoyer_dataframe(df)
+    assert exc_info.value.erreurs == {'age': [1], 'fiscalite': [0, 2]}
+
+    rapport = {}
+    df_nettoye = nettoyer_dataframe(df, rapport_erreurs=rapport)
+    assert rapport == {'age': [1], 'fiscalite': [0, 2]}
+    assert df_nettoye['fiscalite'].isna().tolist() == [True, False, True]
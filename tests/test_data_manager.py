@@ -0,0 +1,93 @@
+import gzip
+import pytest
+import pandas as pd
+from src.mon_module import data_manager
+from src.mon_module.data_manager import (import_personnes, import_epargnes, save_personnes, save_epargnes,
+                                         save_resultats_simulation, importer_donnees_dataframe, importer_donnees_par_blocs,
+                                         EcrivainResultatsCSV, nettoyer_si_necessaire)
+from src.mon_module.core import simuler_resultats_batch
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".feather", ".arrow"])
+def test_aller_retour_formats_types(tmp_path, monkeypatch, extension):
+    """
+    Un aller-retour Parquet/Feather conserve les dtypes : le nettoyage n'est pas refait à la relecture.
+    """
+    personnes = import_personnes("personnes.csv")
+    epargnes = import_epargnes("epargnes.csv")
+    fichier_personnes = str(tmp_path / f"personnes{extension}")
+    fichier_epargnes = str(tmp_path / f"epargnes{extension}")
+    save_personnes(personnes, fichier_personnes, compression="zstd")
+    save_epargnes(epargnes, fichier_epargnes)
+
+    def _nettoyage_interdit(df, rapport_erreurs=None):
+        raise AssertionError("nettoyer_dataframe ne doit pas être appelé sur des données typées")
+    monkeypatch.setattr(data_manager, "nettoyer_dataframe", _nettoyage_interdit)
+
+    personnes_relues = import_personnes(fichier_personnes)
+    epargnes_relues = import_epargnes(fichier_epargnes)
+    pd.testing.assert_frame_equal(data_manager._dataframe_personnes(personnes_relues),
+                                  data_manager._dataframe_personnes(personnes), check_dtype=False)
+    assert [p.duree_epargne for p in personnes_relues] == [p.duree_epargne for p in personnes]
+    assert [e.taux_interet_annuel for e in epargnes_relues] == [e.taux_interet_annuel for e in epargnes]
+    brut = importer_donnees_dataframe(fichier_personnes)
+    assert brut['duree_epargne'].dtype == 'int64'
+    assert nettoyer_si_necessaire(brut, fichier_personnes) is brut
+
+
+def test_projection_et_resultats_parquet(tmp_path):
+    """
+    La lecture ne charge que les colonnes demandées ; les résultats s'exportent en Parquet et se relisent par blocs.
+    """
+    df = importer_donnees_dataframe("personnes.csv", colonnes=['nom', 'objectif'])
+    assert list(df.columns) == ['nom', 'objectif']
+
+    resultats = simuler_resultats_batch(import_personnes("personnes.csv"), import_epargnes("epargnes.csv"))
+    fichier_resultats = str(tmp_path / "resultats.parquet")
+    save_resultats_simulation(resultats, fichier_resultats)
+
+    df_resultats = importer_donnees_dataframe(fichier_resultats, colonnes=['Personne', 'Capital Net', 'Objectif Atteint'])
+    assert len(df_resultats) == len(resultats)
+    assert df_resultats['Objectif Atteint'].dtype == bool
+    blocs = list(importer_donnees_par_blocs(fichier_resultats, 10))
+    assert [len(bloc) for bloc in blocs] == [10, 10, 10, 10, 4]
+    assert blocs[-1].index[0] == 40
+
+
+def test_ecrivain_csv_par_blocs_et_compression(tmp_path):
+    """
+    L'écrivain CSV produit, bloc par bloc et une fois décompressé, le même fichier que l'export en une fois.
+    """
+    resultats = simuler_resultats_batch(import_personnes("personnes.csv"), import_epargnes("epargnes.csv"))
+    fichier_complet = tmp_path / "complet.csv"
+    save_resultats_simulation(resultats, str(fichier_complet))
+
+    fichier_gzip = tmp_path / "blocs.csv.gz"
+    with EcrivainResultatsCSV(str(fichier_gzip)) as ecrivain:
+        for debut in range(0, len(resultats), 7):
+            ecrivain.ajouter(resultats[debut:debut + 7])
+    assert ecrivain.nombre == len(resultats)
+    assert gzip.decompress(fichier_gzip.read_bytes()) == fichier_complet.read_bytes()
+    pd.testing.assert_frame_equal(importer_donnees_dataframe(str(fichier_gzip)), pd.read_csv(fichier_complet))
+
+    # Ajout : pas de second en-tête, y compris dans un nouveau membre gzip
+    save_resultats_simulation(resultats, str(fichier_gzip), ajout=True)
+    assert len(pd.read_csv(fichier_gzip)) == 2 * len(resultats)
+
+    with pytest.raises(ValueError):
+        ecrivain.ajouter(resultats)
+    with pytest.raises(ValueError):
+        EcrivainResultatsCSV(str(tmp_path / "resultats.csv"), compression='bz2')
+
+
+def test_ecrivain_csv_zstd(tmp_path):
+    """
+    Les CSV '.csv.zst' sont compressés en zstd et relus par pandas.
+    """
+    pytest.importorskip("zstandard")
+    resultats = simuler_resultats_batch(import_personnes("personnes.csv"), import_epargnes("epargnes.csv"))
+    fichier_zstd = str(tmp_path / "resultats.csv.zst")
+    save_resultats_simulation(resultats, fichier_zstd)
+    assert len(pd.read_csv(fichier_zstd)) == len(resultats)
@@ -40,4 +40,16 @@ def test_epargne_calcul_interets_composes():
     assert montant_final_attendu < 1000 + (100 * 12) * 1.1
    
     assert epargne.calcul_interets_composes(0, 0, 12) == 0
-    assert epargne.calcul_interets_composes(100, 0, 0) == 100 
\ No newline at end of file
+    assert epargne.calcul_interets_composes(100, 0, 0) == 100 
+
+def test_epargne_calcul_interets_composes_forme_fermee():
+    """
+    La forme fermée doit correspondre au calcul mois par mois, y compris lorsque les frais annulent le taux.
+    """
+    for taux, frais in [(0.05, 0.01), (0.02, 0.02)]:
+        epargne = Epargne(nom="Test", fiscalite=0.0, duree_min=0, taux_interet_annuel=taux,
+                          frais_gestion_annuels=frais, inflation_annuelle=0.0)
+        montant_courant = 1000.0
+        for _ in range(120):
+            montant_courant = montant_courant * (1 + (taux - frais) / 12) + 150
+        assert epargne.calcul_interets_composes(1000, 150, 120) == pytest.approx(montant_courant, rel=1e-12)
@@ -0,0 +1,53 @@
+import pytest
+import pandas as pd
+from src.mon_module.data_manager import import_personnes, save_personnes
+from src.mon_module.ingestion import lister_fichiers, importer_fichiers_dataframe, import_personnes_fichiers
+
+
+def test_import_personnes_fichiers_concurrent_et_erreurs_par_fichier(tmp_path):
+    """
+    Les shards CSV, TXT et XLSX sont lus en parallèle dans l'ordre des fichiers ; un shard invalide
+    est signalé dans le rapport sans interrompre les autres.
+    """
+    personnes = import_personnes("personnes.csv")
+    save_personnes(personnes[:3], str(tmp_path / "a_shard.csv"))
+    save_personnes(personnes[3:5], str(tmp_path / "b_shard.txt"))
+    save_personnes(personnes[5:], str(tmp_path / "c_shard.xlsx"))
+    (tmp_path / "d_casse.xlsx").write_text("ceci n'est pas un classeur")
+    (tmp_path / "e_incomplet.csv").write_text("nom,age\nZoe,30\n")
+    (tmp_path / "notes.md").write_text("ignoré")
+
+    rapport = {}
+    importees = import_personnes_fichiers(str(tmp_path), nb_threads=2, nb_processus=2, rapport_erreurs=rapport)
+
+    assert [p.nom for p in importees] == [p.nom for p in personnes]
+    assert [p.capacite_epargne_mensuelle for p in importees] == pytest.approx([p.capacite_epargne_mensuelle for p in personnes], nan_ok=True)
+    assert sorted(rapport) == [str(tmp_path / "d_casse.xlsx"), str(tmp_path / "e_incomplet.csv")]
+
+
+def test_importer_fichiers_dataframe_glob(tmp_path):
+    """
+    Un motif glob sélectionne les shards, concaténés avec le fichier d'origine de chaque ligne.
+    """
+    for i in range(3):
+        pd.DataFrame({'nom': [f"P{i}"], 'age': [30 + i]}).to_csv(tmp_path / f"extrait_{i}.csv", index=False)
+
+    df = importer_fichiers_dataframe(str(tmp_path / "extrait_*.csv"), colonne_source="fichier")
+    assert df['nom'].tolist() == ["P0", "P1", "P2"]
+    assert df['fichier'].tolist() == [str(tmp_path / f"extrait_{i}.csv") for i in range(3)]
+
+    with pytest.raises(FileNotFoundError):
+        lister_fichiers(str(tmp_path / "*.xlsx"))
+
+
+def test_shards_csv_compresses(tmp_path):
+    """
+    Les shards .csv.gz d'un dossier ou d'un motif glob sont listés, lus par les threads et décompressés.
+    """
+    personnes = import_personnes("personnes.csv")
+    save_personnes(personnes[:4], str(tmp_path / "a_shard.csv"))
+    pd.read_csv("personnes.csv").iloc[4:].to_csv(tmp_path / "b_shard.CSV.GZ", index=False)
+
+    assert lister_fichiers(str(tmp_path / "*_shard.*")) == [str(tmp_path / "a_shard.csv"), str(tmp_path / "b_shard.CSV.GZ")]
+    importees = import_personnes_fichiers(str(tmp_path), nb_threads=2, nb_processus=1)
+    assert [p.nom for p in importees] == [p.nom for p in personnes]
@@ -0,0 +1,76 @@
+import pytest
+from src.mon_module.models.personne import Personne
+from src.mon_module.core import suggestion_epargne, suggestion_epargne_batch
+from src.mon_module.instrumentation import Instrumentation, instrumentation
+
+
+@pytest.fixture
+def donnees(personnes, epargnes, selectionner):
+    """
+    Jean (versement de 2000 €/mois) et Pierre (sans capacité), avec un PEL plafonné à 6000 €/an.
+    """
+    jean = Personne("Jean", 30, 35000, 700, 400, objectif=15000, duree_epargne=60, versement_mensuel_utilisateur=2000)
+    personnes, epargnes = [jean] + selectionner(personnes, "Pierre"), selectionner(epargnes, "Livret A", "PEL", "Assurance Vie")
+    epargnes[1].versement_max = 6000
+    return personnes, epargnes
+
+
+def test_compteurs_identiques_entre_moteurs(capsys, donnees):
+    """
+    Le moteur par personne et le moteur vectorisé doivent alimenter les mêmes compteurs.
+    """
+    personnes, epargnes = donnees
+
+    instrumentation.reinitialiser()
+    for personne in personnes:
+        suggestion_epargne(personne, epargnes)
+    compteurs_par_personne = dict(instrumentation.compteurs)
+
+    instrumentation.reinitialiser()
+    suggestion_epargne_batch(personnes, epargnes)
+    compteurs_vectorises = dict(instrumentation.compteurs)
+
+    assert compteurs_par_personne == compteurs_vectorises
+    assert compteurs_vectorises == {
+        'personnes_simulees': 2,
+        'personnes_sans_capacite': 1,
+        'scenarios_evalues': 8,
+        'produits_ignores_duree_min': 1,
+        'versements_plafonnes': 4,
+        'erreurs_calcul': 0,
+    }
+
+
+def test_trace_echantillonnee(caplog, donnees):
+    """
+    La trace n'est produite que lorsqu'elle est activée, pour la fraction de scénarios demandée.
+    """
+    personnes, epargnes = donnees
+    instrumentation_locale = Instrumentation()
+    assert not instrumentation_locale.trace_active
+
+    instrumentation.activer_trace(1.0, graine=0)
+    try:
+        with caplog.at_level("INFO"):
+            suggestion_epargne_batch(personnes, epargnes)
+    finally:
+        instrumentation.desactiver_trace()
+    assert sum("[trace]" in message for message in caplog.messages) == 8
+
+    with pytest.raises(ValueError):
+        instrumentation_locale.activer_trace(1.5)
+
+
+def test_resume_et_fusion():
+    """
+    Le résumé contient les compteurs fusionnés, la durée et le débit.
+    """
+    instrumentation_locale = Instrumentation()
+    instrumentation_locale.incrementer('scenarios_evalues', 10)
+    instrumentation_locale.fusionner({'scenarios_evalues': 5, 'erreurs_calcul': 1})
+
+    resume = instrumentation_locale.resume()
+    assert resume['scenarios_evalues'] == 15
+    assert resume['erreurs_calcul'] == 1
+    assert resume['duree_secondes'] >= 0
+    assert 'scenarios_par_seconde' in resume
@@ -0,0 +1,93 @@
+import pytest
+import numpy as np
+from src.mon_module.models.personne import Personne
+from src.mon_module.models.epargne import Epargne
+from src.mon_module.core import suggestion_epargne_batch
+from src.mon_module.monte_carlo import simuler_monte_carlo, tirer_taux
+
+
+@pytest.fixture
+def donnees(personnes, epargnes, selectionner):
+    """
+    Jean, Marie et Pierre, avec un PEL plafonné à 6000 €/an et un produit actions accessible à 96 mois.
+    """
+    personnes, epargnes = selectionner(personnes, "Jean", "Marie", "Pierre"), selectionner(epargnes, "Livret A", "PEL")
+    epargnes[1].versement_max = 6000
+    epargnes.append(Epargne("Actions", 0.07, 0.0, 0.0, 0.30, 96, np.nan))
+    return personnes, epargnes
+
+
+def test_monte_carlo_sans_volatilite_egal_au_deterministe(donnees):
+    """
+    Sans volatilité, toutes les trajectoires donnent le capital net de la simulation déterministe (effort de 100 %).
+    """
+    personnes, epargnes = donnees
+    resultats = simuler_monte_carlo(personnes, epargnes, volatilites=0.0, nb_trajectoires=50, taille_bloc=7)
+    deterministes = {}
+    for resultat in suggestion_epargne_batch(personnes, epargnes):
+        cle = (resultat.personne_nom, resultat.produit_nom)
+        if cle not in deterministes or resultat.versement_mensuel > deterministes[cle].versement_mensuel:
+            deterministes[cle] = resultat
+
+    assert list(zip(resultats['Personne'], resultats['Produit'])) == list(deterministes)
+    for _, ligne in resultats.iterrows():
+        attendu = deterministes[(ligne['Personne'], ligne['Produit'])]
+        assert ligne['Capital Net Moyen'] == pytest.approx(attendu.capital_net, rel=1e-9)
+        assert ligne['Capital Net Q05'] == pytest.approx(attendu.capital_net, rel=1e-9)
+        assert ligne['Capital Net Ecart Type'] == pytest.approx(0, abs=1e-6)
+        assert ligne['Probabilite Objectif'] == (1.0 if attendu.atteint_objectif else 0.0)
+
+
+def test_monte_carlo_reproductible_et_parallele(donnees):
+    """
+    Pour une graine donnée, les résultats sont identiques en séquentiel et sur plusieurs processus.
+    """
+    personnes, epargnes = donnees
+    parametres = dict(volatilites={'Actions': 0.15, 'PEL': 0.01}, nb_trajectoires=2000, distribution='lognormale', graine=42, taille_bloc=500)
+    sequentiel = simuler_monte_carlo(personnes, epargnes, **parametres)
+    parallele = simuler_monte_carlo(personnes, epargnes, nb_workers=2, **parametres)
+
+    assert sequentiel.equals(parallele)
+    actions = sequentiel[sequentiel['Produit'] == 'Actions'].iloc[0]
+    assert actions['Capital Net Q05'] < actions['Capital Net Q50'] < actions['Capital Net Q95']
+    assert 0 < actions['Probabilite Objectif'] <= 1
+
+
+def test_tirer_taux_moments():
+    """
+    Les taux tirés respectent la moyenne et la volatilité demandées.
+    """
+    generateur = np.random.default_rng(0)
+    for distribution in ('normale', 'lognormale', 'student'):
+        taux = tirer_taux(generateur, 0.05, 0.1, (200_000,), distribution)
+        assert taux.mean() == pytest.approx(0.05, abs=0.002)
+        assert taux.std() == pytest.approx(0.1, rel=0.03)
+    with pytest.raises(ValueError):
+        tirer_taux(generateur, 0.05, 0.1, (10,), 'uniforme')
+
+
+def test_monte_carlo_blocs_fusionnes_exacts(donnees):
+    """
+    Les blocs de trajectoires d'un seul produit, répartis sur plusieurs processus, donnent l'espérance, l'écart-type
+    et la probabilité exacts des trajectoires complètes, et des quantiles à la résolution de l'histogramme près.
+    """
+    _, epargnes = donnees
+    marie = Personne("Marie", 45, 50000, 900, 600, objectif=160000, duree_epargne=120, versement_mensuel_utilisateur=1000) # Objectif proche de la médiane
+    resultats = simuler_monte_carlo([marie], epargnes[2:], volatilites=0.15, nb_trajectoires=3000,
+                                    graine=7, taille_bloc=700, nb_workers=3)
+
+    # Trajectoires complètes, tirées avec les mêmes graines de blocs
+    graines = np.random.SeedSequence(7).spawn(1)[0].spawn(5)
+    taux = np.vstack([tirer_taux(np.random.default_rng(g), 0.07, 0.15, (min(700, 3000 - 700 * i), 10)) for i, g in enumerate(graines)])
+    facteur = np.zeros(3000)
+    for annee in range(10):
+        facteur = (facteur + 1) * (1 + taux[:, annee])
+    versement_annuel = marie.capacite_epargne_mensuelle * 12
+    capital_net = versement_annuel * (facteur - 0.30 * np.maximum(facteur - 10, 0))
+
+    ligne = resultats.iloc[0]
+    assert ligne['Capital Net Moyen'] == pytest.approx(capital_net.mean(), rel=1e-12)
+    assert ligne['Capital Net Ecart Type'] == pytest.approx(capital_net.std(), rel=1e-9)
+    assert 0 < ligne['Probabilite Objectif'] == np.mean(capital_net >= marie.objectif) < 1
+    for colonne, quantile in (('Capital Net Q05', 0.05), ('Capital Net Q50', 0.50), ('Capital Net Q95', 0.95)):
+        assert ligne[colonne] == pytest.approx(np.quantile(capital_net, quantile), rel=2e-3)
@@ -1,5 +1,7 @@
 import pytest
-from src.mon_module.models.personne import Personne
+import numpy as np
+from src.mon_module.models.personne import Personne, ATTRIBUTS_PERSONNE
+from src.mon_module.models.personnes_array import PersonnesArray
 
 def test_personne_initialisation():
     """
@@ -114,4 +116,36 @@ def test_personne_afficher_output(capsys):
     assert "Personne: Test Affichage (âge: 30 ans)" in captured.out
     assert "Revenu annuel: 36000.00 €" in captured.out
     assert "Capacité d'épargne mensuelle estimée: 1800.00 €/mois" in captured.out
-    assert "Objectif financier: 10000.00 € sur 24 mois" in captured.out
\ No newline at end of file
+    assert "Objectif financier: 10000.00 € sur 24 mois" in captured.out
+
+
+def test_personne_sans_dict():
+    """
+    Personne est déclarée avec __slots__ : aucun __dict__ par instance.
+    """
+    personne = Personne("Jean", 30, 35000, 700, 400)
+    assert not hasattr(personne, '__dict__')
+    with pytest.raises(AttributeError):
+        personne.attribut_inconnu = 1
+
+
+def test_personnes_array_equivalent_aux_objets():
+    """
+    Les capacités vectorisées et les vues par ligne reproduisent les objets Personne construits un à un.
+    """
+    lignes = [("Jean", 30, 35000, 700, 400, 15000, 60, 200), ("Pierre", 25, 25000, 500, 300, 5000, 36, None),
+              ("Paul", 40, 12000, 600, 500, 1000, 12, None), ("Zoé", 33, 30000, 700, 400, 0, 0, np.nan)]
+    personnes = [Personne(*ligne) for ligne in lignes]
+    tableau = PersonnesArray(*zip(*lignes))
+
+    assert len(tableau) == 4
+    assert tableau.colonnes['capacite_epargne_mensuelle'] == pytest.approx([p.capacite_epargne_mensuelle for p in personnes], nan_ok=True)
+    vue = tableau[1]
+    assert isinstance(vue, Personne) and str(vue) == str(personnes[1])
+    assert [p.nom for p in tableau[1:3]] == ["Pierre", "Paul"]
+    assert [p.nom for p in tableau[tableau.colonnes['duree_epargne'] > 20]] == ["Jean", "Pierre"]
+
+    vue.objectif = 6000 # Une vue écrit dans les colonnes du tableau
+    assert tableau.colonnes['objectif'][1] == 6000
+    for attendue, materialisee in zip(personnes[:1], tableau.vers_personnes()[:1]):
+        assert [getattr(materialisee, nom) for nom in ATTRIBUTS_PERSONNE] == [getattr(attendue, nom) for nom in ATTRIBUTS_PERSONNE]
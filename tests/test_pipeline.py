@@ -0,0 +1,141 @@
+import io
+import pytest
+import pandas as pd
+from src.mon_module import data_manager, parallele
+from src.mon_module.data_manager import (import_personnes, import_epargnes, save_personnes, save_resultats_simulation,
+                                         importer_donnees_par_blocs)
+from src.mon_module.core import simuler_resultats_batch
+from src.mon_module.pipeline import simuler_fichier_par_blocs
+from src.mon_module.models.personne import Personne
+from src.mon_module.models.resultat import COLONNES_RESULTATS
+from src.mon_module.parallele import simuler_en_parallele, fusionner_shards, _simuler_shard
+
+
+def _ecrire_personnes(chemin, nombre):
+    lignes = ["nom,age,revenu_annuel,loyer,depenses_mensuelles,objectif,duree_epargne,versement_mensuel_utilisateur"]
+    for i in range(nombre):
+        versement = "None" if i % 3 == 0 else str(100 + 10 * i)
+        lignes.append(f"P{i},{20 + i % 40},{30000 + 500 * i},700,400,{5000 + 1000 * i},{12 * (1 + i % 12)},{versement}")
+    chemin.write_text("\n".join(lignes) + "\n")
+
+
+def test_simuler_fichier_par_blocs_identique_a_la_simulation_complete(tmp_path):
+    """
+    L'export par blocs doit produire le même fichier que la simulation de toutes les personnes en une fois.
+    """
+    fichier_personnes = tmp_path / "personnes.csv"
+    _ecrire_personnes(fichier_personnes, 25)
+    epargnes = import_epargnes("tests/epargnes.csv")
+
+    fichier_blocs = str(tmp_path / "resultats_blocs.csv")
+    fichier_complet = str(tmp_path / "resultats_complet.csv")
+    nombre_resultats = simuler_fichier_par_blocs(str(fichier_personnes), epargnes, fichier_blocs, taille_bloc=4)
+    save_resultats_simulation(simuler_resultats_batch(import_personnes(str(fichier_personnes)), epargnes), fichier_complet)
+
+    df_blocs = pd.read_csv(fichier_blocs)
+    assert len(df_blocs) == nombre_resultats > 0
+    pd.testing.assert_frame_equal(df_blocs, pd.read_csv(fichier_complet))
+
+
+def test_simuler_fichier_par_blocs_format_non_supporte(tmp_path):
+    """
+    L'export incrémental n'est possible qu'en CSV.
+    """
+    with pytest.raises(ValueError):
+        simuler_fichier_par_blocs("personnes.csv", [], str(tmp_path / "resultats.xlsx"))
+
+
+def test_simuler_en_parallele_identique_a_la_simulation_par_blocs(tmp_path):
+    """
+    La simulation multi-processus, après fusion des shards, doit produire le même fichier que le pipeline séquentiel.
+    """
+    fichier_personnes = tmp_path / "personnes.csv"
+    _ecrire_personnes(fichier_personnes, 30)
+    epargnes = import_epargnes("tests/epargnes.csv")
+
+    fichier_parallele = str(tmp_path / "resultats_parallele.csv")
+    fichier_sequentiel = str(tmp_path / "resultats_sequentiel.csv")
+    nombre_resultats = simuler_en_parallele(str(fichier_personnes), epargnes, fichier_parallele, nb_workers=2, taille_shard=7)
+    simuler_fichier_par_blocs(str(fichier_personnes), epargnes, fichier_sequentiel)
+
+    df_parallele = pd.read_csv(fichier_parallele)
+    assert len(df_parallele) == nombre_resultats
+    pd.testing.assert_frame_equal(df_parallele, pd.read_csv(fichier_sequentiel))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["personnes.csv", "resultats_parallele.csv", "resultats_sequentiel.csv"]
+
+
+def test_simuler_fichier_par_blocs_top_k(tmp_path):
+    """
+    En mode top_k, seuls les meilleurs scénarios de chaque personne sont écrits.
+    """
+    fichier_personnes = tmp_path / "personnes.csv"
+    _ecrire_personnes(fichier_personnes, 25)
+    epargnes = import_epargnes("tests/epargnes.csv")
+
+    fichier_top = str(tmp_path / "resultats_top.csv")
+    nombre_resultats = simuler_fichier_par_blocs(str(fichier_personnes), epargnes, fichier_top, taille_bloc=4, top_k=2)
+    df_top = pd.read_csv(fichier_top)
+    complet = simuler_resultats_batch(import_personnes(str(fichier_personnes)), epargnes).to_dataframe()
+
+    assert len(df_top) == nombre_resultats
+    assert df_top.groupby('Personne').size().max() == 2
+    premiers = df_top.groupby('Personne')['Capital Net'].first()
+    meilleurs = complet.groupby('Personne')['Capital Net'].max()
+    assert premiers.to_numpy() == pytest.approx(meilleurs.loc[premiers.index].to_numpy())
+
+
+def test_simuler_fichier_par_blocs_csv_compresse(tmp_path):
+    """
+    Le pipeline écrit un CSV gzip dont le contenu est celui du CSV non compressé, avec un seul en-tête.
+    """
+    fichier_personnes = tmp_path / "personnes.csv"
+    _ecrire_personnes(fichier_personnes, 25)
+    epargnes = import_epargnes("tests/epargnes.csv")
+
+    fichier_csv = str(tmp_path / "resultats.csv")
+    fichier_gzip = str(tmp_path / "resultats.csv.gz")
+    simuler_fichier_par_blocs(str(fichier_personnes), epargnes, fichier_csv, taille_bloc=4)
+    nombre_resultats = simuler_fichier_par_blocs(str(fichier_personnes), epargnes, fichier_gzip, taille_bloc=4)
+
+    df_gzip = pd.read_csv(fichier_gzip)
+    assert len(df_gzip) == nombre_resultats > 0
+    pd.testing.assert_frame_equal(df_gzip, pd.read_csv(fichier_csv))
+
+
+def test_simuler_en_parallele_sans_resultat_et_shard_manquant(tmp_path):
+    """
+    Sans aucun résultat, le fichier fusionné garde l'en-tête ; un shard absent fait échouer la fusion.
+    """
+    epargnes = import_epargnes("tests/epargnes.csv")
+    sans_capacite = [Personne(f"P{i}", 30, 12000, 700, 300, objectif=1000, duree_epargne=24) for i in range(5)]
+    fichier_resultats = tmp_path / "resultats.csv"
+    assert simuler_en_parallele(sans_capacite, epargnes, str(fichier_resultats), nb_workers=2, taille_shard=2) == 0
+    df = pd.read_csv(fichier_resultats)
+    assert df.empty and list(df.columns) == [libelle for nom, (libelle, _) in COLONNES_RESULTATS.items() if nom != 'capital_net_reel']
+
+    fusionner_shards([], str(fichier_resultats))
+    assert list(pd.read_csv(fichier_resultats).columns) == list(df.columns)
+    with pytest.raises(FileNotFoundError):
+        fusionner_shards([str(tmp_path / "absent.csv")], str(tmp_path / "fusion.csv"))
+
+
+
+def test_shard_parquet_deja_type_non_renettoye(tmp_path, monkeypatch):
+    """
+    Un worker ne renettoie pas les blocs d'un fichier Parquet déjà typé, comme la lecture séquentielle.
+    """
+    pytest.importorskip("pyarrow")
+    fichier_csv = tmp_path / "personnes.csv"
+    _ecrire_personnes(fichier_csv, 12)
+    fichier_parquet = str(tmp_path / "personnes.parquet")
+    save_personnes(import_personnes(str(fichier_csv)), fichier_parquet)
+    epargnes = import_epargnes("tests/epargnes.csv")
+    attendu = simuler_resultats_batch(import_personnes(str(fichier_csv)), epargnes).to_dataframe()
+
+    monkeypatch.setattr(parallele, '_epargnes_worker', epargnes)
+    monkeypatch.setattr(parallele, '_options_worker', {})
+    monkeypatch.setattr(parallele, '_fichier_worker', fichier_parquet)
+    monkeypatch.setattr(data_manager, 'nettoyer_dataframe', lambda df: pytest.fail("bloc Parquet renettoyé"))
+    _, chemin_shard, nombre, _, _ = _simuler_shard(0, next(importer_donnees_par_blocs(fichier_parquet, 12)), str(tmp_path))
+    assert nombre == len(attendu) > 0
+    pd.testing.assert_frame_equal(pd.read_csv(chemin_shard), pd.read_csv(io.StringIO(attendu.to_csv(index=False))))
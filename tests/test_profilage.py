@@ -0,0 +1,152 @@
+import json
+import pickle
+import logging
+import urllib.request
+import pytest
+import numpy as np
+from src.mon_module.core import suggestion_epargne
+from src.mon_module.profilage import Profileur, HistogrammeLatences, profileur
+
+
+def test_compteurs_et_erreurs():
+    """
+    Le décorateur compte les appels et les exceptions, et conserve le nom de la fonction décorée.
+    """
+    profileur_local = Profileur()
+
+    @profileur_local.profiler
+    def carre(x):
+        """Carré."""
+        if x < 0:
+            raise ValueError("négatif")
+        return x * x
+
+    assert carre(3) == 9
+    carre(4)
+    with pytest.raises(ValueError):
+        carre(-1)
+    assert carre.__name__ == 'carre' and carre.__doc__ == "Carré."
+
+    mesures = profileur_local.resume()[carre.nom_mesures]
+    assert mesures['appels'] == 3
+    assert mesures['erreurs'] == 1
+    assert mesures['duree_cumulee_secondes'] > 0
+
+    profileur_local.actif = False
+    carre(2)
+    assert profileur_local.resume()[carre.nom_mesures]['appels'] == 3
+
+
+def test_quantiles_histogramme():
+    """
+    Les percentiles estimés par l'histogramme restent à moins de 10 % des percentiles exacts.
+    """
+    durees = np.random.default_rng(0).lognormal(mean=-7, sigma=1.5, size=10_000)
+    histogramme = HistogrammeLatences()
+    for duree in durees:
+        histogramme.ajouter(float(duree))
+
+    for q in (0.5, 0.9, 0.99):
+        assert histogramme.quantile(q) == pytest.approx(np.quantile(durees, q), rel=0.1)
+    assert histogramme.quantile(0.0) == pytest.approx(durees.min())
+    assert histogramme.quantile(1.0) == pytest.approx(durees.max())
+    assert HistogrammeLatences().quantile(0.5) == 0.0
+
+
+def test_fusion_des_mesures_de_workers():
+    """
+    Les mesures fusionnées (transmises par pickle depuis un worker) valent celles d'un seul profileur ayant tout enregistré.
+    """
+    durees = np.random.default_rng(0).lognormal(-6, 1, 400).tolist()
+    complet, principal, worker = Profileur(), Profileur(), Profileur()
+    for i, duree in enumerate(durees):
+        complet.enregistrer('simulation', duree, erreur=i % 50 == 0)
+        (principal if i < 100 else worker).enregistrer('simulation', duree, erreur=i % 50 == 0)
+    worker.enregistrer('nettoyage', 0.01)
+    complet.enregistrer('nettoyage', 0.01)
+
+    principal.fusionner(pickle.loads(pickle.dumps(worker.statistiques)))
+    assert principal.resume().keys() == complet.resume().keys()
+    for nom, resume in complet.resume().items():
+        assert principal.resume()[nom] == pytest.approx(resume)
+
+
+def test_gestionnaire_de_contexte_et_cprofile():
+    """
+    Les blocs mesurés sont enregistrés, et les appels échantillonnés produisent un rapport cProfile.
+    """
+    profileur_local = Profileur(graine=0)
+    with profileur_local.mesurer('bloc'):
+        sum(range(1000))
+    with pytest.raises(KeyError):
+        with profileur_local.mesurer('bloc'):
+            raise KeyError('x')
+    assert profileur_local.resume()['bloc']['appels'] == 2
+    assert profileur_local.resume()['bloc']['erreurs'] == 1
+
+    @profileur_local.profiler(nom='tri', echantillonnage_cprofile=1.0)
+    def trier(valeurs):
+        return sorted(valeurs)
+
+    trier([3, 1, 2])
+    trier([5, 4])
+    assert profileur_local.resume()['tri']['appels'] == 2
+    assert 'sorted' in profileur_local.rapport_cprofile('tri')
+
+    with pytest.raises(ValueError):
+        profileur_local.profiler(echantillonnage_cprofile=2.0)
+
+
+def test_export_json_prometheus_et_http(tmp_path):
+    """
+    Les mesures sont exportées en JSON et au format Prometheus, dans un fichier ou par HTTP.
+    """
+    profileur_local = Profileur()
+    for _ in range(5):
+        profileur_local.enregistrer('import_personnes', 0.002)
+
+    fichier_json = tmp_path / "mesures.json"
+    profileur_local.exporter(str(fichier_json))
+    mesures = json.loads(fichier_json.read_text(encoding='utf-8'))
+    assert mesures['import_personnes']['appels'] == 5
+    assert mesures['import_personnes']['p50_secondes'] == pytest.approx(0.002)
+
+    fichier_prom = tmp_path / "mesures.prom"
+    profileur_local.exporter(str(fichier_prom))
+    texte = fichier_prom.read_text(encoding='utf-8')
+    assert '# TYPE mon_module_duree_secondes summary' in texte
+    assert 'mon_module_appels_total{fonction="import_personnes"} 5' in texte
+    assert 'mon_module_duree_secondes_count{fonction="import_personnes"} 5' in texte
+
+    serveur = profileur_local.servir()
+    try:
+        url = f"http://127.0.0.1:{serveur.server_address[1]}"
+        with urllib.request.urlopen(url + "/metrics") as reponse:
+            assert reponse.read().decode('utf-8') == profileur_local.vers_prometheus()
+        with urllib.request.urlopen(url + "/metrics.json") as reponse:
+            assert json.loads(reponse.read())['import_personnes']['appels'] == 5
+    finally:
+        serveur.shutdown()
+        serveur.server_close()
+
+
+def test_suggestion_epargne_instrumentee(caplog, monkeypatch, personnes, epargnes, selectionner):
+    """
+    suggestion_epargne est mesurée par le profileur par défaut une fois activé, et son message de niveau DEBUG
+    indique le bon nombre de placements.
+    """
+    personne, epargnes = selectionner(personnes, "Jean")[0], selectionner(epargnes, "Livret A", "PEL")
+
+    profileur.reinitialiser()
+    monkeypatch.setattr(profileur, 'actif', False)
+    with caplog.at_level(logging.INFO):
+        suggestion_epargne(personne, epargnes)
+    assert 'suggestion_epargne' not in profileur.resume()
+    assert "comparaison" not in caplog.text # Message non construit hors niveau DEBUG
+
+    monkeypatch.setattr(profileur, 'actif', True)
+    with caplog.at_level(logging.DEBUG):
+        suggestion_epargne(personne, epargnes)
+    assert profileur.resume()['suggestion_epargne']['appels'] == 1
+    assert "comparaison de 2 placements selon la situation de Jean." in caplog.text
+    profileur.reinitialiser()
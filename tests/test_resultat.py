@@ -1,5 +1,6 @@
 import pytest
-from src.mon_module.models.resultat import ResultatEpargne as Resultat
+import pandas as pd
+from src.mon_module.models.resultat import ResultatEpargne as Resultat, ResultatsBatch
 
 def test_resultat_initialisation():
     """
@@ -87,4 +88,48 @@ def test_resultat_affichage_capacite_suffisante(capsys):
     assert "Montant atteint après 60 mois: 7050.00 €" in captured.out
     assert "Montant net après fiscalité: 4935.00 €" in captured.out
     assert "Statut de l'objectif: Atteint" in captured.out
-    assert "Message de la simulation: Objectif atteint avec succès." in captured.out
\ No newline at end of file
+    assert "Message de la simulation: Objectif atteint avec succès." in captured.out
+
+def test_resultats_batch_colonnes_et_vues():
+    """
+    Teste le conteneur colonnaire : ajout par blocs, vues ResultatEpargne et export DataFrame.
+    """
+    resultats = [
+        Resultat("Alice", "Livret A", 0.03, 0.0, 150.0, 24, 3700.0, 3700.0, False, ""),
+        Resultat("Bob", "PEL", 0.025, 0.3, 500.0, 60, 31000.0, 30700.0, True, "Versement ajusté au plafond (6000.00 €/an)."),
+    ]
+    batch = ResultatsBatch.depuis_resultats(resultats[:1])
+    batch.ajouter(ResultatsBatch.depuis_resultats(resultats[1:]).colonnes)
+
+    assert len(batch) == 2
+    assert vars(batch[1]) == vars(resultats[1])
+    assert batch[1].atteint_objectif is True
+    assert [r.personne_nom for r in batch] == ["Alice", "Bob"]
+    assert len(batch[batch.colonnes['atteint_objectif']]) == 1
+
+    df = batch.to_dataframe()
+    df_attendu = pd.concat([r.to_dataframe() for r in resultats], ignore_index=True)
+    pd.testing.assert_frame_equal(df, df_attendu)
+
+def test_colonnes_exportees_fixees_par_le_mode(tmp_path):
+    """
+    Un bloc du mode mensuel dont tout le capital réel est NaN garde la colonne 'Capital Net Reel' :
+    les blocs suivants d'un même CSV, et un CSV sans résultat, ont les mêmes colonnes.
+    """
+    from src.mon_module.data_manager import EcrivainResultatsCSV
+    nan = float('nan')
+    bloc_nan = ResultatsBatch.depuis_resultats([Resultat("Alice", "Livret A", 0.03, 0.0, 150.0, 24, 3700.0, 3700.0, False, "", nan)])
+    bloc = ResultatsBatch.depuis_resultats([Resultat("Bob", "PEL", 0.025, 0.3, 500.0, 60, 31000.0, 30700.0, True, "", 28000.0)])
+    assert bloc_nan.avec_capital_reel and list(bloc_nan.to_dataframe().columns)[-1] == 'Capital Net Reel'
+    assert 'Capital Net Reel' not in ResultatsBatch(bloc.colonnes).to_dataframe().columns # Mode annuel par défaut
+    assert ResultatsBatch.concatener([bloc_nan, bloc])[1:].avec_capital_reel
+
+    fichier = tmp_path / "resultats.csv"
+    with EcrivainResultatsCSV(str(fichier), avec_capital_reel=True) as ecrivain:
+        ecrivain.ajouter(bloc_nan)
+        ecrivain.ajouter(bloc)
+    assert pd.read_csv(fichier)['Capital Net Reel'].tolist()[1] == 28000.0
+
+    with EcrivainResultatsCSV(str(fichier), avec_capital_reel=True):
+        pass
+    assert list(pd.read_csv(fichier).columns)[-1] == 'Capital Net Reel'
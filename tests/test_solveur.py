@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+from src.mon_module.models.personne import Personne
+from src.mon_module.models.epargne import Epargne
+from src.mon_module.core import suggestion_epargne_batch
+from src.mon_module.solveur import versement_minimum, duree_minimum, resoudre_objectifs
+
+
+@pytest.fixture
+def donnees(personnes, epargnes, selectionner):
+    """
+    Personnes et produits de référence, avec un objectif hors d'atteinte pour Marie, un PEL à 72 mois
+    et un produit sans intérêt.
+    """
+    personnes, epargnes = selectionner(personnes, "Jean", "Marie", "Luc"), selectionner(epargnes, "Livret A", "PEL", "Assurance Vie")
+    personnes[1].objectif = 300000
+    epargnes[1].duree_min = 72
+    epargnes.append(Epargne("Sans interet", 0.0, 0.0, 0.0, 0.0, 0, np.nan))
+    return personnes, epargnes
+
+
+def _simuler(personne, epargne, versement_mensuel, duree_mois):
+    client = Personne(personne.nom, personne.age, personne.revenu_annuel, personne.loyer, personne.depenses_mensuelles,
+                      objectif=personne.objectif, duree_epargne=duree_mois, versement_mensuel_utilisateur=versement_mensuel)
+    return [r for r in suggestion_epargne_batch([client], [epargne]) if r.versement_mensuel == versement_mensuel]
+
+
+def test_versement_minimum_exact(donnees):
+    """
+    Le versement minimal atteint tout juste l'objectif ; un centime de moins ne suffit plus.
+    """
+    personnes, epargnes = donnees
+    solution = versement_minimum(personnes, epargnes)
+
+    assert solution['raison'][0, 1] == 'duree_min' and not solution['realisable'][0, 1]
+    assert solution['raison'][1, 0] == 'plafond' and np.isnan(solution['versement_mensuel'][1, 0])
+    assert solution['versement_mensuel'][0, 3] == pytest.approx(15000 / 60)
+
+    for i, j in zip(*np.nonzero(solution['realisable'])):
+        versement = solution['versement_mensuel'][i, j]
+        assert _simuler(personnes[i], epargnes[j], versement, personnes[i].duree_epargne)[0].atteint_objectif
+        assert not _simuler(personnes[i], epargnes[j], versement - 0.01, personnes[i].duree_epargne)[0].atteint_objectif
+
+
+def test_duree_minimum_exacte(donnees):
+    """
+    La durée minimale atteint l'objectif au versement donné, et la durée retenue juste en dessous ne suffit pas.
+    """
+    personnes, epargnes = donnees
+    versements = np.array([200.0, 1000.0, 0.0])
+    solution = duree_minimum(personnes, epargnes, versement_mensuel=versements)
+
+    assert (solution['raison'][2] == 'versement_nul').all()
+    assert solution['duree_mois'][0, 3] == 12 * 7 - 5 # 15000 € à 2400 €/an sans intérêts : 7 ans (arrondis depuis 79 mois)
+
+    for i, j in zip(*np.nonzero(solution['realisable'])):
+        duree_mois = solution['duree_mois'][i, j]
+        assert duree_mois >= (epargnes[j].duree_min if not np.isnan(epargnes[j].duree_min) else 0)
+        assert _simuler(personnes[i], epargnes[j], versements[i], duree_mois)[0].atteint_objectif
+        resultats_plus_courts = _simuler(personnes[i], epargnes[j], versements[i], duree_mois - 1)
+        assert not resultats_plus_courts or not resultats_plus_courts[0].atteint_objectif
+
+
+def test_resoudre_objectifs_tableau(donnees):
+    """
+    Le tableau récapitulatif contient une ligne par couple (personne, produit).
+    """
+    df = resoudre_objectifs(*donnees)
+    assert len(df) == 12
+    assert df.loc[(df['Personne'] == 'Jean') & (df['Produit'] == 'PEL'), 'Versement Raison'].item() == 'duree_min'
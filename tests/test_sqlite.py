@@ -0,0 +1,104 @@
+import sqlite3
+import pytest
+import pandas as pd
+from src.mon_module import data_manager
+from src.mon_module.data_manager import (import_personnes, import_epargnes, save_personnes_sqlite, import_personnes_sqlite,
+                                         save_epargnes_sqlite, import_epargnes_sqlite, save_resultats_simulation,
+                                         iterer_resultats_sqlite, personnes_atteignant_objectif, connecter_sqlite)
+from src.mon_module.core import simuler_resultats_batch
+from src.mon_module.models.resultat import ResultatsBatch
+
+
+def test_aller_retour_personnes_et_epargnes_sqlite(tmp_path):
+    """
+    Les personnes et les produits relus de la base sont identiques à ceux exportés.
+    """
+    base = str(tmp_path / "donnees.db")
+    personnes, epargnes = import_personnes("personnes.csv"), import_epargnes("epargnes.csv")
+    save_personnes_sqlite(personnes, base)
+    save_epargnes_sqlite(epargnes, base)
+    save_personnes_sqlite(personnes, base) # Remplace le contenu, sans doublons
+
+    relues = import_personnes_sqlite(base)
+    assert [p.nom for p in relues] == [p.nom for p in personnes]
+    assert [p.capacite_epargne_mensuelle for p in relues] == pytest.approx([p.capacite_epargne_mensuelle for p in personnes], nan_ok=True)
+    pd.testing.assert_frame_equal(data_manager._dataframe_epargnes(import_epargnes_sqlite(base)),
+                                  data_manager._dataframe_epargnes(epargnes), check_dtype=False)
+    assert connecter_sqlite(base).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_resultats_sqlite_requetes_indexees(tmp_path):
+    """
+    Les résultats exportés par blocs se relisent par blocs, filtrés, et les requêtes utilisent les index.
+    """
+    base = str(tmp_path / "resultats.db")
+    resultats = simuler_resultats_batch(import_personnes("personnes.csv"), import_epargnes("epargnes.csv"))
+    save_resultats_simulation(resultats[:10], base)
+    save_resultats_simulation(resultats[10:], base, ajout=True)
+
+    relus = ResultatsBatch.concatener(list(iterer_resultats_sqlite(base, taille_bloc=7)))
+    pd.testing.assert_frame_equal(relus.to_dataframe(), resultats.to_dataframe())
+
+    produit = resultats.colonnes['produit_nom'][0]
+    atteints = resultats[(resultats.colonnes['produit_nom'] == produit) & resultats.colonnes['atteint_objectif']]
+    filtres = ResultatsBatch.concatener(list(iterer_resultats_sqlite(base, produit_nom=produit, atteint_objectif=True)))
+    assert len(filtres) == len(atteints)
+    assert personnes_atteignant_objectif(base, produit) == list(dict.fromkeys(atteints.colonnes['personne_nom']))
+
+    plan = connecter_sqlite(base).execute("EXPLAIN QUERY PLAN SELECT * FROM resultats WHERE produit_nom = ?", (produit,)).fetchall()
+    assert "idx_resultats_produit_nom" in str(plan)
+
+
+def test_base_absente(tmp_path):
+    """
+    Les lectures d'une base absente lèvent FileNotFoundError, sans créer de base vide.
+    """
+    base = str(tmp_path / "absente.db")
+    with pytest.raises(FileNotFoundError):
+        personnes_atteignant_objectif(base, "Livret A")
+    with pytest.raises(FileNotFoundError):
+        next(iterer_resultats_sqlite(base))
+    with pytest.raises(FileNotFoundError):
+        import_personnes_sqlite(base)
+    with pytest.raises(FileNotFoundError):
+        import_epargnes_sqlite(base)
+    assert not (tmp_path / "absente.db").exists()
+
+
+def test_simuler_fichier_par_blocs_vers_sqlite(tmp_path):
+    """
+    Le pipeline par blocs écrit dans une base SQLite les mêmes résultats que dans un CSV.
+    """
+    from src.mon_module.pipeline import simuler_fichier_par_blocs
+
+    epargnes = import_epargnes("epargnes.csv")
+    base, csv = str(tmp_path / "resultats.db"), str(tmp_path / "resultats.csv")
+    simuler_fichier_par_blocs("personnes.csv", epargnes, base, taille_bloc=3)
+    nombre = simuler_fichier_par_blocs("personnes.csv", epargnes, base, taille_bloc=3) # Réexécution : pas de doublons
+    simuler_fichier_par_blocs("personnes.csv", epargnes, csv, taille_bloc=3)
+
+    relus = ResultatsBatch.concatener(list(iterer_resultats_sqlite(base))).to_dataframe()
+    assert len(relus) == nombre
+    pd.testing.assert_frame_equal(relus, pd.read_csv(csv).fillna({'Message': ''}), check_dtype=False)
+
+
+def test_ecriture_par_blocs_sqlite_en_echec(tmp_path):
+    """
+    Un bloc qui ne peut pas être écrit dans la base fait échouer l'export au lieu d'être seulement journalisé.
+    """
+    from src.mon_module.pipeline import ecrire_resultats_par_blocs
+
+    base = str(tmp_path / "resultats.db")
+    resultats = simuler_resultats_batch(import_personnes("personnes.csv"), import_epargnes("epargnes.csv"))
+
+    def _blocs():
+        yield resultats[:5]
+        connexion = connecter_sqlite(base) # Schéma devenu incompatible entre deux blocs
+        with connexion:
+            connexion.execute('DROP TABLE resultats')
+            connexion.execute('CREATE TABLE resultats (personne_nom TEXT)')
+        connexion.close()
+        yield resultats[5:]
+
+    with pytest.raises(sqlite3.OperationalError):
+        ecrire_resultats_par_blocs(_blocs(), base)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.mon_module.data_manager import import_personnes, import_epargnes, save_resultats_simulation
+from src.mon_module.core import simuler_resultats_batch
+from src.mon_module.pipeline import simuler_fichier_par_blocs
+from src.mon_module.stockage_binaire import EcrivainResultatsBinaire, ouvrir_resultats_binaire, chemin_annexe
+
+
+@pytest.fixture
+def resultats():
+    return simuler_resultats_batch(import_personnes("personnes.csv"), import_epargnes("epargnes.csv"))
+
+
+def test_aller_retour_binaire_par_blocs_agrandis(tmp_path, resultats):
+    """
+    Des blocs écrits au-delà de la capacité initiale se relisent à l'identique, tranche par tranche.
+    """
+    chemin = str(tmp_path / "resultats.bin")
+    with EcrivainResultatsBinaire(chemin, capacite_initiale=4) as ecrivain:
+        for debut in range(0, len(resultats), 5):
+            ecrivain.ajouter(resultats[debut:debut + 5])
+
+    stock = ouvrir_resultats_binaire(chemin)
+    assert isinstance(stock.donnees, np.memmap) and len(stock) == len(resultats)
+    pd.testing.assert_frame_equal(stock.lire().to_dataframe(), resultats.to_dataframe())
+    relus = pd.concat([bloc.to_dataframe() for bloc in stock.iterer_blocs(taille_bloc=6)], ignore_index=True)
+    pd.testing.assert_frame_equal(relus, resultats.to_dataframe())
+
+
+def test_filtres_binaires(tmp_path, resultats):
+    """
+    Les filtres sur les codes des chaînes donnent les mêmes lignes qu'un filtre sur le DataFrame complet.
+    """
+    chemin = str(tmp_path / "resultats.bin")
+    save_resultats_simulation(resultats, chemin)
+    stock = ouvrir_resultats_binaire(chemin)
+    df = resultats.to_dataframe()
+
+    produit = df['Produit'].iloc[0]
+    attendu = df[(df['Produit'] == produit) & df['Objectif Atteint']].reset_index(drop=True)
+    pd.testing.assert_frame_equal(stock.filtrer(produit_nom=produit, atteint_objectif=True).to_dataframe(), attendu)
+    assert len(stock.filtrer(personne_nom="Personne inconnue")) == 0
+
+
+def test_pipeline_vers_binaire(tmp_path):
+    """
+    Le pipeline par blocs écrit un fichier binaire identique à l'export CSV.
+    """
+    epargnes = import_epargnes("epargnes.csv")
+    chemin, csv = str(tmp_path / "resultats.bin"), str(tmp_path / "resultats.csv")
+    nombre = simuler_fichier_par_blocs("personnes.csv", epargnes, chemin, taille_bloc=3)
+    simuler_fichier_par_blocs("personnes.csv", epargnes, csv, taille_bloc=3)
+
+    stock = ouvrir_resultats_binaire(chemin)
+    assert len(stock) == nombre
+    pd.testing.assert_frame_equal(stock.lire().to_dataframe(), pd.read_csv(csv).fillna({'Message': ''}), check_dtype=False)
+
+
+def test_fichier_binaire_incomplet(tmp_path, resultats):
+    """
+    Un fichier dont la taille ne correspond pas à l'annexe est refusé.
+    """
+    chemin = str(tmp_path / "resultats.bin")
+    save_resultats_simulation(resultats, chemin)
+    with open(chemin, 'ab') as fichier:
+        fichier.write(b'\0')
+    with pytest.raises(ValueError):
+        ouvrir_resultats_binaire(chemin)
+    with pytest.raises(FileNotFoundError):
+        ouvrir_resultats_binaire(chemin_annexe(chemin))
@@ -0,0 +1,48 @@
+import pytest
+import numpy as np
+from src.mon_module.utils import calcul_interets_composes, facteur_annuite
+
+
+def _calcul_annee_par_annee(versement_annuel, taux_annuel, duree_annees):
+    montant_final = 0.0
+    for _ in range(duree_annees):
+        montant_final = (montant_final + versement_annuel) * (1 + taux_annuel)
+    return montant_final
+
+
+def test_calcul_interets_composes_forme_fermee():
+    """
+    La forme fermée doit correspondre au calcul itératif année par année, y compris à taux nul.
+    """
+    for versement, taux, duree in [(1200, 0.03, 5), (2400, 0.0, 10), (500, 0.15, 30), (1000, 0.02, 0)]:
+        resultat = calcul_interets_composes(versement, taux, duree)
+        assert isinstance(resultat, float)
+        assert resultat == pytest.approx(_calcul_annee_par_annee(versement, taux, duree), rel=1e-12)
+
+
+def test_calcul_interets_composes_tableaux():
+    """
+    Les arguments peuvent être des tableaux NumPy diffusés entre eux.
+    """
+    versements = np.array([[1200.0], [2400.0]])
+    taux = np.array([0.0, 0.025, 0.045])
+    resultat = calcul_interets_composes(versements, taux, 8)
+
+    assert resultat.shape == (2, 3)
+    for i, versement in enumerate(versements[:, 0]):
+        for j, t in enumerate(taux):
+            assert resultat[i, j] == pytest.approx(_calcul_annee_par_annee(versement, t, 8), rel=1e-12)
+    assert facteur_annuite(0.0, np.array([0, 3])).tolist() == [0.0, 3.0]
+
+
+@pytest.mark.parametrize("versement, taux, duree", [
+    (1200, 0.03, np.array([5, -1])),
+    (1200, np.array([0.03, -0.01]), 5),
+    (np.array([-1.0, 1200.0]), 0.03, 5),
+])
+def test_calcul_interets_composes_valeurs_negatives(versement, taux, duree):
+    """
+    Une durée, un taux ou un versement négatif, même au sein d'un tableau, lève une ValueError.
+    """
+    with pytest.raises(ValueError):
+        calcul_interets_composes(versement, taux, duree)